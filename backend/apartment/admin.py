@@ -1,8 +1,14 @@
 """This defines class ApartmentAdmin"""
 from django.contrib import admin
-from .models import Apartment, ApartmentAmenity, ApartmentUserPreferredQuality
+from .models import (
+    Apartment,
+    ApartmentAmenity,
+    ApartmentUserPreferredQuality,
+    ApartmentPriceStatistic
+)
 
 
 admin.site.register(Apartment)
 admin.site.register(ApartmentAmenity)
 admin.site.register(ApartmentUserPreferredQuality)
+admin.site.register(ApartmentPriceStatistic)
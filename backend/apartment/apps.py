@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ApartmentConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apartment'
+
+    def ready(self):
+        """This method connects the signal handlers of the apartment app."""
+        # pylint: disable=import-outside-toplevel
+        # pylint: disable=unused-import
+        from apartment import signals
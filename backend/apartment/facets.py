@@ -0,0 +1,204 @@
+"""
+This module defines the facet counts returned by ApartmentSearchView with the
+facets parameter: the number of apartments matching the search for each
+listing type, purpose, price range, amenity and city. They are counted by the
+in-process search index if it is used, and otherwise with one aggregate query
+for the listing types, purposes and price ranges and one grouped query for the
+amenities and cities. The counts are cached per search.
+"""
+import json
+from hashlib import sha1
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import CharField, Count, F, Q, Value
+from apartment.models import Apartment, ApartmentAmenity, LISTING_TYPE, AVAILABLE_FOR
+
+
+FACETS = ('listing_type', 'available_for', 'price', 'amenities', 'city')
+
+# Price ranges counted by the price facet, as the inclusive min_price and
+# max_price of the search. The last range has no maximum.
+PRICE_RANGES = (
+    (0, 49999),
+    (50000, 99999),
+    (100000, 249999),
+    (250000, 499999),
+    (500000, 999999),
+    (1000000, None)
+)
+
+# Parameters of the search that do not change the apartments that match it.
+IGNORED_PARAMS = ('page', 'size', 'fields', 'expand', 'facets', 'sort_type')
+
+# Key of the number that is changed when apartments are changed, so the
+# cached counts are not used anymore.
+VERSION_KEY = 'apartment_facets_version'
+
+
+def get_cache():
+    """This function returns the cache of the facet counts, set with APARTMENT_FACETS_CACHE."""
+    return caches[getattr(settings, 'APARTMENT_FACETS_CACHE', 'default')]
+
+def get_price_range_name(minimum, maximum):
+    """This function returns the name of a price range in the counts of the price facet."""
+    return f'{minimum}+' if maximum is None else f'{minimum}-{maximum}'
+
+def get_requested_facets(request):
+    """
+    This function returns the facets given in the facets query string parameter,
+    or None if it is not given. It raises ValueError if a facet does not exist.
+    """
+    value = request.GET.get('facets')
+    if value is None or value.strip() == '':
+        return None
+
+    facets = list(dict.fromkeys(facet.strip() for facet in value.split(',') if facet.strip()))
+    for facet in facets:
+        if facet not in FACETS:
+            raise ValueError(f'Facet "{facet}" does not exist.')
+    return facets
+
+def get_search_key(params):
+    """
+    This function returns the parameters of a search that decide which apartments
+    match it, normalized so that equivalent searches have the same key. Parameters
+    with several values are keyed by their sorted values.
+    """
+    key = {}
+    amenities = []
+    for name, value in params.items():
+        if name in IGNORED_PARAMS:
+            continue
+        values = value if isinstance(value, list) else [value]
+        values = [str(item).strip() for item in values if str(item).strip() != '']
+        if not values:
+            continue
+        if name.startswith('amenities'):
+            amenities.extend(values)
+        elif name == 'q':
+            key[name] = ' '.join(values[0].lower().split())
+        elif isinstance(value, list):
+            key[name] = sorted(set(values))
+        else:
+            key[name] = values[0]
+
+    if amenities:
+        key['amenities'] = sorted(set(amenities))
+
+    # Sorting by bedrooms only returns the apartments with bedrooms.
+    sort_type = params.get('sort_type', '')
+    if sort_type in ('bedroom', '-bedroom'):
+        key['bedrooms'] = True
+
+    return key
+
+def get_cache_key(params, facets):
+    """This function returns the cache key of the facet counts of a search."""
+    cache = get_cache()
+    cache.add(VERSION_KEY, 1, timeout=None)
+    version = cache.get(VERSION_KEY, 1)
+
+    search = json.dumps([get_search_key(params), sorted(facets)], sort_keys=True)
+    return f'apartment_facets:{version}:{sha1(search.encode()).hexdigest()}'
+
+def invalidate_facets():
+    """
+    This function makes the cached facet counts stale once the current
+    transaction is committed.
+    """
+    def increment_version():
+        cache = get_cache()
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.add(VERSION_KEY, 1, timeout=None)
+
+    transaction.on_commit(increment_version)
+
+def count_facets(queryset, facets):
+    """
+    This function returns the counts of the facets for the apartments of the
+    queryset, counted by the database.
+    """
+    # pylint: disable=no-member
+
+    # The apartments are selected by primary key, so the joins, annotations and
+    # ordering of the search do not change the counts.
+    apartments = Apartment.objects.filter(pk__in=queryset.order_by().values('pk'))
+    counts = {}
+
+    aggregates = {}
+    for facet, values in (
+        ('listing_type', [value for value, _ in LISTING_TYPE]),
+        ('available_for', [value for value, _ in AVAILABLE_FOR])
+    ):
+        if facet in facets:
+            for i, value in enumerate(values):
+                aggregates[f'{facet}_{i}'] = Count('pk', filter=Q(**{facet: value}))
+    if 'price' in facets:
+        for i, (minimum, maximum) in enumerate(PRICE_RANGES):
+            condition = Q(price__gte=minimum)
+            if maximum is not None:
+                condition &= Q(price__lte=maximum)
+            aggregates[f'price_{i}'] = Count('pk', filter=condition)
+
+    if aggregates:
+        totals = apartments.aggregate(**aggregates)
+        for facet, values in (
+            ('listing_type', [value for value, _ in LISTING_TYPE]),
+            ('available_for', [value for value, _ in AVAILABLE_FOR]),
+            ('price', [get_price_range_name(*price_range) for price_range in PRICE_RANGES])
+        ):
+            if facet in facets:
+                counts[facet] = {
+                    value: totals[f'{facet}_{i}'] for i, value in enumerate(values)
+                }
+
+    # The amenities and cities are counted with one query, as the union of the
+    # grouped counts of each.
+    grouped_counts = []
+    if 'amenities' in facets:
+        counts['amenities'] = {}
+        grouped_counts.append(ApartmentAmenity.objects.filter(
+            apartment__in=apartments
+        ).annotate(
+            facet=Value('amenities', output_field=CharField()),
+            value=F('amenity__name')
+        ).values('facet', 'value').annotate(
+            count=Count('apartment_id', distinct=True)
+        ).order_by())
+    if 'city' in facets:
+        counts['city'] = {}
+        grouped_counts.append(apartments.annotate(
+            facet=Value('city', output_field=CharField()),
+            value=F('city_id')
+        ).values('facet', 'value').annotate(count=Count('pk')).order_by())
+
+    if grouped_counts:
+        rows = grouped_counts[0].union(*grouped_counts[1:], all=True)
+        for row in sorted(rows, key=lambda row: (row['facet'], row['value'])):
+            counts[row['facet']][row['value']] = row['count']
+
+    return counts
+
+def get_facets(params, facets, get_queryset, search_index=None):
+    """
+    This function returns the counts of the facets for the apartments matching
+    the search parameters. They are read from the cache, or counted by the search
+    index if it is given and can evaluate the parameters, or by the database
+    with the queryset returned by get_queryset.
+    """
+    cache = get_cache()
+    key = get_cache_key(params, facets)
+    counts = cache.get(key)
+    if counts is not None:
+        return counts
+
+    if search_index is not None:
+        counts = search_index.count_facets(params, facets)
+    if counts is None:
+        counts = count_facets(get_queryset(), facets)
+
+    cache.set(key, counts, timeout=getattr(settings, 'APARTMENT_FACETS_CACHE_TIMEOUT', 60))
+    return counts
@@ -0,0 +1,176 @@
+"""
+This module defines the full-text search of the apartment adverts over their
+title, description, address and nearest bus stop. It uses the full-text index
+of the database, which is created after the migrations of the apartment app:
+a GIN index on the search vector on PostgreSQL, a FULLTEXT index on MySQL, and
+an FTS5 table kept up to date by triggers on SQLite.
+"""
+import re
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from apartment.models import Apartment
+
+
+# Columns of the apartments that are searched.
+SEARCH_FIELDS = ('title', 'description', 'address', 'nearest_bus_stop')
+
+# Text search configuration used on PostgreSQL.
+SEARCH_CONFIG = 'english'
+
+# Name of the full-text index on PostgreSQL and MySQL, and of the FTS5 table on SQLite.
+FULL_TEXT_INDEX_NAME = 'apartments_search_idx'
+FTS_TABLE = 'apartments_fts'
+
+
+def get_search_vector():
+    """This function returns the search vector of the apartments on PostgreSQL."""
+    # pylint: disable=import-outside-toplevel
+    from django.contrib.postgres.search import SearchVector
+
+    return SearchVector(*SEARCH_FIELDS, config=SEARCH_CONFIG)
+
+def get_fts_query(query):
+    """
+    This function returns the words of a search as an FTS5 query that matches
+    the apartments containing all of them, so operators typed by users are not
+    interpreted. It returns None if the search has no words.
+    """
+    words = re.findall(r'\w+', query)
+    if not words:
+        return None
+    return ' '.join(f'"{word}"' for word in words)
+
+def create_full_text_index(using):
+    """
+    This function creates the full-text index of the apartments on the database,
+    if it does not exist yet.
+    """
+    # pylint: disable=no-member
+    # pylint: disable=import-outside-toplevel
+
+    connection = connections[using]
+    table = Apartment._meta.db_table
+
+    with connection.cursor() as cursor:
+        if table not in connection.introspection.table_names(cursor):
+            return
+        existing = connection.introspection.get_constraints(cursor, table)
+
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.indexes import GinIndex
+
+        if FULL_TEXT_INDEX_NAME not in existing:
+            with connection.schema_editor() as schema_editor:
+                schema_editor.add_index(
+                    Apartment, GinIndex(get_search_vector(), name=FULL_TEXT_INDEX_NAME)
+                )
+
+    elif connection.vendor == 'mysql':
+        if FULL_TEXT_INDEX_NAME not in existing:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'ALTER TABLE {table} ADD FULLTEXT INDEX {FULL_TEXT_INDEX_NAME} '
+                    f'({", ".join(SEARCH_FIELDS)})'
+                )
+
+    elif connection.vendor == 'sqlite':
+        create_fts_table(connection, table)
+
+def create_fts_table(connection, table):
+    """
+    This function creates the FTS5 table of the apartments on SQLite with the
+    triggers that keep it up to date, and fills it if a trigger was missing.
+    The table stores the index only and reads the text from the apartments table.
+    Migrations that rebuild the apartments table drop its triggers, so they are
+    checked rather than the table.
+    """
+    columns = ', '.join(SEARCH_FIELDS)
+    new_values = ', '.join(f'new.{field}' for field in SEARCH_FIELDS)
+    old_values = ', '.join(f'old.{field}' for field in SEARCH_FIELDS)
+    triggers = [f'{FTS_TABLE}_{event}' for event in ('insert', 'delete', 'update')]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s "
+            f"AND name IN ({', '.join(['%s'] * len(triggers))})",
+            [table, *triggers]
+        )
+        if cursor.fetchone()[0] == len(triggers):
+            return
+
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5({columns}, "
+            f"content='{table}', content_rowid='rowid')"
+        )
+        cursor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON {table} BEGIN '
+            f'INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.rowid, {new_values}); END'
+        )
+        cursor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON {table} BEGIN '
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) "
+            f"VALUES ('delete', old.rowid, {old_values}); END"
+        )
+        cursor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update '
+            f'AFTER UPDATE OF {columns} ON {table} BEGIN '
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) "
+            f"VALUES ('delete', old.rowid, {old_values}); "
+            f'INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.rowid, {new_values}); END'
+        )
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+def search_apartments(queryset, query):
+    """
+    This function returns the apartments of the queryset that match the search,
+    annotated with their relevance, which is higher for better matches. On other
+    databases the columns are searched for the whole query and relevance is 0.
+    """
+    # pylint: disable=no-member
+    # pylint: disable=import-outside-toplevel
+
+    connection = connections[queryset.db]
+    table = Apartment._meta.db_table
+
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+        return queryset.annotate(
+            search=get_search_vector(),
+            relevance=SearchRank(get_search_vector(), search_query)
+        ).filter(search=search_query)
+
+    if connection.vendor == 'mysql':
+        match = f'MATCH ({", ".join(f"{table}.{field}" for field in SEARCH_FIELDS)}) '\
+                'AGAINST (%s IN NATURAL LANGUAGE MODE)'
+        return queryset.annotate(
+            relevance=RawSQL(match, [query], output_field=FloatField())
+        ).filter(relevance__gt=0)
+
+    if connection.vendor == 'sqlite':
+        fts_query = get_fts_query(query)
+        if fts_query is None:
+            return queryset.none().annotate(relevance=Value(0.0, output_field=FloatField()))
+
+        # rank is the bm25 score of the match, which is lower for better matches.
+        return queryset.filter(
+            RawSQL(
+                f'{table}.rowid IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)',
+                [fts_query],
+                output_field=BooleanField()
+            )
+        ).annotate(
+            relevance=RawSQL(
+                f'(SELECT -rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+                f'AND {FTS_TABLE}.rowid = {table}.rowid)',
+                [fts_query],
+                output_field=FloatField()
+            )
+        )
+
+    condition = Q()
+    for field in SEARCH_FIELDS:
+        condition |= Q(**{f'{field}__icontains': query})
+    return queryset.filter(condition).annotate(relevance=Value(0.0, output_field=FloatField()))
@@ -0,0 +1,130 @@
+"""
+This module defines the functions used to search apartments near a point
+without a GIS extension. Apartments store the geohash of their coordinates,
+so the apartments in the geohash cells around a point are found with prefix
+queries on an index, and their distance to the point is then computed with
+the haversine formula in the database.
+"""
+from math import cos, radians
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+
+# Characters of the geohash base 32 alphabet.
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Number of characters of the geohashes stored on apartments, about 4 cm.
+GEOHASH_PRECISION = 12
+
+# Mean radius of the earth and length of a degree of latitude in kilometres.
+EARTH_RADIUS = 6371.0
+KM_PER_DEGREE = 111.32
+
+
+def validate_coordinates(latitude, longitude):
+    """This function raises ValueError if the coordinates are not a point on the earth."""
+    if not -90 <= latitude <= 90:
+        raise ValueError('Latitude must be between -90 and 90.')
+    if not -180 <= longitude <= 180:
+        raise ValueError('Longitude must be between -180 and 180.')
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """This function returns the geohash of a point with the given number of characters."""
+    # Points beyond the antimeridian are in the cells on the other side.
+    longitude = (longitude + 180) % 360 - 180
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+
+    geohash = []
+    bits = 0
+    value = 0
+    is_longitude = True
+    while len(geohash) < precision:
+        coordinate, interval = (longitude, lng_range) if is_longitude else (latitude, lat_range)
+        middle = (interval[0] + interval[1]) / 2
+        if coordinate >= middle:
+            value = value * 2 + 1
+            interval[0] = middle
+        else:
+            value = value * 2
+            interval[1] = middle
+        is_longitude = not is_longitude
+
+        bits += 1
+        if bits == 5:
+            geohash.append(GEOHASH_ALPHABET[value])
+            bits = 0
+            value = 0
+
+    return ''.join(geohash)
+
+def get_cell_size(precision, latitude):
+    """
+    This function returns the height and width in kilometres of the geohash
+    cells with the given number of characters at a latitude.
+    """
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    height = 180 / 2 ** lat_bits * KM_PER_DEGREE
+    width = 360 / 2 ** lng_bits * KM_PER_DEGREE * cos(radians(latitude))
+    return height, width
+
+def get_geohash_cells(latitude, longitude, radius):
+    """
+    This function returns the geohashes of the cells that cover the circle of
+    the given radius in kilometres around a point, or None if the circle is too
+    large for the cells to narrow the search.
+    The cells are the smallest ones that are at least as large as the radius, so
+    the bounding box of the circle spans at most three of them in each direction,
+    and the cells of its corners, middles of its sides and centre cover it.
+    """
+    precision = None
+    for length in range(GEOHASH_PRECISION, 0, -1):
+        height, width = get_cell_size(length, latitude)
+        if height >= radius and width >= radius:
+            precision = length
+            break
+
+    if precision is None:
+        return None
+
+    lat_delta = radius / KM_PER_DEGREE
+    lng_delta = radius / (KM_PER_DEGREE * max(cos(radians(latitude)), 1e-6))
+    return sorted({
+        encode_geohash(
+            max(min(latitude + lat_step * lat_delta, 90), -90),
+            longitude + lng_step * lng_delta,
+            precision
+        )
+        for lat_step in (-1, 0, 1)
+        for lng_step in (-1, 0, 1)
+    })
+
+def get_distance_expression(latitude, longitude):
+    """
+    This function returns the haversine distance in kilometres between the
+    coordinates of the apartments and a point, as an expression of the database.
+    """
+    lat_delta = Radians(F('latitude') - Value(latitude)) / 2
+    lng_delta = Radians(F('longitude') - Value(longitude)) / 2
+    haversine = Power(Sin(lat_delta), 2) + Value(cos(radians(latitude))) \
+        * Cos(Radians(F('latitude'))) * Power(Sin(lng_delta), 2)
+    return Value(2 * EARTH_RADIUS) * ASin(Sqrt(haversine, output_field=FloatField()))
+
+def filter_near(queryset, latitude, longitude, radius):
+    """
+    This function returns the apartments of the queryset within radius kilometres
+    of a point, annotated with their distance to the point in kilometres.
+    """
+    cells = get_geohash_cells(latitude, longitude, radius)
+    if cells is None:
+        queryset = queryset.filter(geohash__isnull=False)
+    else:
+        condition = Q()
+        for cell in cells:
+            condition |= Q(geohash__startswith=cell)
+        queryset = queryset.filter(condition)
+
+    return queryset.annotate(
+        distance=get_distance_expression(latitude, longitude)
+    ).filter(distance__lte=radius)
@@ -0,0 +1,32 @@
+"""This module defines the aggregate_price_statistics command."""
+from django.core.management.base import BaseCommand
+from apartment.price_statistics import aggregate_price_statistics
+
+
+class Command(BaseCommand):
+    """
+    This class defines a command that rebuilds the price statistics of the
+    locations from the active adverts. It is meant to be run periodically.
+    """
+    help = 'Rebuilds apartment_price_statistics from the prices per month of the active adverts.'
+
+    def add_arguments(self, parser):
+        """This method defines the arguments accepted by the command."""
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of apartments read in each batch.'
+        )
+
+    def handle(self, *args, **options):
+        """This method rebuilds the statistics and reports the progress."""
+        def progress(batch_number, read):
+            self.stdout.write(f'Batch {batch_number}: read {read} apartments.')
+
+        total_saved = aggregate_price_statistics(
+            batch_size=options['batch_size'],
+            progress=progress
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'Saved {total_saved} price statistics.'))
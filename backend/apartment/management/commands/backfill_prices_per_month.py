@@ -0,0 +1,40 @@
+"""This module defines the backfill_prices_per_month command."""
+from django.core.management.base import BaseCommand
+from apartment.utils import backfill_prices_per_month
+
+
+class Command(BaseCommand):
+    """
+    This class defines a command that sets price_per_month of the apartments
+    from their price and price duration in batches. It is run once after the
+    field is added, and can be run again to correct rows updated in bulk.
+    """
+    help = 'Sets price_per_month of the apartments from their price in bounded batches.'
+
+    def add_arguments(self, parser):
+        """This method defines the arguments accepted by the command."""
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of apartments checked in each batch.'
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            default=None,
+            help='Stop after this number of batches.'
+        )
+
+    def handle(self, *args, **options):
+        """This method sets the prices and reports the progress."""
+        def progress(batch_number, updated):
+            self.stdout.write(f'Batch {batch_number}: updated {updated} apartments.')
+
+        total_updated = backfill_prices_per_month(
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            progress=progress
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'Updated {total_updated} prices per month.'))
@@ -0,0 +1,142 @@
+"""This module defines the benchmark_apartment_cards command."""
+import time
+from datetime import timedelta
+from uuid import uuid4
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from country.models import Country
+from state.models import State
+from city.models import City
+from amenity.models import Amenity
+from image.models import Image
+from apartment.models import Apartment, ApartmentAmenity
+from apartment.serializers import (
+    ApartmentSerializer,
+    ApartmentCardSerializer,
+    APARTMENT_CARD_FIELDS
+)
+
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    """
+    This class defines a command that compares the time and number of queries
+    ApartmentSerializer and ApartmentCardSerializer take to serialize pages of
+    apartments of increasing size. All rows it creates are rolled back.
+    """
+    help = 'Compares ApartmentSerializer with ApartmentCardSerializer on list pages.'
+
+    def add_arguments(self, parser):
+        """This method defines the arguments accepted by the command."""
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[20, 100, 1000],
+            help='Numbers of apartments in a page.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Number of times each page is serialized.'
+        )
+
+    def handle(self, *args, **options):
+        """This method runs the benchmark for each size and reports the results."""
+        request = Request(APIRequestFactory().get('/api/apartments/available'))
+        request.user = AnonymousUser()
+        context = {'request': request}
+
+        with transaction.atomic():
+            self.create_apartments(max(options['sizes']))
+
+            for size in options['sizes']:
+                apartments = Apartment.objects.order_by('-created_at')[:size]
+                cards = Apartment.objects.order_by('-created_at').values(
+                    *APARTMENT_CARD_FIELDS
+                )[:size]
+
+                full_time, full_queries = self.measure(
+                    lambda apartments=apartments: ApartmentSerializer(
+                        apartments, many=True, context=context
+                    ).data,
+                    options['repeat']
+                )
+                card_time, card_queries = self.measure(
+                    lambda cards=cards: ApartmentCardSerializer(
+                        cards, many=True, context=context
+                    ).data,
+                    options['repeat']
+                )
+
+                self.stdout.write(
+                    f'{size} apartments: ApartmentSerializer {full_time * 1000:.2f} ms, '\
+                    f'{full_queries} queries; ApartmentCardSerializer '\
+                    f'{card_time * 1000:.2f} ms, {card_queries} queries'
+                )
+
+            transaction.set_rollback(True)
+
+    def create_apartments(self, size):
+        """This method creates apartments with an amenity and an image each."""
+        # pylint: disable=no-member
+
+        user = User.objects.create_user(
+            username=f'benchmark_{uuid4().hex[:12]}',
+            email=f'benchmark_{uuid4().hex[:12]}@example.com',
+            password=uuid4().hex
+        )
+        country = Country.objects.create(name='Benchmark')
+        state = State.objects.create(name='Benchmark', country=country)
+        city = City.objects.create(name='Benchmark', state=state)
+        amenity = Amenity.objects.create(name='benchmark')
+
+        apartments = Apartment.objects.bulk_create([
+            Apartment(
+                user=user,
+                country=country,
+                state=state,
+                city=city,
+                title=f'Apartment {i}',
+                nearest_bus_stop='Bus stop',
+                price=1000 * i,
+                listing_type='flat',
+                available_for='rent',
+                price_duration='year',
+                approval_status='accepted',
+                advert_exp_time=timezone.now() + timedelta(weeks=4)
+            )
+            for i in range(size)
+        ])
+        ApartmentAmenity.objects.bulk_create([
+            ApartmentAmenity(apartment=apartment, amenity=amenity) for apartment in apartments
+        ])
+        Image.objects.bulk_create([
+            Image(apartment=apartment, image=f'apartment_image/{apartment.id}.jpg')
+            for apartment in apartments
+        ])
+
+    def measure(self, serialize, repeat):
+        """This method returns the average time and the number of queries of serialize."""
+        queries = []
+
+        def count_queries(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        total = 0
+        for _ in range(repeat):
+            queries.clear()
+            with connection.execute_wrapper(count_queries):
+                start = time.perf_counter()
+                serialize()
+                total += time.perf_counter() - start
+
+        return total / repeat, len(queries)
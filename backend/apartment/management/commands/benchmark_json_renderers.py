@@ -0,0 +1,83 @@
+"""This module defines the benchmark_json_renderers command."""
+import time
+from django.contrib.auth.models import AnonymousUser
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from apartment.models import Apartment
+from apartment.serializers import ApartmentCardSerializer, APARTMENT_CARD_FIELDS
+from apartment.management.commands.benchmark_apartment_cards import (
+    Command as BenchmarkApartmentCardsCommand
+)
+from apartment_search_app.renderers import FastJSONRenderer, orjson
+
+
+class Command(BenchmarkApartmentCardsCommand):
+    """
+    This class defines a command that compares the time JSONRenderer and
+    FastJSONRenderer take to render pages of apartment cards of increasing
+    size, and the number of bytes they return. All rows it creates are rolled back.
+    """
+    help = 'Compares JSONRenderer with FastJSONRenderer on pages of apartment cards.'
+
+    def add_arguments(self, parser):
+        """This method defines the arguments accepted by the command."""
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[20, 100, 1000],
+            help='Numbers of apartments in a page.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Number of times each page is rendered.'
+        )
+
+    def handle(self, *args, **options):
+        """This method runs the benchmark for each size and reports the results."""
+        if orjson is None:
+            self.stdout.write(
+                self.style.WARNING('orjson is not installed, FastJSONRenderer uses json.')
+            )
+
+        request = Request(APIRequestFactory().get('/api/apartments/available'))
+        request.user = AnonymousUser()
+        context = {'request': request}
+
+        with transaction.atomic():
+            self.create_apartments(max(options['sizes']))
+
+            for size in options['sizes']:
+                cards = Apartment.objects.order_by('-created_at').values(
+                    *APARTMENT_CARD_FIELDS
+                )[:size]
+                data = ApartmentCardSerializer(cards, many=True, context=context).data
+
+                json_time, json_bytes = self.measure_renderer(
+                    JSONRenderer(), data, options['repeat']
+                )
+                fast_time, fast_bytes = self.measure_renderer(
+                    FastJSONRenderer(), data, options['repeat']
+                )
+
+                self.stdout.write(
+                    f'{size} apartments: JSONRenderer {json_time * 1000:.2f} ms, '\
+                    f'{json_bytes} bytes; FastJSONRenderer {fast_time * 1000:.2f} ms, '\
+                    f'{fast_bytes} bytes'
+                )
+
+            transaction.set_rollback(True)
+
+    def measure_renderer(self, renderer, data, repeat):
+        """This method returns the average time renderer takes to render data and its size."""
+        total = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rendered = renderer.render(data)
+            total += time.perf_counter() - start
+
+        return total / repeat, len(rendered)
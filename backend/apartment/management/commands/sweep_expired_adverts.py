@@ -0,0 +1,46 @@
+"""This module defines the sweep_expired_adverts command."""
+from django.core.management.base import BaseCommand
+from apartment.utils import deactivate_expired_adverts, backfill_active_listings
+
+
+class Command(BaseCommand):
+    """
+    This class defines a command that takes expired adverts out of the
+    public listings in batches. It is meant to be run periodically.
+    """
+    help = 'Sets is_active_listing to False for expired adverts in bounded batches.'
+
+    def add_arguments(self, parser):
+        """This method defines the arguments accepted by the command."""
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of apartments updated in each batch.'
+        )
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='Recompute is_active_listing for every apartment.'
+        )
+
+    def handle(self, *args, **options):
+        """This method updates the apartments and reports the progress."""
+        batch_size = options['batch_size']
+        batches = []
+
+        def progress(updated):
+            batches.append(updated)
+            self.stdout.write(f'Batch {len(batches)}: updated {updated} apartments.')
+
+        if options['backfill']:
+            activated, deactivated = backfill_active_listings(batch_size, progress)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Activated {activated} and deactivated {deactivated} apartments.'
+                )
+            )
+            return
+
+        deactivated = deactivate_expired_adverts(batch_size, progress)
+        self.stdout.write(self.style.SUCCESS(f'Deactivated {deactivated} expired adverts.'))
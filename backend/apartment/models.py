@@ -2,7 +2,7 @@
 from uuid import uuid4
 from django.db import models
 from django.contrib.auth import get_user_model
-from django.core.validators import MaxValueValidator
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.utils import timezone
 from country.models import Country
 from state.models import State
@@ -10,6 +10,7 @@ from city.models import City
 from school.models import School
 from amenity.models import Amenity
 from user_preferred_qualities.models import UserPreferredQuality
+from apartment.geo import encode_geohash
 
 
 User = get_user_model()
@@ -62,6 +63,24 @@ PRICE_DURATION = (
     ('year', 'Year')
 )
 
+# Number of each price duration in a month, as a numerator and denominator,
+# used to compare prices given for different durations.
+PRICE_DURATIONS_PER_MONTH = {
+    'hour': (720, 1),
+    'day': (30, 1),
+    'week': (30, 7),
+    'month': (1, 1),
+    'year': (1, 12)
+}
+
+def get_price_per_month(price, price_duration):
+    """
+    This function returns the price of an apartment for a month, rounded to the
+    nearest unit. It is computed with integers, so it is the same everywhere.
+    """
+    numerator, denominator = PRICE_DURATIONS_PER_MONTH.get(price_duration, (1, 1))
+    return (2 * price * numerator + denominator) // (2 * denominator)
+
 APPROVAL_STATUS_CHOICES = (
     ('pending', 'Pending'),
     ('accepted', 'Accepted'),
@@ -87,7 +106,18 @@ class Apartment(models.Model):
     description = models.TextField(null=True, blank=True)
     nearest_bus_stop = models.CharField(max_length=500)
     address = models.CharField(max_length=500, null=True, blank=True)
+    latitude = models.FloatField(null=True, blank=True,
+                                 validators=[MinValueValidator(-90), MaxValueValidator(90)])
+    longitude = models.FloatField(null=True, blank=True,
+                                  validators=[MinValueValidator(-180), MaxValueValidator(180)])
+    # Geohash of the coordinates, set on save. Apartments near a point are found
+    # with prefix queries on it.
+    geohash = models.CharField(max_length=12, null=True, blank=True,
+                               editable=False, db_index=True)
     price = models.IntegerField()
+    # Price for a month, set on save from price and price_duration. Prices
+    # given for different durations are filtered and sorted on it.
+    price_per_month = models.BigIntegerField(null=True, blank=True, editable=False)
     size = models.CharField(max_length=500, null=True, blank=True)
     floor_number = models.IntegerField(choices=FLOOR_NUMBER, null=True, blank=True)
     listing_type = models.CharField(max_length=500, choices=LISTING_TYPE)
@@ -104,6 +134,13 @@ class Apartment(models.Model):
     advert_exp_time = models.DateTimeField(null=True, blank=True)
     num_of_exp_time_extension = models.IntegerField(default=0,
                                                     validators=[MaxValueValidator(limit_value=1)])
+    # True while the advert is shown to the public. It is set on save and set to
+    # False by the sweep_expired_adverts command once advert_exp_time passes.
+    is_active_listing = models.BooleanField(default=False, editable=False)
+    # Number of likes of the apartment. It is only changed with F expressions when
+    # an apartment is liked or unliked, and recomputed by the reconcile_like_counts
+    # command, so saving an apartment never writes it.
+    like_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -111,14 +148,73 @@ class Apartment(models.Model):
         """
         db_table: Name of the table this class creates in the database.
         ordering: The order the instances of this model is displayed on the admin page.
+        indexes: Indexes used by the queries that list active adverts, newest
+                 or most liked first, and that search them by city and price per month.
         """
         db_table = 'apartments'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_active_listing', '-created_at']),
+            models.Index(fields=['is_active_listing', '-like_count', '-created_at']),
+            models.Index(fields=['is_active_listing', 'city', 'price_per_month'])
+        ]
 
     def __str__(self):
         """This method returns a string representation of the instance of this class."""
         return f'{self.id}'
 
+    def save(self, *args, **kwargs):
+        """
+        This method sets is_active_listing, geohash and price_per_month before the
+        apartment is saved. like_count is not saved for existing apartments, so
+        likes made since the apartment was read are not overwritten.
+        """
+        deferred_fields = self.get_deferred_fields()
+        self.is_active_listing = self.get_is_active_listing()
+        if not {'latitude', 'longitude'} & deferred_fields:
+            self.geohash = self.get_geohash()
+        if not {'price', 'price_duration'} & deferred_fields and self.price is not None:
+            self.price_per_month = get_price_per_month(self.price, self.price_duration)
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'like_count'
+                and field.attname not in deferred_fields
+            ]
+        elif update_fields is not None:
+            update_fields = list(update_fields)
+            if 'is_active_listing' not in update_fields:
+                update_fields.append('is_active_listing')
+            if ('latitude' in update_fields or 'longitude' in update_fields) \
+                and 'geohash' not in update_fields:
+                update_fields.append('geohash')
+            if ('price' in update_fields or 'price_duration' in update_fields) \
+                and 'price_per_month' not in update_fields:
+                update_fields.append('price_per_month')
+            kwargs['update_fields'] = update_fields
+
+        super().save(*args, **kwargs)
+
+    def get_is_active_listing(self):
+        """
+        This method returns True if the advert is approved, not taken
+        and has not expired.
+        """
+        return (
+            self.is_taken is False
+            and self.approval_status == 'accepted'
+            and self.advert_exp_time is not None
+            and self.advert_exp_time > timezone.now()
+        )
+
+    def get_geohash(self):
+        """This method returns the geohash of the coordinates, or None if they are not given."""
+        if self.latitude is None or self.longitude is None:
+            return None
+        return encode_geohash(self.latitude, self.longitude)
+
     @property
     def advert_days_left(self):
         """Calculate the number of days left until expiration."""
@@ -183,3 +279,51 @@ class ApartmentUserPreferredQuality(models.Model):
         # pylint: disable=no-member
         return f'Apartment_id: {self.apartment.id} - '\
                 f'User_preferred_quality: {self.user_preferred_quality.name}'
+
+
+LOCATION_TYPE = (
+    ('country', 'Country'),
+    ('state', 'State'),
+    ('city', 'City')
+)
+
+class ApartmentPriceStatistic(models.Model):
+    """
+    This class defines the fields of the apartment_price_statistics table, a
+    summary of the prices per month of the active adverts of a location, listing
+    type and number of bedrooms. Rows with an empty listing_type or a null
+    bedrooms are for all listing types or numbers of bedrooms. The table is
+    rebuilt by the aggregate_price_statistics command.
+    """
+    id = models.CharField(default=uuid4, max_length=36,
+                          unique=True, primary_key=True, editable=False)
+    location_type = models.CharField(max_length=20, choices=LOCATION_TYPE)
+    location_id = models.CharField(max_length=36)
+    listing_type = models.CharField(max_length=500, blank=True, default='')
+    bedrooms = models.IntegerField(null=True, blank=True)
+    apartment_count = models.IntegerField()
+    min_price = models.BigIntegerField()
+    p10_price = models.BigIntegerField()
+    p50_price = models.BigIntegerField()
+    p90_price = models.BigIntegerField()
+    max_price = models.BigIntegerField()
+    # List of the buckets of prices per month, with their min, max and count.
+    histogram = models.JSONField(default=list)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        """
+        db_table: Name of the table this class creates in the database.
+        ordering: The order the instances of this model is displayed on the admin page.
+        indexes: Index used to find the statistic of a location.
+        """
+        db_table = 'apartment_price_statistics'
+        ordering = ['location_type', 'location_id', 'listing_type', 'bedrooms']
+        indexes = [
+            models.Index(fields=['location_type', 'location_id', 'listing_type', 'bedrooms'])
+        ]
+
+    def __str__(self):
+        """This method returns a string representation of the instance of this class."""
+        return f'{self.location_type} {self.location_id} - {self.listing_type or "all"} - '\
+                f'{"all" if self.bedrooms is None else self.bedrooms} bedrooms'
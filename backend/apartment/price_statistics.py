@@ -0,0 +1,127 @@
+"""
+This module defines the functions that build the apartment_price_statistics
+table, the percentiles and histograms of the prices per month of the active
+adverts of each country, state and city, by listing type and number of
+bedrooms. It is rebuilt periodically by the aggregate_price_statistics
+command, so the statistics endpoint never scans the apartments table.
+"""
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+from apartment.models import Apartment, ApartmentAmenity, ApartmentPriceStatistic
+
+
+# Lower bounds of the buckets of prices per month of the histograms. The last
+# bucket has no upper bound.
+HISTOGRAM_BOUNDS = (
+    0, 10000, 20000, 30000, 50000, 75000, 100000,
+    150000, 200000, 300000, 500000, 1000000
+)
+
+PERCENTILES = (('p10_price', 0.1), ('p50_price', 0.5), ('p90_price', 0.9))
+
+
+def get_percentile(prices, fraction):
+    """
+    This function returns a percentile of sorted prices, interpolated between
+    the two nearest prices and rounded to the nearest unit.
+    """
+    position = (len(prices) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(prices) - 1)
+    value = prices[lower] + (prices[upper] - prices[lower]) * (position - lower)
+    return int(value + 0.5)
+
+def get_histogram(prices):
+    """This function returns the buckets of the histogram of sorted prices with their counts."""
+    histogram = []
+    index = 0
+    for i, minimum in enumerate(HISTOGRAM_BOUNDS):
+        maximum = HISTOGRAM_BOUNDS[i + 1] - 1 if i + 1 < len(HISTOGRAM_BOUNDS) else None
+        count = 0
+        while index < len(prices) and (maximum is None or prices[index] <= maximum):
+            count += 1
+            index += 1
+        histogram.append({'min': minimum, 'max': maximum, 'count': count})
+    return histogram
+
+def get_group_keys(row):
+    """
+    This function returns the keys of the statistics an apartment is counted in:
+    its country, state and city, each for its listing type and for all listing
+    types, and for its number of bedrooms and for any number of bedrooms.
+    """
+    keys = []
+    for location_type in ('country', 'state', 'city'):
+        for listing_type in ('', row['listing_type']):
+            for bedrooms in {None, row['bedrooms']}:
+                keys.append((location_type, row[f'{location_type}_id'], listing_type, bedrooms))
+    return keys
+
+def aggregate_price_statistics(batch_size=1000, progress=None):
+    """
+    This function reads the prices per month of the active adverts in batches,
+    and replaces the rows of the apartment_price_statistics table with their
+    statistics. Adverts whose price per month is not set are left out. If given,
+    progress is called with the batch number and the number of adverts read in
+    the batch. It returns the number of statistics saved.
+    """
+    # pylint: disable=no-member
+
+    bedrooms = ApartmentAmenity.objects.filter(
+        apartment=OuterRef('pk'),
+        amenity__name='bedroom'
+    ).values('quantity')[:1]
+
+    groups = {}
+    number_of_batches = 0
+    last_id = None
+
+    while True:
+        apartments = Apartment.objects.filter(
+            is_active_listing=True,
+            price_per_month__isnull=False
+        ).order_by('pk')
+        if last_id is not None:
+            apartments = apartments.filter(pk__gt=last_id)
+
+        rows = list(apartments.annotate(bedrooms=Subquery(bedrooms)).values(
+            'id', 'country_id', 'state_id', 'city_id', 'listing_type',
+            'bedrooms', 'price_per_month'
+        )[:batch_size])
+        if not rows:
+            break
+        last_id = rows[-1]['id']
+
+        for row in rows:
+            for key in get_group_keys(row):
+                groups.setdefault(key, []).append(row['price_per_month'])
+
+        number_of_batches += 1
+        if progress is not None:
+            progress(number_of_batches, len(rows))
+
+    computed_at = timezone.now()
+    statistics = []
+    for (location_type, location_id, listing_type, number_of_bedrooms), prices in groups.items():
+        prices.sort()
+        statistics.append(ApartmentPriceStatistic(
+            location_type=location_type,
+            location_id=location_id,
+            listing_type=listing_type,
+            bedrooms=number_of_bedrooms,
+            apartment_count=len(prices),
+            min_price=prices[0],
+            max_price=prices[-1],
+            histogram=get_histogram(prices),
+            computed_at=computed_at,
+            **{name: get_percentile(prices, fraction) for name, fraction in PERCENTILES}
+        ))
+
+    # The statistics are replaced at once, so the endpoint never returns a mix
+    # of old and new rows.
+    with transaction.atomic():
+        ApartmentPriceStatistic.objects.all().delete()
+        ApartmentPriceStatistic.objects.bulk_create(statistics, batch_size=batch_size)
+
+    return len(statistics)
@@ -0,0 +1,466 @@
+"""
+This module defines class ApartmentSearchIndex, an optional in-process index
+of the active apartment adverts used by ApartmentSearchView. It keeps the
+columns the search filters and sorts on in NumPy arrays and evaluates a search
+with vectorized masks, returning the ordered ids of the matching apartments,
+which are then read from the database. It is used if NumPy is installed and
+settings.APARTMENT_SEARCH_INDEX is True.
+"""
+import threading
+import time
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from apartment.models import Apartment, ApartmentAmenity, LISTING_TYPE, AVAILABLE_FOR
+from apartment.facets import PRICE_RANGES, get_price_range_name
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Sorts evaluated by the index, as column and direction. Any other sort_type
+# is left to the database, as are sorts on columns with nulls, whose order
+# depends on the database, except price_per_month, which the database sorts
+# with nulls last like the index.
+INDEX_SORTS = {
+    '': None,
+    'popular': ('like_count', -1),
+    'bedroom': ('bedrooms', 1),
+    '-bedroom': ('bedrooms', -1),
+    'price': ('price', 1),
+    '-price': ('price', -1),
+    'price_per_month': ('price_per_month', 1),
+    '-price_per_month': ('price_per_month', -1),
+    'created_at': ('created_at', 1),
+    '-created_at': ('created_at', -1)
+}
+
+# Columns of the apartments read to build the index.
+INDEX_FIELDS = (
+    'id', 'price', 'price_per_month', 'country_id', 'state_id', 'city_id', 'school_id',
+    'listing_type', 'available_for', 'floor_number', 'like_count',
+    'created_at', 'advert_exp_time'
+)
+
+# Columns stored as codes of their values.
+CODED_COLUMNS = ('country', 'state', 'city', 'school', 'listing_type', 'available_for')
+
+# Number of amenities stored in each word of the amenity bitmasks.
+WORD_SIZE = 64
+
+# Number of ids read from the database with each query, which keeps the
+# number of query parameters within the limits of the databases, such as
+# the 999 parameters of older SQLite versions.
+HYDRATE_CHUNK_SIZE = 500
+
+
+def get_timestamp(value):
+    """This function returns a datetime as microseconds since the epoch, or 0 if it is None."""
+    return 0 if value is None else int(value.timestamp() * 1000000)
+
+
+class ApartmentSearchIndex:
+    """
+    This class defines the columns of the index and the methods that build,
+    update and search it. Rows of apartments that stop being active are marked
+    as removed and dropped the next time the index is built.
+    """
+
+    def __init__(self):
+        """This method creates an empty index."""
+        self.lock = threading.RLock()
+        self.columns = None
+        self.positions = {}
+        self.codes = {column: {} for column in CODED_COLUMNS}
+        self.amenity_bits = {}
+        self.built_at = None
+
+    @property
+    def is_built(self):
+        """This property is True once the index has been built."""
+        return self.columns is not None
+
+    def clear(self):
+        """This method empties the index. It is built again on the next search."""
+        with self.lock:
+            self.__init__()
+
+    def build(self):
+        """This method reads all active adverts from the database into the index."""
+        # pylint: disable=no-member
+
+        rows = list(Apartment.objects.filter(is_active_listing=True).values(*INDEX_FIELDS))
+        amenities = self.get_amenities([row['id'] for row in rows])
+
+        with self.lock:
+            self.codes = {column: {} for column in CODED_COLUMNS}
+            self.amenity_bits = {}
+            for names in amenities.values():
+                for name in names:
+                    self.amenity_bits.setdefault(name, len(self.amenity_bits))
+
+            self.columns = self.get_empty_columns(len(rows))
+            self.positions = {}
+            for position, row in enumerate(rows):
+                self.positions[row['id']] = position
+                self.set_row(position, row, amenities.get(row['id'], {}))
+
+            self.built_at = time.monotonic()
+
+    def get_amenities(self, apartment_ids):
+        """
+        This method returns the amenities of the apartments as dictionaries of
+        amenity name and quantity, keyed by apartment id.
+        """
+        # pylint: disable=no-member
+
+        amenities = {}
+        for amenity in ApartmentAmenity.objects.filter(
+            apartment_id__in=apartment_ids
+        ).values('apartment_id', 'amenity__name', 'quantity'):
+            amenities.setdefault(amenity['apartment_id'], {})[
+                amenity['amenity__name']
+            ] = amenity['quantity']
+        return amenities
+
+    def get_empty_columns(self, size):
+        """This method returns the columns of an index of size rows."""
+        words = max(1, -(-len(self.amenity_bits) // WORD_SIZE))
+        return {
+            'id': np.empty(size, dtype=object),
+            'removed': np.zeros(size, dtype=bool),
+            'price': np.zeros(size, dtype=np.int64),
+            # Prices per month are NaN until they are backfilled.
+            'price_per_month': np.full(size, np.nan),
+            'country': np.zeros(size, dtype=np.int32),
+            'state': np.zeros(size, dtype=np.int32),
+            'city': np.zeros(size, dtype=np.int32),
+            'school': np.zeros(size, dtype=np.int32),
+            'listing_type': np.zeros(size, dtype=np.int32),
+            'available_for': np.zeros(size, dtype=np.int32),
+            # Floors and bedrooms are NaN if they are not given, so they never
+            # match a range and are excluded when sorting by bedrooms.
+            'floor_number': np.full(size, np.nan),
+            'bedrooms': np.full(size, np.nan),
+            'amenities': np.zeros((size, words), dtype=np.uint64),
+            'like_count': np.zeros(size, dtype=np.int64),
+            'created_at': np.zeros(size, dtype=np.int64),
+            'advert_exp_time': np.zeros(size, dtype=np.int64)
+        }
+
+    def get_code(self, column, value, add=False):
+        """
+        This method returns the code of a value of a coded column, or -1 if the
+        value is not in the index and add is False. None is coded as -2.
+        """
+        if value is None:
+            return -2
+        codes = self.codes[column]
+        if add:
+            return codes.setdefault(str(value), len(codes))
+        return codes.get(str(value), -1)
+
+    def set_row(self, position, row, amenities):
+        """This method writes the columns of an apartment at a position of the index."""
+        columns = self.columns
+        columns['id'][position] = row['id']
+        columns['removed'][position] = False
+        columns['price'][position] = row['price']
+        columns['price_per_month'][position] = np.nan if row['price_per_month'] is None \
+            else row['price_per_month']
+        for column in ('country', 'state', 'city', 'school'):
+            columns[column][position] = self.get_code(column, row[f'{column}_id'], add=True)
+        for column in ('listing_type', 'available_for'):
+            columns[column][position] = self.get_code(column, row[column], add=True)
+        columns['floor_number'][position] = np.nan if row['floor_number'] is None \
+            else row['floor_number']
+        columns['bedrooms'][position] = amenities.get('bedroom', np.nan)
+        columns['like_count'][position] = row['like_count']
+        columns['created_at'][position] = get_timestamp(row['created_at'])
+        columns['advert_exp_time'][position] = get_timestamp(row['advert_exp_time'])
+
+        columns['amenities'][position] = 0
+        for name in amenities:
+            bit = self.amenity_bits[name]
+            columns['amenities'][position, bit // WORD_SIZE] |= np.uint64(1 << (bit % WORD_SIZE))
+
+    def refresh(self, apartment_id):
+        """
+        This method reads an apartment from the database again and updates,
+        adds or removes its row.
+        """
+        # pylint: disable=no-member
+
+        # Ids of apartments that were just created are UUIDs, not strings.
+        apartment_id = str(apartment_id)
+        row = Apartment.objects.filter(
+            pk=apartment_id,
+            is_active_listing=True
+        ).values(*INDEX_FIELDS).first()
+        amenities = self.get_amenities([apartment_id]).get(apartment_id, {}) if row else {}
+
+        with self.lock:
+            if not self.is_built:
+                return
+
+            position = self.positions.get(apartment_id)
+            if row is None:
+                if position is not None:
+                    self.columns['removed'][position] = True
+                return
+
+            # Add words to the bitmasks if the apartment has new amenities.
+            for name in amenities:
+                self.amenity_bits.setdefault(name, len(self.amenity_bits))
+            words = max(1, -(-len(self.amenity_bits) // WORD_SIZE))
+            if words > self.columns['amenities'].shape[1]:
+                self.columns['amenities'] = np.pad(
+                    self.columns['amenities'],
+                    ((0, 0), (0, words - self.columns['amenities'].shape[1]))
+                )
+
+            if position is None:
+                position = len(self.columns['id'])
+                new_row = self.get_empty_columns(1)
+                self.columns = {
+                    name: np.concatenate([column, new_row[name]])
+                    for name, column in self.columns.items()
+                }
+                self.positions[apartment_id] = position
+
+            self.set_row(position, row, amenities)
+
+    def search(self, params):
+        """
+        This method returns the ordered ids of the apartments matching the search
+        parameters of ApartmentSearchView, validated by ApartmentSearchSerializer,
+        whose filters may have several values, or None if the parameters cannot be
+        evaluated by the index and the database must be searched instead.
+        """
+        sort_type = params.get('sort_type') or ''
+        if sort_type not in INDEX_SORTS:
+            return None
+
+        with self.lock:
+            mask = self.get_mask(params)
+            if mask is None:
+                return None
+
+            columns = self.columns
+            positions = np.flatnonzero(mask)
+
+            # Sort by the sort column, then by the newest apartment.
+            keys = [-columns['created_at'][positions]]
+            sort = INDEX_SORTS[sort_type]
+            if sort is not None:
+                column, direction = sort
+                keys.append(direction * columns[column][positions])
+            order = np.lexsort(keys)
+
+            return columns['id'][positions[order]].tolist()
+
+    def get_mask(self, params):
+        """
+        This method returns the mask of the rows matching the search parameters,
+        or None if the parameters cannot be evaluated by the index. It must be
+        called with the lock held.
+        """
+        # pylint: disable=too-many-return-statements
+
+        # Full-text and location searches are left to the indexes of the database.
+        if (params.get('q') or '').strip() or params.get('near') or params.get('radius'):
+            return None
+
+        try:
+            price_range = (self.get_number(params, 'min_price'),
+                           self.get_number(params, 'max_price'))
+            price_per_month_range = (self.get_number(params, 'min_price_per_month'),
+                                     self.get_number(params, 'max_price_per_month'))
+            floor_range = (self.get_number(params, 'min_floor_num'),
+                           self.get_number(params, 'max_floor_num'))
+        except ValueError:
+            return None
+
+        amenities = [
+            value for key in params if key.startswith('amenities')
+            for value in self.get_values(params, key)
+        ]
+
+        columns = self.columns
+        mask = ~columns['removed'] & (
+            columns['advert_exp_time'] > get_timestamp(timezone.now())
+        )
+
+        for column in CODED_COLUMNS:
+            values = self.get_values(params, column)
+            if values:
+                mask &= np.isin(columns[column], [self.get_code(column, value) for value in values])
+
+        for column, (minimum, maximum) in (
+            ('price', price_range),
+            ('price_per_month', price_per_month_range),
+            ('floor_number', floor_range)
+        ):
+            if minimum is not None:
+                mask &= columns[column] >= minimum
+            if maximum is not None:
+                mask &= columns[column] <= maximum
+
+        if amenities:
+            if any(name not in self.amenity_bits for name in amenities):
+                return np.zeros_like(mask)
+            required = np.zeros(columns['amenities'].shape[1], dtype=np.uint64)
+            for name in amenities:
+                bit = self.amenity_bits[name]
+                required[bit // WORD_SIZE] |= np.uint64(1 << (bit % WORD_SIZE))
+            mask &= ((columns['amenities'] & required) == required).all(axis=1)
+
+        # Only apartments with bedrooms are returned when sorting by bedrooms.
+        if params.get('sort_type') in ('bedroom', '-bedroom'):
+            mask &= ~np.isnan(columns['bedrooms'])
+
+        return mask
+
+    def count_facets(self, params, facets):
+        """
+        This method returns the counts of the facets for the apartments matching
+        the search parameters, as returned by apartment.facets.count_facets, or
+        None if the parameters cannot be evaluated by the index.
+        """
+        with self.lock:
+            mask = self.get_mask(params)
+            if mask is None:
+                return None
+
+            columns = self.columns
+            counts = {}
+
+            for facet, values in (
+                ('listing_type', [value for value, _ in LISTING_TYPE]),
+                ('available_for', [value for value, _ in AVAILABLE_FOR])
+            ):
+                if facet in facets:
+                    counts[facet] = {
+                        value: int(np.count_nonzero(
+                            columns[facet][mask] == self.get_code(facet, value)
+                        )) for value in values
+                    }
+
+            if 'price' in facets:
+                prices = columns['price'][mask]
+                counts['price'] = {}
+                for minimum, maximum in PRICE_RANGES:
+                    in_range = prices >= minimum
+                    if maximum is not None:
+                        in_range &= prices <= maximum
+                    counts['price'][get_price_range_name(minimum, maximum)] = \
+                        int(np.count_nonzero(in_range))
+
+            if 'amenities' in facets:
+                amenities = columns['amenities'][mask]
+                counts['amenities'] = {}
+                for name, bit in sorted(self.amenity_bits.items()):
+                    count = int(np.count_nonzero(
+                        amenities[:, bit // WORD_SIZE] & np.uint64(1 << (bit % WORD_SIZE))
+                    ))
+                    if count:
+                        counts['amenities'][name] = count
+
+            if 'city' in facets:
+                cities = {code: value for value, code in self.codes['city'].items()}
+                codes, city_counts = np.unique(columns['city'][mask], return_counts=True)
+                counts['city'] = dict(sorted(
+                    (cities[code], int(count)) for code, count in zip(codes.tolist(), city_counts)
+                ))
+
+            return counts
+
+    def get_values(self, params, name):
+        """
+        This method returns the values of a search parameter that is a list or a
+        single value, or an empty list if it is not given.
+        """
+        value = params.get(name)
+        if value is None or value == '':
+            return []
+        if isinstance(value, (list, tuple)):
+            return [str(item) for item in value]
+        return [str(value)]
+
+    def get_number(self, params, name):
+        """This method returns a search parameter as an int, or None if it is not given."""
+        value = params.get(name)
+        if value is None or value == '':
+            return None
+        return int(value)
+
+    def is_stale(self):
+        """
+        This method returns True if the index was built more than
+        settings.APARTMENT_SEARCH_INDEX_MAX_AGE seconds ago. The index is built again
+        after that time, to pick up changes made by other processes and bulk updates.
+        """
+        max_age = getattr(settings, 'APARTMENT_SEARCH_INDEX_MAX_AGE', 300)
+        return self.built_at is None or time.monotonic() - self.built_at > max_age
+
+
+search_index = ApartmentSearchIndex()
+
+# Lock held while the index is built, so the requests of a process do not
+# build it at the same time.
+build_lock = threading.Lock()
+
+def get_search_index():
+    """
+    This function returns the search index of this process, or None if NumPy is
+    not installed or the index is disabled in the settings. The index is built
+    by the first request. When it is stale, one request builds it again while
+    the other requests keep searching the index that is already built.
+    """
+    if np is None or not getattr(settings, 'APARTMENT_SEARCH_INDEX', False):
+        return None
+
+    if not search_index.is_stale():
+        return search_index
+
+    if search_index.is_built:
+        if build_lock.acquire(blocking=False):
+            try:
+                if search_index.is_stale():
+                    search_index.build()
+            finally:
+                build_lock.release()
+        return search_index
+
+    with build_lock:
+        if search_index.is_stale():
+            search_index.build()
+    return search_index
+
+def refresh_search_index(apartment_id):
+    """
+    This function updates the row of an apartment in the search index once the
+    current transaction is committed, if the index of this process is built.
+    """
+    if search_index.is_built:
+        transaction.on_commit(lambda: search_index.refresh(apartment_id))
+
+def get_apartments_in_order(apartment_ids, columns):
+    """
+    This function reads the apartments with the given ids from the database and
+    returns their columns in the order of the ids. Apartments that are no longer
+    active are left out. The ids are read HYDRATE_CHUNK_SIZE at a time.
+    """
+    # pylint: disable=no-member
+
+    rows = {}
+    for start in range(0, len(apartment_ids), HYDRATE_CHUNK_SIZE):
+        rows.update(
+            (row['id'], row) for row in Apartment.objects.filter(
+                pk__in=apartment_ids[start:start + HYDRATE_CHUNK_SIZE],
+                is_active_listing=True
+            ).values(*columns)
+        )
+    return [rows[apartment_id] for apartment_id in apartment_ids if apartment_id in rows]
@@ -1,26 +1,35 @@
 """This module defines the serializer classes used for the apartment app."""
 from datetime import timedelta
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q
 from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.fields import empty
 from drf_spectacular.utils import extend_schema_field
 from user.utils import check_html_tags, resize_image
-from user.serializers import UserSerializer
+from user.serializers import UserSerializer, SparseFieldsMixin
 from image.serializers import ImageSerializer
 from image.models import Image
-from country.models import Country
 from country.serializers import CountrySerializer
-from state.models import State
 from state.serializers import StateSerializer
-from city.models import City
 from city.serializers import CitySerializer
-from school.models import School
 from school.serializers import SchoolModelSerializer
 from amenity.models import Amenity
 from amenity.serializers import AmenityModelSerializer
 from user_preferred_qualities.serializers import UserPreferredQualitySerializer
 from user_preferred_qualities.models import UserPreferredQuality
 from apartment_like.models import ApartmentLike
-from .models import Apartment, ApartmentAmenity, ApartmentUserPreferredQuality
+from user.models import UserProfile, UserProfileInterest
+from .models import (
+    Apartment,
+    ApartmentAmenity,
+    ApartmentUserPreferredQuality,
+    ApartmentPriceStatistic,
+    LISTING_TYPE,
+    AVAILABLE_FOR
+)
+from .geo import validate_coordinates
+from .search_index import HYDRATE_CHUNK_SIZE
 
 
 class ApartmentAmenitySerializer(serializers.ModelSerializer):
@@ -57,7 +66,7 @@ class ApartmentUserPreferredQualitySerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class ApartmentSerializer(serializers.ModelSerializer):
+class ApartmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """This class defines the fields of the Apartment model to be validated and serialized."""
     # pylint: disable=no-member
 
@@ -67,6 +76,8 @@ class ApartmentSerializer(serializers.ModelSerializer):
     liked = serializers.SerializerMethodField()
     advert_exp_time = serializers.DateTimeField(read_only=True)
     num_of_exp_time_extension = serializers.IntegerField(read_only=True)
+    like_count = serializers.IntegerField(read_only=True)
+    price_per_month = serializers.IntegerField(read_only=True)
     is_taken_time = serializers.DateTimeField(read_only=True)
     is_taken_number = serializers.IntegerField(read_only=True)
     user = UserSerializer(required=False)
@@ -122,6 +133,8 @@ class ApartmentSerializer(serializers.ModelSerializer):
             'school',
             'nearest_bus_stop',
             'address',
+            'latitude',
+            'longitude',
             'listing_type',
             'size',
             'floor_number',
@@ -130,6 +143,7 @@ class ApartmentSerializer(serializers.ModelSerializer):
             'title',
             'description',
             'price',
+            'price_per_month',
             'is_taken',
             'is_taken_time',
             'is_taken_number',
@@ -142,6 +156,7 @@ class ApartmentSerializer(serializers.ModelSerializer):
             'advert_days_left',
             'advert_exp_time',
             'num_of_exp_time_extension',
+            'like_count',
             'liked'
         ]
 
@@ -157,7 +172,7 @@ class ApartmentSerializer(serializers.ModelSerializer):
         if user.is_staff is True:
             return data
 
-        if user == instance.user:
+        if user.pk == instance.user_id:
             excluded_fields = [
                 'is_taken_time',
                 'is_taken_number',
@@ -169,7 +184,7 @@ class ApartmentSerializer(serializers.ModelSerializer):
 
             return data
 
-        if user != instance.user:
+        if user.pk != instance.user_id:
             excluded_fields = [
                 'is_taken_time',
                 'is_taken_number',
@@ -202,6 +217,13 @@ class ApartmentSerializer(serializers.ModelSerializer):
         is_taken = attrs.get('is_taken')
         extend_time = attrs.get('extend_time')
 
+        # Ensure the coordinates of the apartment are entered together.
+        if ('latitude' in attrs) != ('longitude' in attrs) \
+            or (attrs.get('latitude') is None) != (attrs.get('longitude') is None):
+            raise serializers.ValidationError(
+                'The fields "latitude" and "longitude" must be entered together.'
+            )
+
         # Ensure country and state relationship
         if country is not None and state is not None:
             states = country.states.all()
@@ -509,119 +531,592 @@ class ApartmentSerializer(serializers.ModelSerializer):
         return images_id_to_delete
 
 
-class ApartmentSearchSerializer(serializers.ModelSerializer):
-    """This class defines the fields of the Apartment model to be validated and serialized."""
-    # pylint: disable=no-member
-    country = serializers.PrimaryKeyRelatedField(
-        required=False,
-        allow_null=True,
-        queryset=Country.objects.prefetch_related('apartments').all()
+# Largest number of values of a filter of the apartment search.
+SEARCH_MAX_VALUES = 50
+
+# Sort types of the apartment search that are not fields of the Apartment model.
+SEARCH_SORT_TYPES = ('distance', 'popular', 'bedroom', '-bedroom')
+
+
+class SearchValuesField(serializers.ListField):
+    """
+    This class defines a list field read from a query string parameter that is
+    repeated or whose values are separated by commas. If prefix is True, the
+    parameters whose names start with the name of the field are read too, like
+    amenities1 and amenities2. The values are returned sorted without duplicates.
+    """
+
+    def __init__(self, *args, prefix=False, **kwargs):
+        """This method sets whether the parameters starting with the field name are read."""
+        self.prefix = prefix
+        kwargs.setdefault('max_length', SEARCH_MAX_VALUES)
+        super().__init__(*args, **kwargs)
+
+    def get_value(self, dictionary):
+        """This method returns the values of the parameter, or empty if it is not given."""
+        values = []
+        for name in dictionary:
+            if name != self.field_name \
+                and not (self.prefix and name.startswith(self.field_name)):
+                continue
+            items = dictionary.getlist(name) if hasattr(dictionary, 'getlist') \
+                else dictionary[name]
+            if not isinstance(items, (list, tuple)):
+                items = [items]
+            for item in items:
+                values.extend(value.strip() for value in str(item).split(','))
+
+        values = [value for value in values if value != '']
+        return values if values else empty
+
+    def to_internal_value(self, data):
+        """This method returns the validated values sorted without duplicates."""
+        return sorted(set(super().to_internal_value(data)))
+
+
+class ApartmentSearchSerializer(serializers.Serializer):
+    """
+    This class validates the query parameters of the apartment search. Each
+    categorical filter takes one or more values, and an apartment matches if it
+    has any of them, except for amenities, which an apartment must all have.
+    """
+    # pylint: disable=abstract-method
+
+    country = SearchValuesField(child=serializers.CharField(max_length=36), required=False)
+    state = SearchValuesField(child=serializers.CharField(max_length=36), required=False)
+    city = SearchValuesField(child=serializers.CharField(max_length=36), required=False)
+    school = SearchValuesField(child=serializers.CharField(max_length=36), required=False)
+    listing_type = SearchValuesField(
+        child=serializers.ChoiceField(choices=LISTING_TYPE), required=False
     )
-    state = serializers.PrimaryKeyRelatedField(
-        required=False,
-        allow_null=True,
-        queryset=State.objects.prefetch_related('apartments').all()
+    available_for = SearchValuesField(
+        child=serializers.ChoiceField(choices=AVAILABLE_FOR), required=False
     )
-    city = serializers.PrimaryKeyRelatedField(
-        required=False,
-        allow_null=True,
-        queryset=City.objects.prefetch_related('apartments').all()
+    amenities = SearchValuesField(
+        child=serializers.CharField(max_length=100), required=False, prefix=True
+    )
+    min_price = serializers.IntegerField(min_value=0, required=False)
+    max_price = serializers.IntegerField(min_value=0, required=False)
+    min_price_per_month = serializers.IntegerField(
+        min_value=0, required=False,
+        help_text='Minimum price for a month, whatever the price duration of the apartments. '
+                  'Sort by it with sort_type price_per_month or -price_per_month'
     )
-    school = serializers.PrimaryKeyRelatedField(
+    max_price_per_month = serializers.IntegerField(
+        min_value=0, required=False,
+        help_text='Maximum price for a month, whatever the price duration of the apartments'
+    )
+    min_floor_num = serializers.IntegerField(required=False)
+    max_floor_num = serializers.IntegerField(required=False)
+    q = serializers.CharField(
+        required=False, allow_blank=True, max_length=200,
+        help_text='Words to search for in the title, description, address and nearest '
+                  'bus stop, ordered by relevance if sort_type is not given'
+    )
+    near = serializers.CharField(
         required=False,
-        allow_null=True,
-        queryset=School.objects.prefetch_related('apartments').all()
+        help_text='Latitude and longitude separated by a comma. Only apartments within '
+                  'radius of it are returned, nearest first if sort_type is not given'
     )
-    amenities = ApartmentAmenitySerializer(
-            required=False,
-            many=True,
-            allow_empty=True,
-            source='apartmentamenity_set',
-            allow_null=True
+    radius = serializers.FloatField(
+        required=False,
+        help_text='Radius in kilometres of the location search, 5 by default. If it is '
+                  'given with one school and without near, the apartments near the '
+                  'school are returned'
     )
-    max_price = serializers.IntegerField(min_value=0, allow_null=True, required=False)
-    min_price = serializers.IntegerField(min_value=0, allow_null=True, required=False)
-    listing_type = serializers.CharField(required=False, allow_null=True)
+    sort_type = serializers.CharField(required=False)
+
+    def validate_near(self, value):
+        """This method returns the latitude and longitude of the near parameter."""
+        try:
+            latitude, longitude = (float(coordinate) for coordinate in value.split(','))
+        except ValueError as exc:
+            raise serializers.ValidationError(
+                'The value of near must be a latitude and longitude separated by a comma.'
+            ) from exc
+        try:
+            validate_coordinates(latitude, longitude)
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc)) from exc
+        return latitude, longitude
+
+    def validate_radius(self, value):
+        """This method checks that the radius is within the maximum radius of the settings."""
+        max_radius = getattr(settings, 'APARTMENT_SEARCH_MAX_RADIUS', 100)
+        if not 0 < value <= max_radius:
+            raise serializers.ValidationError(
+                f'The value of radius must be greater than 0 and at most {max_radius}.'
+            )
+        return value
+
+    def validate_sort_type(self, value):
+        """
+        This method checks that the apartments can be sorted by the sort type, one
+        of the named sorts or a field of the Apartment model, preceded by - to sort
+        in descending order.
+        """
+        # pylint: disable=no-member
+
+        value = value.strip()
+        fields = [field.name for field in Apartment._meta.concrete_fields]
+        if value not in SEARCH_SORT_TYPES and value.removeprefix('-') not in fields:
+            raise serializers.ValidationError(f'The sort type "{value}" does not exist.')
+        return value
+
+    def validate(self, attrs):
+        """This method checks that the price and floor ranges are not empty."""
+        for minimum, maximum in (
+            ('min_price', 'max_price'),
+            ('min_price_per_month', 'max_price_per_month'),
+            ('min_floor_num', 'max_floor_num')
+        ):
+            if minimum in attrs and maximum in attrs and attrs[minimum] > attrs[maximum]:
+                raise serializers.ValidationError(
+                    f'The field "{minimum}" must not be greater than "{maximum}".'
+                )
+
+        return attrs
+
+    def get_filter(self, location=None):
+        """
+        This method returns the validated filters as a single Q expression of the
+        active apartments that match them. The school filter is left out if the
+        apartments are searched near the school, which is the case when location
+        is given without near.
+        """
+        # pylint: disable=no-member
+
+        filters = self.validated_data
+        condition = Q(is_active_listing=True)
+
+        for name in ('country', 'state', 'city', 'listing_type', 'available_for'):
+            if name in filters:
+                condition &= Q(**{f'{name}__in': filters[name]})
+        if 'school' in filters and (location is None or 'near' in filters):
+            condition &= Q(school__in=filters['school'])
+
+        for field, minimum, maximum in (
+            ('price', 'min_price', 'max_price'),
+            ('price_per_month', 'min_price_per_month', 'max_price_per_month'),
+            ('floor_number', 'min_floor_num', 'max_floor_num')
+        ):
+            if minimum in filters:
+                condition &= Q(**{f'{field}__gte': filters[minimum]})
+            if maximum in filters:
+                condition &= Q(**{f'{field}__lte': filters[maximum]})
+
+        # Each amenity is a subquery, so the apartments are not joined to their
+        # amenities and do not need to be made distinct.
+        for amenity_name in filters.get('amenities', []):
+            condition &= Q(Exists(ApartmentAmenity.objects.filter(
+                apartment=OuterRef('pk'),
+                amenity__name=amenity_name
+            )))
+
+        return condition
+
+
+class ApartmentPriceStatisticSerializer(serializers.ModelSerializer):
+    """This class defines the fields of the ApartmentPriceStatistic model to be serialized."""
 
     class Meta:
         """
-            model: Name of the model
-            fields: The class attributes of the above name model
-                    to be validated
+            model: Name of the model.
+            fields: The class attributes of the named model to be serialized.
         """
-        model = Apartment
+        model = ApartmentPriceStatistic
         fields = [
-            'country',
-            'state',
-            'city',
-            'amenities',
-            'school',
+            'location_type',
+            'location_id',
             'listing_type',
+            'bedrooms',
+            'apartment_count',
+            'min_price',
+            'p10_price',
+            'p50_price',
+            'p90_price',
             'max_price',
-            'min_price'
+            'histogram',
+            'computed_at'
         ]
 
+
+# Fields of the apartments returned by the list, search, featured and detail
+# views, and the columns ApartmentCardSerializer reads to build each of them.
+APARTMENT_CARD_COLUMNS = {
+    'id': (),
+    'user': (
+        'user__username', 'user__email', 'user__is_active', 'user__is_staff',
+        'user__is_superuser', 'user__is_verified', 'user__created_at', 'user__updated_at',
+        'user__profile__gender', 'user__profile__religion', 'user__profile__phone_number',
+        'user__profile__whatsapp_number', 'user__profile__phone_number_is_verified',
+        'user__profile__whatsapp_number_is_verified', 'user__profile__thumbnail',
+        'user__profile__first_name', 'user__profile__last_name'
+    ),
+    'country': ('country_id', 'country__name'),
+    'state': ('state_id', 'state__name', 'state__country_id'),
+    'city': ('city_id', 'city__name', 'city__state_id'),
+    'amenities': (),
+    'user_preferred_qualities': (),
+    'school': ('school_id', 'school__name', 'school__country_id',
+               'school__state_id', 'school__city_id',
+               'school__latitude', 'school__longitude'),
+    'nearest_bus_stop': ('nearest_bus_stop',),
+    'address': ('address',),
+    'latitude': ('latitude',),
+    'longitude': ('longitude',),
+    'listing_type': ('listing_type',),
+    'size': ('size',),
+    'floor_number': ('floor_number',),
+    'available_for': ('available_for',),
+    'price_duration': ('price_duration',),
+    'title': ('title',),
+    'description': ('description',),
+    'price': ('price',),
+    'price_per_month': ('price_per_month',),
+    'is_taken': ('is_taken',),
+    'is_taken_time': ('is_taken_time',),
+    'is_taken_number': ('is_taken_number',),
+    'approval_status': ('approval_status',),
+    'images': (),
+    'video_link': ('video_link',),
+    'advert_days_left': ('advert_exp_time',),
+    'advert_exp_time': ('advert_exp_time',),
+    'num_of_exp_time_extension': ('num_of_exp_time_extension',),
+    'like_count': ('like_count',),
+    'liked': ()
+}
+
+# Nested fields of the apartments. Unless they are expanded, they are returned
+# as primary keys when only some fields are requested.
+APARTMENT_NESTED_FIELDS = (
+    'user', 'country', 'state', 'city', 'school',
+    'amenities', 'user_preferred_qualities', 'images'
+)
+
+# Columns read by ApartmentCardSerializer when all fields are returned.
+# Querysets passed to it must be built with .values(*APARTMENT_CARD_FIELDS),
+# or with the columns returned by get_card_columns.
+APARTMENT_CARD_FIELDS = tuple(dict.fromkeys(
+    ('id', 'user_id') + tuple(
+        column for columns in APARTMENT_CARD_COLUMNS.values() for column in columns
+    )
+))
+
+# Fields removed from the apartments and owners shown to users that are not
+# their owner or a staff, as done by ApartmentSerializer and UserSerializer.
+OWNER_EXCLUDED_FIELDS = ['is_taken_time', 'is_taken_number',
+                         'advert_exp_time', 'num_of_exp_time_extension']
+PUBLIC_EXCLUDED_FIELDS = OWNER_EXCLUDED_FIELDS + ['approval_status', 'advert_days_left', 'is_taken']
+USER_EXCLUDED_FIELDS = ['id', 'email', 'is_superuser', 'is_staff', 'is_active',
+                        'is_verified', 'created_at', 'updated_at']
+PROFILE_EXCLUDED_FIELDS = ['phone_number_is_verified', 'whatsapp_number_is_verified',
+                           'first_name', 'last_name']
+
+DATETIME_FIELD = serializers.DateTimeField()
+
+def get_card_columns(fields=None, expand=None):
+    """
+    This function returns the columns ApartmentCardSerializer reads to return
+    the given fields, with the given nested fields expanded. All columns are
+    returned if fields is None.
+    """
+    if fields is None:
+        return APARTMENT_CARD_FIELDS
+
+    columns = ['id', 'user_id']
+    for field in fields:
+        if field in APARTMENT_NESTED_FIELDS and field not in expand:
+            if APARTMENT_CARD_COLUMNS[field]:
+                columns.append(f'{field}_id')
+        else:
+            columns.extend(APARTMENT_CARD_COLUMNS[field])
+
+    return tuple(dict.fromkeys(columns))
+
+
+class ApartmentCardListSerializer(serializers.ListSerializer):
+    """
+    This class defines the serialization of a list of apartment cards.
+    The rows related to the apartments are fetched with one query per table
+    for every HYDRATE_CHUNK_SIZE apartments instead of one query per apartment.
+    """
+
+    def to_representation(self, data):
+        """This method returns the list of apartment cards of the rows."""
+        rows = list(data)
+        cards = []
+        for start in range(0, len(rows), HYDRATE_CHUNK_SIZE):
+            chunk = rows[start:start + HYDRATE_CHUNK_SIZE]
+            related = self.child.get_related(chunk)
+            cards += [self.child.get_card(row, related) for row in chunk]
+        return cards
+
+
+class ApartmentCardSerializer(serializers.BaseSerializer):
+    """
+    This class defines a read-only serialization of apartments for the list,
+    search and featured views. It builds the same data as ApartmentSerializer
+    directly from rows returned by .values(*get_card_columns(fields, expand)),
+    without the per-field work of a ModelSerializer. If fields is given, only
+    those fields are returned, and the nested fields that are not in expand
+    are returned as primary keys. Related rows that are not returned are not
+    fetched.
+    """
+
+    class Meta:
+        """list_serializer_class: The class used when many is True."""
+        list_serializer_class = ApartmentCardListSerializer
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        """This method initializes the serializer with the fields to return."""
+        super().__init__(*args, **kwargs)
+        self.card_fields = list(APARTMENT_CARD_COLUMNS) if fields is None else list(fields)
+        self.expand = set(APARTMENT_NESTED_FIELDS) if fields is None else set(expand or ())
+
     def to_representation(self, instance):
-        """
-        This method is overridden to define data that is returned when
-        object is serialized using the UserSerializer.
-        """
-        data = super().to_representation(instance)
-        # Check if current user is the owner of the profile
-        user = self.context['request'].user
+        """This method returns the apartment card of a single row."""
+        return self.get_card(instance, self.get_related([instance]))
 
-        if user.is_staff is True:
-            return data
+    def is_expanded(self, field):
+        """This method returns True if the field is returned in full."""
+        return field in self.card_fields and field in self.expand
 
-        if user == instance.user:
-            excluded_fields = [
-                'is_taken_time',
-                'is_taken_number',
-                'advert_exp_time',
-                'num_of_exp_time_extension'
-            ]
-            for field in excluded_fields:
-                data.pop(field, None)
+    def is_collapsed(self, field):
+        """This method returns True if the nested field is returned as primary keys."""
+        return field in self.card_fields and field not in self.expand
 
-            return data
+    def get_datetime(self, value):
+        """This method returns a datetime formatted like a DateTimeField of the serializers."""
+        return DATETIME_FIELD.to_representation(value)
 
-        if user != instance.user:
-            excluded_fields = [
-                'is_taken_time',
-                'is_taken_number',
-                'advert_exp_time',
-                'num_of_exp_time_extension',
-                'approval_status'
-            ]
-            for field in excluded_fields:
-                data.pop(field, None)
+    def get_file_url(self, field, name):
+        """This method returns the absolute url of a file stored by the given model field."""
+        if not name:
+            return None
 
-            return data
+        url = field.storage.url(name)
+        request = self.context.get('request')
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
 
-    def validate(self, attrs):
+    def get_related(self, rows):
         """
-        This method validates the request and returns the value of the attrs in the request.
+        This method fetches the rows related to the apartments that are
+        returned, and returns them in dictionaries keyed by apartment or owner id.
         """
-        # country = attrs.get('country')
-        # state = attrs.get('state')
-        # city = attrs.get('city')
-        # school = attrs.get('school')
-        # listing_type = attrs.get('listing_type')
-        max_price = attrs.get('max_price')
-        min_price = attrs.get('min_price')
-        amenities = attrs.get('apartmentamenity_set')
+        # pylint: disable=no-member
+
+        apartment_ids = [row['id'] for row in rows]
+        related = {
+            'images': {},
+            'amenities': {},
+            'qualities': {},
+            'interests': {},
+            'liked': set(),
+            'now': timezone.now()
+        }
+
+        if self.is_collapsed('images'):
+            for image in Image.objects.filter(apartment_id__in=apartment_ids).values(
+                'id', 'apartment_id'
+            ):
+                related['images'].setdefault(image['apartment_id'], []).append(image['id'])
+        elif self.is_expanded('images'):
+            image_field = Image._meta.get_field('image')
+            for image in Image.objects.filter(apartment_id__in=apartment_ids).values(
+                'id', 'apartment_id', 'image'
+            ):
+                related['images'].setdefault(image['apartment_id'], []).append({
+                    'id': image['id'],
+                    'image': self.get_file_url(image_field, image['image'])
+                })
+
+        if self.is_collapsed('amenities'):
+            for amenity in ApartmentAmenity.objects.filter(
+                apartment_id__in=apartment_ids
+            ).values('id', 'apartment_id'):
+                related['amenities'].setdefault(amenity['apartment_id'], []).append(amenity['id'])
+        elif self.is_expanded('amenities'):
+            for amenity in ApartmentAmenity.objects.filter(
+                apartment_id__in=apartment_ids
+            ).values(
+                'id', 'apartment_id', 'quantity', 'created_at', 'updated_at', 'amenity_id',
+                'amenity__name', 'amenity__created_at', 'amenity__updated_at'
+            ):
+                related['amenities'].setdefault(amenity['apartment_id'], []).append({
+                    'id': amenity['id'],
+                    'apartment': amenity['apartment_id'],
+                    'amenity': {
+                        'id': amenity['amenity_id'],
+                        'name': amenity['amenity__name'],
+                        'created_at': self.get_datetime(amenity['amenity__created_at']),
+                        'updated_at': self.get_datetime(amenity['amenity__updated_at'])
+                    },
+                    'quantity': amenity['quantity'],
+                    'created_at': self.get_datetime(amenity['created_at']),
+                    'updated_at': self.get_datetime(amenity['updated_at'])
+                })
+
+        if self.is_collapsed('user_preferred_qualities'):
+            for quality in ApartmentUserPreferredQuality.objects.filter(
+                apartment_id__in=apartment_ids
+            ).values('id', 'apartment_id'):
+                related['qualities'].setdefault(quality['apartment_id'], []).append(quality['id'])
+        elif self.is_expanded('user_preferred_qualities'):
+            for quality in ApartmentUserPreferredQuality.objects.filter(
+                apartment_id__in=apartment_ids
+            ).values(
+                'id', 'apartment_id', 'created_at', 'updated_at',
+                'user_preferred_quality_id', 'user_preferred_quality__name'
+            ):
+                related['qualities'].setdefault(quality['apartment_id'], []).append({
+                    'id': quality['id'],
+                    'apartment': quality['apartment_id'],
+                    'user_preferred_quality': {
+                        'id': quality['user_preferred_quality_id'],
+                        'name': quality['user_preferred_quality__name']
+                    },
+                    'created_at': self.get_datetime(quality['created_at']),
+                    'updated_at': self.get_datetime(quality['updated_at'])
+                })
+
+        if self.is_expanded('user'):
+            user_ids = {row['user_id'] for row in rows}
+            for interest in UserProfileInterest.objects.filter(
+                user_profile_id__in=user_ids
+            ).values('id', 'user_profile_id', 'user_interest_id', 'user_interest__name'):
+                related['interests'].setdefault(interest['user_profile_id'], []).append({
+                    'id': interest['id'],
+                    'user_profile': interest['user_profile_id'],
+                    'user_interest': {
+                        'id': interest['user_interest_id'],
+                        'name': interest['user_interest__name']
+                    }
+                })
 
-        if amenities == []:
-            amenities = None
+        user = self.context['request'].user
+        if 'liked' in self.card_fields and user.is_authenticated:
+            related['liked'] = set(ApartmentLike.objects.filter(
+                user_id=user.id,
+                apartment_id__in=apartment_ids
+            ).values_list('apartment_id', flat=True))
+
+        return related
+
+    def get_owner(self, row, related):
+        """This method returns the owner of the apartment as serialized by UserSerializer."""
+        thumbnail_field = UserProfile._meta.get_field('thumbnail') # pylint: disable=no-member
+
+        owner = {
+            'id': row['user_id'],
+            'username': row['user__username'],
+            'email': row['user__email'],
+            'profile_information': {
+                'gender': row['user__profile__gender'],
+                'religion': row['user__profile__religion'],
+                'phone_number': row['user__profile__phone_number'],
+                'whatsapp_number': row['user__profile__whatsapp_number'],
+                'phone_number_is_verified': row['user__profile__phone_number_is_verified'],
+                'whatsapp_number_is_verified': row['user__profile__whatsapp_number_is_verified'],
+                'interests': related['interests'].get(row['user_id'], []),
+                'thumbnail': self.get_file_url(thumbnail_field, row['user__profile__thumbnail']),
+                'first_name': row['user__profile__first_name'],
+                'last_name': row['user__profile__last_name']
+            },
+            'is_active': row['user__is_active'],
+            'is_staff': row['user__is_staff'],
+            'is_superuser': row['user__is_superuser'],
+            'is_verified': row['user__is_verified'],
+            'created_at': self.get_datetime(row['user__created_at']),
+            'updated_at': self.get_datetime(row['user__updated_at'])
+        }
 
-        # if country is None and state is None and city is None\
-        # and school is None and listing_type is None and max_price is None\
-        # and min_price is None and amenities is None:
-        #     raise serializers.ValidationError(
-        #         'The fields and values to be seached are required.'
-        #     )
+        user = self.context['request'].user
+        if str(user.pk) != row['user_id'] and user.is_staff is False:
+            for field in USER_EXCLUDED_FIELDS:
+                owner.pop(field)
+            for field in PROFILE_EXCLUDED_FIELDS:
+                owner['profile_information'].pop(field)
+
+        return owner
+
+    def get_field(self, field, row, related):
+        """This method returns the value of a field of the apartment card of a row."""
+        # pylint: disable=too-many-return-statements
+
+        apartment_id = row['id']
+
+        if field in APARTMENT_NESTED_FIELDS and field not in self.expand:
+            if field == 'amenities':
+                return related['amenities'].get(apartment_id, [])
+            if field == 'user_preferred_qualities':
+                return related['qualities'].get(apartment_id, [])
+            if field == 'images':
+                return related['images'].get(apartment_id, [])
+            return row[f'{field}_id']
+
+        if field == 'id':
+            return apartment_id
+        if field == 'user':
+            return self.get_owner(row, related)
+        if field == 'country':
+            return {'id': row['country_id'], 'name': row['country__name']}
+        if field == 'state':
+            return {
+                'id': row['state_id'],
+                'name': row['state__name'],
+                'country': row['state__country_id']
+            }
+        if field == 'city':
+            return {
+                'id': row['city_id'],
+                'name': row['city__name'],
+                'state': row['city__state_id']
+            }
+        if field == 'school':
+            if row['school_id'] is None:
+                return None
+            return {
+                'id': row['school_id'],
+                'name': row['school__name'],
+                'country': row['school__country_id'],
+                'state': row['school__state_id'],
+                'city': row['school__city_id'],
+                'latitude': row['school__latitude'],
+                'longitude': row['school__longitude']
+            }
+        if field == 'amenities':
+            return related['amenities'].get(apartment_id, [])
+        if field == 'user_preferred_qualities':
+            return related['qualities'].get(apartment_id, [])
+        if field == 'images':
+            return related['images'].get(apartment_id, [])
+        if field == 'advert_days_left':
+            if row['advert_exp_time'] is None:
+                return 0
+            return max((row['advert_exp_time'] - related['now']).days, 0)
+        if field == 'liked':
+            return apartment_id in related['liked']
+        if field in ('is_taken_time', 'advert_exp_time'):
+            return self.get_datetime(row[field])
+        return row[field]
+
+    def get_card(self, row, related):
+        """This method returns the data of an apartment row."""
+        card = {field: self.get_field(field, row, related) for field in self.card_fields}
+
+        # Remove the fields ApartmentSerializer hides from the user.
+        user = self.context['request'].user
+        if user.is_staff is True:
+            return card
 
-        if min_price is not None and max_price is None:
-            raise serializers.ValidationError('The field "Max_price" is required.')
+        excluded_fields = PUBLIC_EXCLUDED_FIELDS
+        if str(user.pk) == row['user_id']:
+            excluded_fields = OWNER_EXCLUDED_FIELDS
 
-        return attrs
+        for field in excluded_fields:
+            card.pop(field, None)
+
+        return card
@@ -0,0 +1,45 @@
+"""
+This module defines the signal handlers that keep the search index of
+this process and the cached facet counts up to date when apartments and
+their amenities change, and that create the full-text index of the
+apartments after migrations.
+"""
+from django.db.models.signals import post_save, post_delete, post_migrate
+from django.dispatch import receiver
+from apartment.models import Apartment, ApartmentAmenity
+from apartment.search_index import refresh_search_index
+from apartment.full_text_search import create_full_text_index
+from apartment.facets import invalidate_facets
+
+
+@receiver(post_save, sender=Apartment)
+@receiver(post_delete, sender=Apartment)
+def apartment_changed(sender, instance, **kwargs):
+    """
+    This function updates the row of a changed apartment in the search index
+    and makes the cached facet counts stale.
+    """
+    # pylint: disable=unused-argument
+
+    refresh_search_index(instance.pk)
+    invalidate_facets()
+
+@receiver(post_save, sender=ApartmentAmenity)
+@receiver(post_delete, sender=ApartmentAmenity)
+def apartment_amenity_changed(sender, instance, **kwargs):
+    """
+    This function updates the row of the apartment of a changed amenity in the
+    search index and makes the cached facet counts stale.
+    """
+    # pylint: disable=unused-argument
+
+    refresh_search_index(instance.apartment_id)
+    invalidate_facets()
+
+@receiver(post_migrate)
+def apartment_migrated(sender, using, **kwargs):
+    """This function creates the full-text index of the apartments after their migrations."""
+    # pylint: disable=unused-argument
+
+    if sender.label == 'apartment':
+        create_full_text_index(using)
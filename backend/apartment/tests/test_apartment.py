@@ -0,0 +1,105 @@
+"""This module defines class ApartmentConditionalGetTest"""
+import time
+from datetime import timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from country.models import Country
+from state.models import State
+from city.models import City
+from amenity.models import Amenity
+from apartment.models import Apartment, ApartmentAmenity
+from apartment_like.models import ApartmentLike
+
+
+User = get_user_model()
+
+class ApartmentConditionalGetTest(TestCase):
+    """This class defines methods that tests conditional requests made to ApartmentView."""
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        # pylint: disable=no-member
+
+        self.user = User.objects.create_user(
+            username='test_user',
+            email='test_user@gmail.com',
+            password='password'
+        )
+        country = Country.objects.create(name='Nigeria')
+        state = State.objects.create(name='Lagos', country=country)
+        city = City.objects.create(name='Ikeja', state=state)
+
+        self.apartment = Apartment.objects.create(
+            user=self.user,
+            country=country,
+            state=state,
+            city=city,
+            title='Flat',
+            nearest_bus_stop='Allen',
+            price=100000,
+            listing_type='flat',
+            available_for='rent',
+            price_duration='year',
+            approval_status='accepted',
+            advert_exp_time=timezone.now() + timedelta(days=28)
+        )
+        self.path = reverse('get_update_delete_apartment', args=[self.apartment.id])
+
+    def test_not_modified(self):
+        """
+        This method tests that 304 is returned while the apartment and its
+        related rows have not changed, and 200 once they have.
+        """
+        # pylint: disable=no-member
+
+        response = self.client.get(path=self.path)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response.headers['ETag']
+        self.assertIn('Authorization', response.headers['Vary'])
+
+        response = self.client.get(path=self.path, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+
+        # Adding an amenity changes the ETag.
+        ApartmentAmenity.objects.create(
+            apartment=self.apartment,
+            amenity=Amenity.objects.create(name='water')
+        )
+        response = self.client.get(path=self.path, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        etag = response.headers['ETag']
+
+        # Updating the apartment changes the ETag.
+        self.apartment.title = 'Big flat'
+        self.apartment.save()
+        response = self.client.get(path=self.path, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json().get('title'), 'Big flat')
+
+    def test_if_modified_since_ignored(self):
+        """
+        This method tests that Last-Modified is not sent and If-Modified-Since
+        is ignored, since the like count changes without updating the apartment.
+        """
+        # pylint: disable=no-member
+
+        response = self.client.get(path=self.path)
+        self.assertNotIn('Last-Modified', response.headers)
+
+        ApartmentLike.objects.create(user=self.user, apartment=self.apartment)
+        response = self.client.get(
+            path=self.path,
+            headers={'If-Modified-Since': http_date(time.time() + 60)}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json().get('like_count'), 1)
@@ -0,0 +1,141 @@
+"""This module defines class ApartmentCardSerializerTest"""
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from country.models import Country
+from state.models import State
+from city.models import City
+from school.models import School
+from amenity.models import Amenity
+from image.models import Image
+from user_interest.models import UserInterest
+from user_preferred_qualities.models import UserPreferredQuality
+from apartment_like.models import ApartmentLike
+from user.models import UserProfileInterest
+from apartment.models import Apartment, ApartmentAmenity, ApartmentUserPreferredQuality
+from apartment.serializers import (
+    ApartmentSerializer,
+    ApartmentCardSerializer,
+    APARTMENT_CARD_FIELDS
+)
+
+
+User = get_user_model()
+
+class ApartmentCardSerializerTest(TestCase):
+    """
+    This class defines methods that tests that ApartmentCardSerializer returns
+    the same data as ApartmentSerializer.
+    """
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        # pylint: disable=no-member
+
+        self.owner = User.objects.create_user(
+            username='owner',
+            email='owner@gmail.com',
+            password='password'
+        )
+        self.owner.profile.thumbnail = 'thumbnail/owner.jpg'
+        self.owner.profile.first_name = 'Owner'
+        self.owner.profile.save()
+        UserProfileInterest.objects.create(
+            user_profile=self.owner.profile,
+            user_interest=UserInterest.objects.create(name='reading')
+        )
+
+        self.viewer = User.objects.create_user(
+            username='viewer',
+            email='viewer@gmail.com',
+            password='password'
+        )
+        self.staff = User.objects.create_user(
+            username='staff',
+            email='staff@gmail.com',
+            password='password',
+            is_staff=True
+        )
+
+        country = Country.objects.create(name='Nigeria')
+        state = State.objects.create(name='Lagos', country=country)
+        city = City.objects.create(name='Ikeja', state=state)
+        school = School.objects.create(name='Unilag', country=country, state=state, city=city)
+        amenity = Amenity.objects.create(name='bedroom')
+        quality = UserPreferredQuality.objects.create(name='quiet')
+
+        for i in range(0, 3):
+            apartment = Apartment.objects.create(
+                user=self.owner,
+                country=country,
+                state=state,
+                city=city,
+                school=school if i % 2 == 0 else None,
+                title=f'Flat {i}',
+                nearest_bus_stop='Allen',
+                price=100000 * (i + 1),
+                floor_number=i,
+                listing_type='flat',
+                available_for='rent',
+                price_duration='year',
+                approval_status='accepted',
+                advert_exp_time=timezone.now() + timedelta(days=10 + i)
+            )
+            ApartmentAmenity.objects.create(apartment=apartment, amenity=amenity, quantity=i + 1)
+            ApartmentUserPreferredQuality.objects.create(
+                apartment=apartment,
+                user_preferred_quality=quality
+            )
+            Image.objects.create(apartment=apartment, image=f'apartment_image/{i}.jpg')
+
+            if i == 0:
+                ApartmentLike.objects.create(user=self.viewer, apartment=apartment)
+
+    def get_request(self, user):
+        """This method returns a GET request made by the given user."""
+        request = Request(APIRequestFactory().get('/api/apartments/available'))
+        request.user = user
+        return request
+
+    def test_same_data_as_apartment_serializer(self):
+        """
+        This method tests that both serializers return the same data for
+        anonymous users, other users, the owner and staff.
+        """
+        apartments = Apartment.objects.order_by('-created_at')
+
+        # Users are read again so their ids are strings, as in a request.
+        users = [AnonymousUser()] + [
+            User.objects.get(pk=user.pk) for user in (self.viewer, self.owner, self.staff)
+        ]
+        for user in users:
+            context = {'request': self.get_request(user)}
+            expected = ApartmentSerializer(apartments, many=True, context=context).data
+            cards = ApartmentCardSerializer(
+                apartments.values(*APARTMENT_CARD_FIELDS), many=True, context=context
+            ).data
+
+            self.assertEqual(cards, expected)
+            self.assertEqual(
+                ApartmentCardSerializer(
+                    apartments.values(*APARTMENT_CARD_FIELDS)[0], context=context
+                ).data,
+                expected[0]
+            )
+
+    def test_queries_do_not_grow_with_page(self):
+        """This method tests that a list of cards is built with a fixed number of queries."""
+        context = {'request': self.get_request(self.viewer)}
+
+        # Apartments, images, amenities, qualities, owner interests and likes.
+        with self.assertNumQueries(6):
+            _ = ApartmentCardSerializer(
+                Apartment.objects.values(*APARTMENT_CARD_FIELDS), many=True, context=context
+            ).data
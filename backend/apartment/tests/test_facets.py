@@ -0,0 +1,177 @@
+"""This module defines class ApartmentFacetsTest"""
+from datetime import timedelta
+from unittest import skipIf
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from country.models import Country
+from state.models import State
+from city.models import City
+from amenity.models import Amenity
+from apartment.models import Apartment, ApartmentAmenity
+from apartment.facets import count_facets, get_cache_key
+from apartment.search_index import np, search_index
+
+
+User = get_user_model()
+
+class ApartmentFacetsTest(TestCase):
+    """This class defines methods that tests the facets parameter of ApartmentSearchView."""
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        # pylint: disable=no-member
+
+        cache.clear()
+        search_index.clear()
+
+        self.owner = User.objects.create_user(
+            username='owner',
+            email='owner@gmail.com',
+            password='password'
+        )
+
+        country = Country.objects.create(name='Nigeria')
+        state = State.objects.create(name='Lagos', country=country)
+        self.cities = [
+            City.objects.create(name=name, state=state) for name in ('Ikeja', 'Yaba')
+        ]
+        wifi = Amenity.objects.create(name='wifi')
+        parking = Amenity.objects.create(name='parking')
+
+        for i, (listing_type, available_for, price) in enumerate((
+            ('flat', 'rent', 40000),
+            ('flat', 'rent', 120000),
+            ('duplex', 'sale', 2000000),
+            ('bungalow', 'rent', 60000),
+            ('flat', 'short let', 60000)
+        )):
+            apartment = Apartment.objects.create(
+                user=self.owner,
+                country=country,
+                state=state,
+                city=self.cities[i % 2],
+                title=f'Apartment {i}',
+                nearest_bus_stop='Allen',
+                price=price,
+                listing_type=listing_type,
+                available_for=available_for,
+                price_duration='year',
+                approval_status='accepted',
+                advert_exp_time=timezone.now() + timedelta(days=10)
+            )
+            ApartmentAmenity.objects.create(apartment=apartment, amenity=wifi)
+            if i % 2 == 0:
+                ApartmentAmenity.objects.create(apartment=apartment, amenity=parking)
+
+        self.facets = 'listing_type,available_for,price,amenities,city'
+
+    def tearDown(self):
+        """This method empties the search index and cache shared by the tests."""
+        cache.clear()
+        search_index.clear()
+
+    def get_facets(self, params):
+        """This method returns the facet counts returned by the search."""
+        response = self.client.get(path=reverse('search_apartments'), data=params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()['facets']
+
+    def test_facets(self):
+        """This method tests the counts of the facets for the current search."""
+        facets = self.get_facets({'facets': self.facets, 'listing_type': 'flat'})
+
+        self.assertEqual(facets['listing_type'], {
+            'self-contained': 0, 'non-self-contained': 0,
+            'flat': 3, 'bungalow': 0, 'duplex': 0
+        })
+        self.assertEqual(facets['available_for'], {
+            'share': 0, 'short let': 1, 'rent': 2, 'lease': 0, 'sale': 0
+        })
+        self.assertEqual(facets['price'], {
+            '0-49999': 1, '50000-99999': 1, '100000-249999': 1,
+            '250000-499999': 0, '500000-999999': 0, '1000000+': 0
+        })
+        self.assertEqual(facets['amenities'], {'parking': 2, 'wifi': 3})
+        self.assertEqual(facets['city'], {str(self.cities[0].id): 2, str(self.cities[1].id): 1})
+
+        # The facets are returned with the apartments when they are paginated.
+        response = self.client.get(
+            path=reverse('search_apartments'),
+            data={'facets': 'city', 'amenities': 'parking', 'page': 1, 'size': 1}
+        )
+        self.assertEqual(response.json()['facets'], {'city': {str(self.cities[0].id): 3}})
+        self.assertEqual(len(response.json()['apartments']), 1)
+
+    def test_database_counts_in_two_queries(self):
+        """
+        This method tests that the database counts all facets with one aggregate
+        query and one grouped query.
+        """
+        # pylint: disable=no-member
+
+        with self.assertNumQueries(2):
+            counts = count_facets(
+                Apartment.objects.filter(listing_type='flat'), self.facets.split(',')
+            )
+        self.assertEqual(counts['amenities'], {'parking': 2, 'wifi': 3})
+        self.assertEqual(counts['city'], {str(self.cities[0].id): 2, str(self.cities[1].id): 1})
+
+    @skipIf(np is None, 'NumPy is not installed.')
+    def test_index_counts_match_database(self):
+        """This method tests that the search index and the database return the same counts."""
+        for params in (
+            {},
+            {'listing_type': 'flat'},
+            {'amenities': 'parking', 'max_price': 100000},
+            {'amenities': 'sauna'},
+            {'city': self.cities[1].id, 'sort_type': 'price'}
+        ):
+            with self.subTest(params=params):
+                params = {'facets': self.facets, **params}
+                cache.clear()
+                with self.settings(APARTMENT_SEARCH_INDEX=False):
+                    expected = self.get_facets(params)
+                cache.clear()
+                with self.settings(APARTMENT_SEARCH_INDEX=True):
+                    self.assertEqual(self.get_facets(params), expected)
+
+    def test_facets_are_cached(self):
+        """
+        This method tests that the counts are cached per search, and counted
+        again once an apartment is changed.
+        """
+        # pylint: disable=no-member
+
+        params = {'facets': 'listing_type', 'available_for': 'rent'}
+        self.assertEqual(self.get_facets(params)['listing_type']['flat'], 2)
+
+        # Equivalent searches have the same key.
+        self.assertEqual(
+            get_cache_key(
+                {'available_for': 'rent', 'amenities1': 'a', 'amenities2': 'b'}, ['city']
+            ),
+            get_cache_key(
+                {'amenities': 'b', 'amenities3': 'a', 'available_for': 'rent ', 'page': '2'},
+                ['city']
+            )
+        )
+
+        Apartment.objects.filter(title='Apartment 3').update(listing_type='flat')
+        self.assertEqual(self.get_facets(params)['listing_type']['flat'], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Apartment.objects.get(title='Apartment 3').save()
+        self.assertEqual(self.get_facets(params)['listing_type']['flat'], 3)
+
+    def test_unknown_facet(self):
+        """This method tests that unknown facets are rejected."""
+        response = self.client.get(path=reverse('search_apartments'), data={'facets': 'color'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json().get('error'), 'Facet "color" does not exist.')
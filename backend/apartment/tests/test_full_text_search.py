@@ -0,0 +1,122 @@
+"""This module defines class FullTextSearchTest"""
+from datetime import timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from country.models import Country
+from state.models import State
+from city.models import City
+from apartment.models import Apartment
+
+
+User = get_user_model()
+
+class FullTextSearchTest(TestCase):
+    """This class defines methods that tests the q parameter of ApartmentSearchView."""
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        # pylint: disable=no-member
+
+        self.owner = User.objects.create_user(
+            username='owner',
+            email='owner@gmail.com',
+            password='password'
+        )
+
+        self.country = Country.objects.create(name='Nigeria')
+        self.state = State.objects.create(name='Lagos', country=self.country)
+        self.city = City.objects.create(name='Ikeja', state=self.state)
+
+        self.create_apartment(
+            title='Spacious duplex in Lekki',
+            description='A duplex with a large garden. The garden has a fountain.',
+            nearest_bus_stop='Chevron'
+        )
+        self.create_apartment(
+            title='Garden flat',
+            description='A quiet flat.',
+            nearest_bus_stop='Allen',
+            listing_type='flat'
+        )
+        self.create_apartment(
+            title='Self contain',
+            description='Close to the market.',
+            nearest_bus_stop='Allen Avenue',
+            listing_type='flat',
+            price=50000
+        )
+
+    def create_apartment(self, **kwargs):
+        """This method creates an apartment."""
+        # pylint: disable=no-member
+
+        values = {
+            'user': self.owner,
+            'country': self.country,
+            'state': self.state,
+            'city': self.city,
+            'price': 100000,
+            'listing_type': 'duplex',
+            'available_for': 'rent',
+            'price_duration': 'year',
+            'approval_status': 'accepted',
+            'advert_exp_time': timezone.now() + timedelta(days=10)
+        }
+        values.update(kwargs)
+        return Apartment.objects.create(**values)
+
+    def search(self, params):
+        """This method returns the titles of the apartments returned by the search."""
+        response = self.client.get(path=reverse('search_apartments'), data=params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [apartment['title'] for apartment in response.json()]
+
+    def test_search(self):
+        """
+        This method tests that all columns are searched, and that the best
+        matches are returned first.
+        """
+        self.assertEqual(self.search({'q': 'chevron'}), ['Spacious duplex in Lekki'])
+        self.assertCountEqual(self.search({'q': 'allen'}), ['Garden flat', 'Self contain'])
+        self.assertEqual(self.search({'q': 'garden'}), ['Garden flat', 'Spacious duplex in Lekki'])
+        self.assertEqual(self.search({'q': 'quiet garden'}), ['Garden flat'])
+        self.assertEqual(self.search({'q': 'penthouse'}), [])
+
+    def test_search_with_filters(self):
+        """This method tests that the search is combined with the other parameters."""
+        self.assertEqual(
+            self.search({'q': 'allen', 'max_price': 60000}),
+            ['Self contain']
+        )
+        self.assertEqual(
+            self.search({'q': 'garden', 'listing_type': 'duplex'}),
+            ['Spacious duplex in Lekki']
+        )
+        self.assertEqual(
+            self.search({'q': 'allen', 'sort_type': 'price'}),
+            ['Self contain', 'Garden flat']
+        )
+
+    def test_index_is_updated(self):
+        """This method tests that changed and deleted apartments are searched."""
+        # pylint: disable=no-member
+
+        apartment = Apartment.objects.get(title='Self contain')
+        apartment.title = 'Penthouse'
+        apartment.save()
+        self.assertEqual(self.search({'q': 'penthouse'}), ['Penthouse'])
+        self.assertEqual(self.search({'q': 'contain'}), [])
+
+        apartment.delete()
+        self.assertEqual(self.search({'q': 'penthouse'}), [])
+
+    def test_search_without_words(self):
+        """This method tests that a search without words returns no apartments."""
+        self.assertEqual(self.search({'q': '"*'}), [])
+        self.assertEqual(len(self.search({'q': ' '})), 3)
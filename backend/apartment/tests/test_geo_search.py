@@ -0,0 +1,193 @@
+"""This module defines classes GeohashTest and ApartmentLocationSearchTest"""
+import random
+from datetime import timedelta
+from math import asin, cos, radians, sin, sqrt
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from country.models import Country
+from state.models import State
+from city.models import City
+from school.models import School
+from apartment.models import Apartment
+from apartment.geo import EARTH_RADIUS, encode_geohash, get_geohash_cells
+
+
+User = get_user_model()
+
+def get_distance(latitude1, longitude1, latitude2, longitude2):
+    """This function returns the haversine distance in kilometres between two points."""
+    haversine = sin(radians(latitude2 - latitude1) / 2) ** 2 + cos(radians(latitude1)) \
+        * cos(radians(latitude2)) * sin(radians(longitude2 - longitude1) / 2) ** 2
+    return 2 * EARTH_RADIUS * asin(sqrt(haversine))
+
+
+class GeohashTest(SimpleTestCase):
+    """This class defines methods that tests the geohash functions."""
+
+    def test_encode_geohash(self):
+        """This method tests the geohash of known points."""
+        self.assertEqual(encode_geohash(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        self.assertEqual(encode_geohash(-25.382708, -49.265506, 8), '6gkzwgjz')
+        self.assertEqual(encode_geohash(0, 180, 3), encode_geohash(0, -180, 3))
+
+    def test_cells_cover_circle(self):
+        """This method tests that the cells contain all points within the radius."""
+        generator = random.Random(0)
+        for latitude, longitude, radius in (
+            (6.5158, 3.3898, 5),
+            (6.5158, 3.3898, 0.3),
+            (60.0, 179.99, 20),
+            (-33.86, 151.2, 80)
+        ):
+            cells = get_geohash_cells(latitude, longitude, radius)
+            self.assertLessEqual(len(cells), 9)
+            for _ in range(0, 500):
+                point = (
+                    latitude + generator.uniform(-1, 1) * radius / 111,
+                    longitude + generator.uniform(-1, 1) * radius / (111 * cos(radians(latitude)))
+                )
+                if get_distance(latitude, longitude, *point) <= radius:
+                    geohash = encode_geohash(*point)
+                    self.assertTrue(
+                        any(geohash.startswith(cell) for cell in cells),
+                        (latitude, longitude, radius, point)
+                    )
+
+        self.assertIsNone(get_geohash_cells(0, 0, 10000))
+
+
+class ApartmentLocationSearchTest(TestCase):
+    """
+    This class defines methods that tests the near and radius parameters
+    of ApartmentSearchView.
+    """
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        # pylint: disable=no-member
+
+        self.owner = User.objects.create_user(
+            username='owner',
+            email='owner@gmail.com',
+            password='password'
+        )
+
+        self.country = Country.objects.create(name='Nigeria')
+        self.state = State.objects.create(name='Lagos', country=self.country)
+        self.city = City.objects.create(name='Yaba', state=self.state)
+        self.school = School.objects.create(
+            name='University of Lagos',
+            country=self.country,
+            state=self.state,
+            city=self.city,
+            latitude=6.5158,
+            longitude=3.3898
+        )
+
+        self.create_apartment('Akoka', 6.5200, 3.3900, school=self.school)
+        self.create_apartment('Sabo', 6.5095, 3.3711)
+        self.create_apartment('Ikeja', 6.6018, 3.3515, school=self.school)
+        self.create_apartment('Lekki', 6.4474, 3.4730)
+        self.create_apartment('Unknown', None, None)
+
+    def create_apartment(self, title, latitude, longitude, **kwargs):
+        """This method creates an apartment."""
+        # pylint: disable=no-member
+
+        return Apartment.objects.create(
+            user=self.owner,
+            country=self.country,
+            state=self.state,
+            city=self.city,
+            title=title,
+            nearest_bus_stop='Allen',
+            latitude=latitude,
+            longitude=longitude,
+            price=100000,
+            listing_type='flat',
+            available_for='rent',
+            price_duration='year',
+            approval_status='accepted',
+            advert_exp_time=timezone.now() + timedelta(days=10),
+            **kwargs
+        )
+
+    def search(self, params):
+        """This method returns the response of the search."""
+        return self.client.get(path=reverse('search_apartments'), data=params)
+
+    def get_titles(self, params):
+        """This method returns the titles of the apartments returned by the search."""
+        response = self.search(params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [apartment['title'] for apartment in response.json()]
+
+    def test_search_near_point(self):
+        """This method tests that apartments within the radius are returned nearest first."""
+        self.assertEqual(self.get_titles({'near': '6.5158,3.3898'}), ['Akoka', 'Sabo'])
+        self.assertEqual(
+            self.get_titles({'near': '6.5158,3.3898', 'radius': 15}),
+            ['Akoka', 'Sabo', 'Ikeja', 'Lekki']
+        )
+        self.assertEqual(self.get_titles({'near': '6.5158,3.3898', 'radius': 1}), ['Akoka'])
+        self.assertEqual(
+            self.get_titles({'near': '6.5158,3.3898', 'radius': 15, 'sort_type': 'title'}),
+            ['Akoka', 'Ikeja', 'Lekki', 'Sabo']
+        )
+
+    def test_search_near_school(self):
+        """
+        This method tests that the apartments near a school are returned when
+        a radius is given, and the apartments linked to it otherwise.
+        """
+        self.assertEqual(
+            self.get_titles({'school': self.school.id, 'radius': 3}),
+            ['Akoka', 'Sabo']
+        )
+        self.assertCountEqual(
+            self.get_titles({'school': self.school.id}),
+            ['Akoka', 'Ikeja']
+        )
+
+        self.school.latitude = None
+        self.school.save()
+        response = self.search({'school': self.school.id, 'radius': 3})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_geohash_is_updated(self):
+        """This method tests that moved apartments are found at their new location."""
+        # pylint: disable=no-member
+
+        apartment = Apartment.objects.get(title='Lekki')
+        apartment.latitude = 6.5160
+        apartment.longitude = 3.3890
+        apartment.save()
+        self.assertEqual(
+            self.get_titles({'near': '6.5158,3.3898', 'radius': 1}),
+            ['Lekki', 'Akoka']
+        )
+
+        apartment.latitude = None
+        apartment.longitude = None
+        apartment.save()
+        self.assertIsNone(Apartment.objects.get(pk=apartment.pk).geohash)
+
+    def test_invalid_parameters(self):
+        """This method tests that invalid locations are rejected."""
+        for params in (
+            {'near': '6.5'},
+            {'near': 'a,b'},
+            {'near': '91,3'},
+            {'near': '6.5,3.3', 'radius': 0},
+            {'near': '6.5,3.3', 'radius': 1000},
+            {'radius': 5},
+            {'sort_type': 'distance'}
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.search(params).status_code, status.HTTP_400_BAD_REQUEST)
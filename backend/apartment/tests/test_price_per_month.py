@@ -0,0 +1,108 @@
+"""This module defines class PricePerMonthTest"""
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from country.models import Country
+from state.models import State
+from city.models import City
+from apartment.models import Apartment, get_price_per_month
+
+
+User = get_user_model()
+
+class PricePerMonthTest(TestCase):
+    """This class defines methods that tests the price per month of the apartments."""
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        # pylint: disable=no-member
+
+        owner = User.objects.create_user(
+            username='owner',
+            email='owner@gmail.com',
+            password='password'
+        )
+        country = Country.objects.create(name='Nigeria')
+        state = State.objects.create(name='Lagos', country=country)
+        city = City.objects.create(name='Ikeja', state=state)
+
+        for title, price, price_duration in (
+            ('Yearly', 1200000, 'year'),
+            ('Monthly', 80000, 'month'),
+            ('Weekly', 30000, 'week'),
+            ('Daily', 2000, 'day')
+        ):
+            Apartment.objects.create(
+                user=owner,
+                country=country,
+                state=state,
+                city=city,
+                title=title,
+                nearest_bus_stop='Allen',
+                price=price,
+                listing_type='flat',
+                available_for='short let',
+                price_duration=price_duration,
+                approval_status='accepted',
+                advert_exp_time=timezone.now() + timedelta(days=10)
+            )
+
+    def search(self, params):
+        """This method returns the titles of the apartments returned by the search."""
+        response = self.client.get(path=reverse('search_apartments'), data=params)
+        return [apartment['title'] for apartment in response.json()]
+
+    def test_price_per_month(self):
+        """This method tests that the price per month is set when apartments are saved."""
+        # pylint: disable=no-member
+
+        self.assertEqual(get_price_per_month(1200000, 'year'), 100000)
+        self.assertEqual(get_price_per_month(7, 'week'), 30)
+        self.assertEqual(get_price_per_month(18, 'year'), 2)
+        self.assertEqual(get_price_per_month(10, 'hour'), 7200)
+        self.assertEqual(
+            dict(Apartment.objects.values_list('title', 'price_per_month')),
+            {'Yearly': 100000, 'Monthly': 80000, 'Weekly': 128571, 'Daily': 60000}
+        )
+
+        apartment = Apartment.objects.get(title='Daily')
+        apartment.price_duration = 'week'
+        apartment.save(update_fields=['price_duration'])
+        self.assertEqual(Apartment.objects.get(pk=apartment.pk).price_per_month, 8571)
+
+    def test_search(self):
+        """This method tests that apartments are filtered and sorted by price per month."""
+        self.assertEqual(
+            self.search({'sort_type': 'price_per_month'}),
+            ['Daily', 'Monthly', 'Yearly', 'Weekly']
+        )
+        self.assertEqual(
+            self.search({'min_price_per_month': 70000, 'max_price_per_month': 110000,
+                         'sort_type': '-price_per_month'}),
+            ['Yearly', 'Monthly']
+        )
+
+    def test_backfill(self):
+        """This method tests that the command sets the prices per month that are wrong."""
+        # pylint: disable=no-member
+
+        Apartment.objects.filter(title__in=['Yearly', 'Weekly']).update(price_per_month=None)
+
+        out = StringIO()
+        call_command('backfill_prices_per_month', batch_size=3, stdout=out)
+        self.assertIn('Updated 2 prices per month.', out.getvalue())
+        self.assertEqual(
+            dict(Apartment.objects.values_list('title', 'price_per_month')),
+            {'Yearly': 100000, 'Monthly': 80000, 'Weekly': 128571, 'Daily': 60000}
+        )
+
+        out = StringIO()
+        call_command('backfill_prices_per_month', stdout=out)
+        self.assertIn('Updated 0 prices per month.', out.getvalue())
@@ -0,0 +1,150 @@
+"""This module defines class ApartmentPriceStatisticsTest"""
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from country.models import Country
+from state.models import State
+from city.models import City
+from amenity.models import Amenity
+from apartment.models import Apartment, ApartmentAmenity, ApartmentPriceStatistic
+
+
+User = get_user_model()
+
+class ApartmentPriceStatisticsTest(TestCase):
+    """
+    This class defines methods that tests the aggregate_price_statistics command
+    and ApartmentPriceStatisticsView.
+    """
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        # pylint: disable=no-member
+
+        self.owner = User.objects.create_user(
+            username='owner',
+            email='owner@gmail.com',
+            password='password'
+        )
+
+        self.country = Country.objects.create(name='Nigeria')
+        self.state = State.objects.create(name='Lagos', country=self.country)
+        self.cities = [
+            City.objects.create(name=name, state=self.state) for name in ('Ikeja', 'Yaba')
+        ]
+        self.bedroom = Amenity.objects.create(name='bedroom')
+
+        for i in range(1, 11):
+            self.create_apartment(self.cities[0], 10000 * i, 'month', 'flat', 2)
+        self.create_apartment(self.cities[1], 1200000, 'year', 'duplex', 3)
+
+        # Adverts that are not active or have no price per month are left out.
+        self.create_apartment(self.cities[0], 5000, 'month', 'flat', 2, approval_status='pending')
+        apartment = self.create_apartment(self.cities[0], 5000, 'month', 'flat', 2)
+        Apartment.objects.filter(pk=apartment.pk).update(price_per_month=None)
+
+        self.path = reverse('apartment_price_statistics')
+
+    def create_apartment(self, city, price, price_duration, listing_type, bedrooms, **kwargs):
+        """This method creates an apartment with a number of bedrooms."""
+        # pylint: disable=no-member
+
+        values = {
+            'user': self.owner,
+            'country': self.country,
+            'state': self.state,
+            'city': city,
+            'title': 'Apartment',
+            'nearest_bus_stop': 'Allen',
+            'price': price,
+            'listing_type': listing_type,
+            'available_for': 'rent',
+            'price_duration': price_duration,
+            'approval_status': 'accepted',
+            'advert_exp_time': timezone.now() + timedelta(days=10)
+        }
+        values.update(kwargs)
+        apartment = Apartment.objects.create(**values)
+        ApartmentAmenity.objects.create(
+            apartment=apartment, amenity=self.bedroom, quantity=bedrooms
+        )
+        return apartment
+
+    def aggregate(self):
+        """This method runs the command and returns its output."""
+        out = StringIO()
+        call_command('aggregate_price_statistics', batch_size=4, stdout=out)
+        return out.getvalue()
+
+    def test_statistics(self):
+        """This method tests the percentiles and histogram of a location."""
+        output = self.aggregate()
+        self.assertIn('Batch 3: read 3 apartments.', output)
+        # 7 for the country and the state, and 4 for each city, for all and each
+        # listing type and number of bedrooms.
+        self.assertIn('Saved 22 price statistics.', output)
+
+        response = self.client.get(
+            path=self.path,
+            data={'city': self.cities[0].id, 'listing_type': 'flat', 'bedrooms': 2}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['apartment_count'], 10)
+        self.assertEqual(
+            [data['min_price'], data['p10_price'], data['p50_price'],
+             data['p90_price'], data['max_price']],
+            [10000, 19000, 55000, 91000, 100000]
+        )
+        self.assertEqual(
+            [bucket['count'] for bucket in data['histogram']],
+            [0, 1, 1, 2, 3, 2, 1, 0, 0, 0, 0, 0]
+        )
+        self.assertEqual(data['histogram'][-1], {'min': 1000000, 'max': None, 'count': 0})
+
+        # The most specific location is used.
+        response = self.client.get(
+            path=self.path,
+            data={'country': self.country.id, 'state': self.state.id}
+        )
+        self.assertEqual(response.json()['location_type'], 'state')
+        self.assertEqual(response.json()['apartment_count'], 11)
+        self.assertEqual(response.json()['max_price'], 100000)
+
+        # A copy that is current is not sent again.
+        response2 = self.client.get(
+            path=self.path,
+            data={'country': self.country.id, 'state': self.state.id},
+            HTTP_IF_NONE_MATCH=response.headers['ETag']
+        )
+        self.assertEqual(response2.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_statistics_are_replaced(self):
+        """This method tests that the command replaces the previous statistics."""
+        # pylint: disable=no-member
+
+        self.aggregate()
+        Apartment.objects.filter(listing_type='duplex').delete()
+        self.aggregate()
+
+        self.assertFalse(ApartmentPriceStatistic.objects.filter(listing_type='duplex').exists())
+        response = self.client.get(path=self.path, data={'city': self.cities[1].id})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_parameters(self):
+        """This method tests that a location and a valid number of bedrooms are required."""
+        response = self.client.get(path=self.path, data={'listing_type': 'flat'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(
+            path=self.path, data={'city': self.cities[0].id, 'bedrooms': 'two'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,170 @@
+"""This module defines class ApartmentSearchFiltersTest"""
+from datetime import timedelta
+from unittest import skipIf
+from django.http import QueryDict
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from country.models import Country
+from state.models import State
+from city.models import City
+from amenity.models import Amenity
+from apartment.models import Apartment, ApartmentAmenity
+from apartment.serializers import ApartmentSearchSerializer
+from apartment.search_index import np, search_index
+
+
+User = get_user_model()
+
+class ApartmentSearchFiltersTest(TestCase):
+    """
+    This class defines methods that tests the filters with several values
+    of ApartmentSearchView.
+    """
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        # pylint: disable=no-member
+
+        search_index.clear()
+
+        self.owner = User.objects.create_user(
+            username='owner',
+            email='owner@gmail.com',
+            password='password'
+        )
+
+        country = Country.objects.create(name='Nigeria')
+        state = State.objects.create(name='Lagos', country=country)
+        self.cities = [
+            City.objects.create(name=name, state=state) for name in ('Ikeja', 'Yaba', 'Lekki')
+        ]
+        wifi = Amenity.objects.create(name='wifi')
+        parking = Amenity.objects.create(name='parking')
+
+        for i, (listing_type, available_for, amenities) in enumerate((
+            ('flat', 'rent', [wifi, parking]),
+            ('duplex', 'sale', [wifi]),
+            ('bungalow', 'rent', [parking]),
+            ('flat', 'short let', []),
+            ('duplex', 'rent', [wifi, parking]),
+            ('flat', 'rent', [wifi])
+        )):
+            apartment = Apartment.objects.create(
+                user=self.owner,
+                country=country,
+                state=state,
+                city=self.cities[i % 3],
+                title=f'Apartment {i}',
+                nearest_bus_stop='Allen',
+                price=10000 * (i + 1),
+                listing_type=listing_type,
+                available_for=available_for,
+                price_duration='month',
+                approval_status='accepted',
+                advert_exp_time=timezone.now() + timedelta(days=10)
+            )
+            for amenity in amenities:
+                ApartmentAmenity.objects.create(apartment=apartment, amenity=amenity)
+
+    def tearDown(self):
+        """This method empties the search index shared by the tests."""
+        search_index.clear()
+
+    def search(self, params):
+        """This method returns the response of the search."""
+        return self.client.get(path=reverse('search_apartments'), data=params)
+
+    def get_titles(self, params):
+        """This method returns the titles of the apartments returned by the search."""
+        response = self.search(params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(apartment['title'] for apartment in response.json())
+
+    def test_multiple_values(self):
+        """
+        This method tests that apartments matching any value of a filter are
+        returned, whether the values are repeated or separated by commas.
+        """
+        cities = [str(self.cities[0].id), str(self.cities[1].id)]
+        self.assertEqual(
+            self.get_titles({'city': cities}),
+            ['Apartment 0', 'Apartment 1', 'Apartment 3', 'Apartment 4']
+        )
+        self.assertEqual(
+            self.get_titles({'city': ','.join(cities)}),
+            self.get_titles({'city': cities})
+        )
+        self.assertEqual(
+            self.get_titles({'city': cities, 'listing_type': 'duplex,bungalow'}),
+            ['Apartment 1', 'Apartment 4']
+        )
+        self.assertEqual(
+            self.get_titles({'available_for': ['sale', 'short let'], 'max_price': 30000}),
+            ['Apartment 1']
+        )
+
+    def test_amenities(self):
+        """
+        This method tests that the apartments returned have all the amenities,
+        given repeated, separated by commas or with numbered parameters.
+        """
+        expected = ['Apartment 0', 'Apartment 4']
+        self.assertEqual(self.get_titles({'amenities': ['wifi', 'parking']}), expected)
+        self.assertEqual(self.get_titles({'amenities': 'wifi,parking'}), expected)
+        self.assertEqual(self.get_titles({'amenities1': 'wifi', 'amenities2': 'parking'}), expected)
+        self.assertEqual(self.get_titles({'amenities': ['wifi', 'sauna']}), [])
+
+    def test_single_query(self):
+        """This method tests that the apartments are searched with one query."""
+        with self.assertNumQueries(1):
+            response = self.search({
+                'city': [self.cities[0].id, self.cities[2].id],
+                'listing_type': ['flat', 'bungalow'],
+                'amenities': ['wifi', 'parking'],
+                'fields': 'title'
+            })
+        self.assertEqual([apartment['title'] for apartment in response.json()], ['Apartment 0'])
+
+    def test_values_are_canonical(self):
+        """This method tests that the values are validated sorted and without duplicates."""
+        search = ApartmentSearchSerializer(
+            data=QueryDict('listing_type=flat&listing_type=duplex, flat&min_price=100')
+        )
+        self.assertTrue(search.is_valid())
+        self.assertEqual(search.validated_data['listing_type'], ['duplex', 'flat'])
+        self.assertEqual(search.validated_data['min_price'], 100)
+
+    def test_invalid_parameters(self):
+        """This method tests that invalid filters are rejected."""
+        for params in (
+            {'listing_type': 'castle'},
+            {'available_for': ['rent', 'steal']},
+            {'min_price': 'cheap'},
+            {'min_price': 20000, 'max_price': 10000},
+            {'sort_type': 'password'},
+            {'city': [str(i) for i in range(0, 51)]},
+            {'school': [self.cities[0].id, self.cities[1].id], 'radius': 3}
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.search(params).status_code, status.HTTP_400_BAD_REQUEST)
+
+    @skipIf(np is None, 'NumPy is not installed.')
+    def test_index_matches_database(self):
+        """This method tests that the search index and the database return the same apartments."""
+        for params in (
+            {'city': [self.cities[0].id, self.cities[2].id]},
+            {'listing_type': 'flat,duplex', 'available_for': 'rent'},
+            {'amenities': ['wifi', 'parking'], 'sort_type': 'price'},
+            {'city': [self.cities[1].id, 'unknown']}
+        ):
+            with self.subTest(params=params):
+                with self.settings(APARTMENT_SEARCH_INDEX=False):
+                    expected = self.get_titles(params)
+                with self.settings(APARTMENT_SEARCH_INDEX=True):
+                    self.assertEqual(self.get_titles(params), expected)
@@ -0,0 +1,228 @@
+"""This module defines class ApartmentSearchIndexTest"""
+from datetime import timedelta
+from unittest import mock, skipIf
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from country.models import Country
+from state.models import State
+from city.models import City
+from amenity.models import Amenity
+from apartment.models import Apartment, ApartmentAmenity
+from apartment.search_index import np, search_index, build_lock, get_search_index
+
+
+User = get_user_model()
+
+@skipIf(np is None, 'NumPy is not installed.')
+class ApartmentSearchIndexTest(TestCase):
+    """
+    This class defines methods that tests that ApartmentSearchView returns the
+    same apartments with and without the search index.
+    """
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        # pylint: disable=no-member
+
+        search_index.clear()
+
+        self.owner = User.objects.create_user(
+            username='owner',
+            email='owner@gmail.com',
+            password='password'
+        )
+
+        self.countries = [Country.objects.create(name=name) for name in ('Nigeria', 'Ghana')]
+        self.states = [
+            State.objects.create(name=f'State {i}', country=country)
+            for i, country in enumerate(self.countries)
+        ]
+        self.cities = [
+            City.objects.create(name=f'City {i}', state=state)
+            for i, state in enumerate(self.states)
+        ]
+        self.amenities = {
+            name: Amenity.objects.create(name=name) for name in ('bedroom', 'wifi', 'parking')
+        }
+
+        listing_types = ['flat', 'duplex', 'bungalow']
+        for i in range(0, 9):
+            apartment = self.create_apartment(
+                i,
+                country=self.countries[i % 2],
+                state=self.states[i % 2],
+                city=self.cities[i % 2],
+                listing_type=listing_types[i % 3],
+                available_for='rent' if i % 4 else 'sale',
+                floor_number=None if i == 4 else i % 5,
+                price=1000 * (9 - i) + i,
+                price_duration=('year', 'month', 'week')[i % 3]
+            )
+            if i % 3 != 2:
+                ApartmentAmenity.objects.create(
+                    apartment=apartment,
+                    amenity=self.amenities['bedroom'],
+                    quantity=i + 1
+                )
+            if i % 2 == 0:
+                ApartmentAmenity.objects.create(
+                    apartment=apartment,
+                    amenity=self.amenities['wifi']
+                )
+            if i % 3 == 0:
+                ApartmentAmenity.objects.create(
+                    apartment=apartment,
+                    amenity=self.amenities['parking']
+                )
+            Apartment.objects.filter(pk=apartment.pk).update(like_count=i % 4)
+
+        # Adverts that are not active are not searched.
+        self.create_apartment(9, approval_status='pending')
+
+    def tearDown(self):
+        """This method empties the search index shared by the tests."""
+        search_index.clear()
+
+    def create_apartment(self, i, **kwargs):
+        """This method creates an apartment."""
+        # pylint: disable=no-member
+
+        values = {
+            'user': self.owner,
+            'country': self.countries[0],
+            'state': self.states[0],
+            'city': self.cities[0],
+            'title': f'Flat {i}',
+            'nearest_bus_stop': 'Allen',
+            'price': 1000,
+            'listing_type': 'flat',
+            'available_for': 'rent',
+            'price_duration': 'year',
+            'approval_status': 'accepted',
+            'advert_exp_time': timezone.now() + timedelta(days=10)
+        }
+        values.update(kwargs)
+        return Apartment.objects.create(**values)
+
+    def search(self, params, use_index):
+        """This method returns the titles of the apartments returned by the search."""
+        with self.settings(APARTMENT_SEARCH_INDEX=use_index):
+            response = self.client.get(path=reverse('search_apartments'), data=params)
+        data = response.json()
+        apartments = data['apartments'] if 'apartments' in data else data
+        return [apartment['title'] for apartment in apartments]
+
+    def test_same_results_as_database(self):
+        """This method tests that the index and the database return the same apartments."""
+        searches = [
+            {},
+            {'country': self.countries[0].id},
+            {'state': self.states[1].id, 'city': self.cities[1].id},
+            {'city': 'unknown'},
+            {'listing_type': 'flat', 'available_for': 'rent'},
+            {'min_price': 3000},
+            {'max_price': 5005},
+            {'min_price': 2000, 'max_price': 7000, 'sort_type': 'price'},
+            {'min_floor_num': 1, 'max_floor_num': 3},
+            {'max_floor_num': 2, 'sort_type': '-price'},
+            {'amenities': 'wifi'},
+            {'amenities1': 'wifi', 'amenities2': 'parking'},
+            {'amenities': 'sauna'},
+            {'sort_type': 'bedroom'},
+            {'sort_type': '-bedroom', 'country': self.countries[0].id},
+            {'sort_type': 'popular'},
+            {'sort_type': 'created_at'},
+            {'sort_type': 'popular', 'page': 2, 'size': 3},
+            {'sort_type': '-price', 'page': 1, 'size': 4, 'fields': 'title,price'},
+            {'min_price_per_month': 1000, 'max_price_per_month': 20000},
+            {'sort_type': 'price_per_month', 'listing_type': 'flat'},
+            {'sort_type': '-price_per_month', 'max_price_per_month': 5000}
+        ]
+
+        for params in searches:
+            with self.subTest(params=params):
+                self.assertEqual(self.search(params, True), self.search(params, False))
+                self.assertIsNotNone(search_index.search(params))
+
+    def test_fallback_to_database(self):
+        """This method tests that searches the index cannot evaluate use the database."""
+        search_index.build()
+
+        for params in ({'sort_type': 'title'}, {'min_price': '1.5e3'}):
+            with self.subTest(params=params):
+                self.assertIsNone(search_index.search(params))
+
+        self.assertEqual(
+            self.search({'sort_type': 'title'}, True),
+            self.search({'sort_type': 'title'}, False)
+        )
+
+    def test_index_is_updated_by_signals(self):
+        """
+        This method tests that the index is updated when apartments and their
+        amenities are saved or deleted.
+        """
+        # pylint: disable=no-member
+
+        search_index.build()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            apartment = self.create_apartment(10, price=100)
+            ApartmentAmenity.objects.create(apartment=apartment, amenity=self.amenities['wifi'])
+        self.assertEqual(search_index.search({'max_price': 500}), [str(apartment.id)])
+        self.assertIn(str(apartment.id), search_index.search({'amenities': 'wifi'}))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            apartment.is_taken = True
+            apartment.save()
+        self.assertEqual(search_index.search({'max_price': 500}), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Apartment.objects.get(title='Flat 0').delete()
+        self.assertNotIn('Flat 0', self.search({}, True))
+        self.assertEqual(self.search({}, True), self.search({}, False))
+
+    def test_apartments_are_read_in_chunks(self):
+        """
+        This method tests that the apartments of an unpaginated search and their
+        related rows are read from the database in chunks, in the order of the index.
+        """
+        expected = self.search({'sort_type': '-price'}, False)
+
+        with mock.patch('apartment.search_index.HYDRATE_CHUNK_SIZE', 2), \
+                mock.patch('apartment.serializers.HYDRATE_CHUNK_SIZE', 2):
+            self.search({'sort_type': '-price'}, True)
+            # The apartments and their images, amenities, qualities and owner
+            # interests, for each chunk of two apartments.
+            with self.assertNumQueries(5 * -(-len(expected) // 2)):
+                titles = self.search({'sort_type': '-price'}, True)
+
+        self.assertEqual(titles, expected)
+
+    @override_settings(APARTMENT_SEARCH_INDEX=True)
+    def test_stale_index_is_built_once(self):
+        """
+        This method tests that a stale index is searched while another request
+        builds it again.
+        """
+        search_index.build()
+        search_index.built_at -= 3600
+        built_at = search_index.built_at
+
+        with build_lock:
+            self.assertIs(get_search_index(), search_index)
+            self.assertEqual(search_index.built_at, built_at)
+
+        get_search_index()
+        self.assertGreater(search_index.built_at, built_at)
+
+    @override_settings(APARTMENT_SEARCH_INDEX=False)
+    def test_disabled(self):
+        """This method tests that the index is not built if it is disabled."""
+        self.search({}, False)
+        self.assertFalse(search_index.is_built)
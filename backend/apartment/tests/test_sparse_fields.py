@@ -0,0 +1,151 @@
+"""This module defines class ApartmentSparseFieldsTest"""
+from datetime import timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from country.models import Country
+from state.models import State
+from city.models import City
+from amenity.models import Amenity
+from image.models import Image
+from apartment.models import Apartment, ApartmentAmenity
+from apartment.serializers import (
+    ApartmentSerializer,
+    ApartmentCardSerializer,
+    get_card_columns
+)
+
+
+User = get_user_model()
+
+class ApartmentSparseFieldsTest(TestCase):
+    """
+    This class defines methods that tests the fields and expand parameters
+    of the apartment endpoints.
+    """
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        # pylint: disable=no-member
+
+        self.owner = User.objects.create_user(
+            username='owner',
+            email='owner@gmail.com',
+            password='password'
+        )
+
+        country = Country.objects.create(name='Nigeria')
+        state = State.objects.create(name='Lagos', country=country)
+        city = City.objects.create(name='Ikeja', state=state)
+        amenity = Amenity.objects.create(name='bedroom')
+
+        for i in range(0, 3):
+            apartment = Apartment.objects.create(
+                user=self.owner,
+                country=country,
+                state=state,
+                city=city,
+                title=f'Flat {i}',
+                nearest_bus_stop='Allen',
+                price=100000 * (i + 1),
+                listing_type='flat',
+                available_for='rent',
+                price_duration='year',
+                approval_status='accepted',
+                advert_exp_time=timezone.now() + timedelta(days=10)
+            )
+            ApartmentAmenity.objects.create(apartment=apartment, amenity=amenity, quantity=i + 1)
+            Image.objects.create(apartment=apartment, image=f'apartment_image/{i}.jpg')
+
+        self.apartment = apartment
+
+    def test_cards_match_apartment_serializer(self):
+        """
+        This method tests that the cards and ApartmentSerializer return the same
+        fields, and that the cards only query the tables of the returned fields.
+        """
+        fields = ['id', 'title', 'user', 'country', 'amenities', 'images']
+        expand = ['country', 'images']
+        request = Request(APIRequestFactory().get('/api/apartments/available'))
+        request.user = User.objects.get(pk=self.owner.pk)
+        context = {'request': request}
+        apartments = Apartment.objects.order_by('-created_at')
+
+        expected = ApartmentSerializer(
+            apartments, many=True, context=context, fields=fields, expand=expand
+        ).data
+
+        # Apartments, amenities and images.
+        with self.assertNumQueries(3):
+            cards = ApartmentCardSerializer(
+                apartments.values(*get_card_columns(fields, expand)),
+                many=True, context=context, fields=fields, expand=expand
+            ).data
+
+        self.assertEqual(cards, expected)
+        self.assertEqual(list(cards[0]), fields)
+        self.assertEqual(cards[0]['user'], str(self.owner.pk))
+        self.assertEqual(cards[0]['country']['name'], 'Nigeria')
+
+    def test_list_endpoint(self):
+        """
+        This method tests that only the requested fields are returned, and that
+        unknown fields are rejected.
+        """
+        response = self.client.get(
+            path=reverse('get_available_apartments'),
+            data={'fields': 'id,title,price'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [list(apartment) for apartment in response.json()],
+            [['id', 'title', 'price']] * 3
+        )
+
+        response = self.client.get(
+            path=reverse('get_available_apartments'),
+            data={'fields': 'id,password'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json().get('error'), 'Field "password" does not exist.')
+
+        response = self.client.get(
+            path=reverse('get_available_apartments'),
+            data={'fields': 'id,title', 'expand': 'title'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_detail_endpoint(self):
+        """
+        This method tests that the nested fields of an apartment that are not
+        expanded are returned as primary keys.
+        """
+        path = reverse('get_update_delete_apartment', args=[self.apartment.id])
+        response = self.client.get(path=path, data={'fields': 'id,user,amenities,city'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        amenity = ApartmentAmenity.objects.get(apartment=self.apartment)
+        self.assertEqual(response.json(), {
+            'id': str(self.apartment.id),
+            'user': str(self.owner.id),
+            'amenities': [amenity.id],
+            'city': str(self.apartment.city_id)
+        })
+
+        response = self.client.get(
+            path=path, data={'fields': 'id,user,city', 'expand': 'user,city'}
+        )
+        self.assertEqual(response.json()['user']['username'], 'owner')
+        self.assertEqual(response.json()['city']['name'], 'Ikeja')
+
+        # The full apartment has a different ETag.
+        response2 = self.client.get(path=path)
+        self.assertEqual(response2.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers['ETag'], response2.headers['ETag'])
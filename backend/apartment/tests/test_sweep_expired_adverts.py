@@ -0,0 +1,123 @@
+"""This module defines class SweepExpiredAdvertsTest"""
+from datetime import timedelta
+from io import StringIO
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from country.models import Country
+from state.models import State
+from city.models import City
+from apartment.models import Apartment
+
+
+User = get_user_model()
+
+class SweepExpiredAdvertsTest(TestCase):
+    """
+    This class defines methods that tests the is_active_listing field of
+    apartments and the sweep_expired_adverts command.
+    """
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        # pylint: disable=no-member
+        self.user = User.objects.create_user(
+            username='test_user',
+            email='test_user@gmail.com',
+            password='password'
+        )
+        self.country = Country.objects.create(name='Nigeria')
+        self.state = State.objects.create(name='Lagos', country=self.country)
+        self.city = City.objects.create(name='Ikeja', state=self.state)
+
+    def create_apartment(self, title, days_left=28, **kwargs):
+        """This method creates an approved apartment that expires in days_left days."""
+        # pylint: disable=no-member
+
+        data = {
+            'user': self.user,
+            'country': self.country,
+            'state': self.state,
+            'city': self.city,
+            'title': title,
+            'nearest_bus_stop': 'Allen',
+            'price': 100000,
+            'listing_type': 'flat',
+            'available_for': 'rent',
+            'price_duration': 'year',
+            'approval_status': 'accepted',
+            'advert_exp_time': timezone.now() + timedelta(days=days_left)
+        }
+        data.update(kwargs)
+        return Apartment.objects.create(**data)
+
+    def expire(self, apartment):
+        """This method moves advert_exp_time of the apartment into the past without saving it."""
+        # pylint: disable=no-member
+        Apartment.objects.filter(pk=apartment.pk).update(
+            advert_exp_time=timezone.now() - timedelta(days=1)
+        )
+
+    def test_is_active_listing_set_on_save(self):
+        """This method tests that is_active_listing is set when an apartment is saved."""
+        apartment = self.create_apartment('Flat')
+        self.assertTrue(apartment.is_active_listing)
+
+        self.assertFalse(
+            self.create_apartment('Pending', approval_status='pending').is_active_listing
+        )
+        self.assertFalse(self.create_apartment('Expired', days_left=-1).is_active_listing)
+
+        apartment.is_taken = True
+        apartment.save(update_fields=['is_taken'])
+        apartment.refresh_from_db()
+        self.assertFalse(apartment.is_active_listing)
+
+    def test_expired_adverts_are_deactivated_in_batches(self):
+        """This method tests that expired adverts are deactivated in batches of the given size."""
+        # pylint: disable=no-member
+
+        for i in range(0, 5):
+            self.expire(self.create_apartment(f'Expired {i}'))
+        self.create_apartment('Flat')
+
+        output = StringIO()
+        call_command('sweep_expired_adverts', batch_size=2, stdout=output)
+
+        self.assertIn('Batch 3: updated 1 apartments.', output.getvalue())
+        self.assertIn('Deactivated 5 expired adverts.', output.getvalue())
+        self.assertEqual(Apartment.objects.filter(is_active_listing=True).count(), 1)
+
+    def test_backfill(self):
+        """This method tests that --backfill recomputes is_active_listing of every apartment."""
+        # pylint: disable=no-member
+
+        active = self.create_apartment('Flat')
+        expired = self.create_apartment('Expired')
+        self.expire(expired)
+        Apartment.objects.filter(pk=active.pk).update(is_active_listing=False)
+
+        output = StringIO()
+        call_command('sweep_expired_adverts', backfill=True, stdout=output)
+
+        self.assertIn('Activated 1 and deactivated 1 apartments.', output.getvalue())
+        self.assertEqual(
+            list(Apartment.objects.filter(is_active_listing=True).values_list('id', flat=True)),
+            [str(active.id)]
+        )
+
+    def test_available_apartments_exclude_inactive_adverts(self):
+        """This method tests that only active adverts are listed as available."""
+        active = self.create_apartment('Flat')
+        self.create_apartment('Taken', is_taken=True)
+
+        response = self.client.get(path=reverse('get_available_apartments'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([apartment['id'] for apartment in response.json()], [str(active.id)])
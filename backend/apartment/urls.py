@@ -6,6 +6,7 @@ from apartment.views.get_available_apartments import GetAvailableApartmentsView
 from apartment.views.apartment import ApartmentView
 from apartment.views.search_apartments import ApartmentSearchView
 from apartment.views.get_featured_apartments import FeaturedApartmentsView
+from apartment.views.price_statistics import ApartmentPriceStatisticsView
 
 
 urlpatterns = [
@@ -15,6 +16,8 @@ urlpatterns = [
     path('api/apartments/featured', FeaturedApartmentsView.as_view(), name='featured_apartments'),
     path('api/apartments/available', GetAvailableApartmentsView.as_view(),
          name='get_available_apartments'),
+    path('api/apartments/price-statistics', ApartmentPriceStatisticsView.as_view(),
+         name='apartment_price_statistics'),
     path('api/apartments/<str:apartment_id>', ApartmentView.as_view(),
          name='get_update_delete_apartment'),
 ]
@@ -1,12 +1,21 @@
 """This module defines the functions utilized in the apartment app."""
 # from datetime import timedelta
+from hashlib import sha1
+from rest_framework import status
+from rest_framework.response import Response
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.contrib.sites.shortcuts import get_current_site
 from django.core.files.storage import default_storage
+from django.db.models import (
+    Q, Count, Max, OuterRef, Subquery, Case, When, Value, F, BigIntegerField
+)
+from django.db.models.functions import Coalesce
 from django.urls import reverse
-# from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils import timezone
 from image.models import Image
-from .models import ApartmentAmenity
+from .models import Apartment, ApartmentAmenity, get_price_per_month
 
 
 def paginate_queryset(queryset, page, page_size):
@@ -60,6 +69,43 @@ def get_page_and_size(request):
 
     return page, page_size
 
+def get_sparse_fields(request, allowed_fields, nested_fields=()):
+    """
+    This function returns the lists of fields and nested fields to expand given in the
+    comma separated fields and expand parameters of the query string. fields is None
+    if all fields are requested, and expand is then ignored. It raises an exception if
+    a field does not exist or cannot be expanded.
+    """
+    fields = request.GET.get('fields')
+    expand = request.GET.get('expand')
+
+    if fields is None or fields == '':
+        return None, None
+
+    fields = [field.strip() for field in fields.split(',') if field.strip()]
+    expand = [field.strip() for field in (expand or '').split(',') if field.strip()]
+
+    for field in fields:
+        if field not in allowed_fields:
+            raise ValueError(f'Field "{field}" does not exist.')
+
+    for field in expand:
+        if field not in nested_fields:
+            raise ValueError(f'Field "{field}" cannot be expanded.')
+
+    return list(dict.fromkeys(fields)), expand
+
+def is_included(field, fields):
+    """This function checks if a field is returned with the fields from get_sparse_fields."""
+    return fields is None or field in fields
+
+def is_expanded(field, fields, expand):
+    """
+    This function checks if a nested field is returned in full with the fields and
+    expand from get_sparse_fields.
+    """
+    return fields is None or (field in fields and field in expand)
+
 def get_prev_and_next_page(
         request, page, page_size, total_pages,
         url_name, arg1=None, arg2=None):
@@ -203,6 +249,191 @@ def delete_apartment_images(images_to_delete):
                 default_storage.delete(image_path)
             image.delete()
 
+def update_in_batches(queryset, batch_size, progress=None, **values):
+    """
+    This function updates the apartments in the queryset with the given values,
+    batch_size rows at a time, so each update only locks a bounded number of rows.
+    The values must take the apartments out of the queryset. If given, progress
+    is called with the number of apartments updated in each batch.
+    It returns the number of apartments updated.
+    """
+    total_updated = 0
+
+    while True:
+        apartment_ids = list(queryset.values_list('id', flat=True)[:batch_size])
+        if not apartment_ids:
+            return total_updated
+
+        updated = queryset.filter(pk__in=apartment_ids).update(**values)
+        total_updated += updated
+
+        if progress is not None:
+            progress(updated)
+
+def deactivate_expired_adverts(batch_size=1000, progress=None):
+    """
+    This function sets is_active_listing to False for active adverts whose
+    advert_exp_time has passed. It returns the number of adverts deactivated.
+    """
+    # pylint: disable=no-member
+
+    expired_adverts = Apartment.objects.filter(
+        is_active_listing=True,
+        advert_exp_time__lte=timezone.now()
+    ).order_by()
+
+    return update_in_batches(expired_adverts, batch_size, progress, is_active_listing=False)
+
+def backfill_active_listings(batch_size=1000, progress=None):
+    """
+    This function sets is_active_listing of every apartment from its approval
+    status, is_taken and advert_exp_time. It is used once after the field is
+    added. It returns the number of apartments activated and deactivated.
+    """
+    # pylint: disable=no-member
+
+    now = timezone.now()
+    is_live = Q(is_taken=False, approval_status='accepted', advert_exp_time__gt=now)
+
+    activated = update_in_batches(
+        Apartment.objects.filter(is_live, is_active_listing=False).order_by(),
+        batch_size,
+        progress,
+        is_active_listing=True
+    )
+    deactivated = update_in_batches(
+        Apartment.objects.filter(is_active_listing=True).exclude(is_live).order_by(),
+        batch_size,
+        progress,
+        is_active_listing=False
+    )
+
+    return activated, deactivated
+
+def backfill_prices_per_month(batch_size=1000, max_batches=None, progress=None):
+    """
+    This function sets price_per_month of the apartments from their price and
+    price_duration in batches of apartments, and corrects the ones that differ.
+    A price is only written if the price and price duration it was computed
+    from were not changed since they were read. If given, progress is called
+    with the batch number and the number of apartments updated in the batch.
+    It returns the total number of apartments updated.
+    """
+    # pylint: disable=no-member
+
+    number_of_batches = 0
+    total_updated = 0
+    last_id = None
+
+    while max_batches is None or number_of_batches < max_batches:
+        apartments = Apartment.objects.order_by('pk')
+        if last_id is not None:
+            apartments = apartments.filter(pk__gt=last_id)
+
+        rows = list(apartments.values('id', 'price', 'price_duration', 'price_per_month')[
+            :batch_size
+        ])
+        if not rows:
+            break
+        last_id = rows[-1]['id']
+
+        # Only the apartments whose price per month is wrong are written.
+        wrong_rows = [
+            row for row in rows
+            if row['price_per_month'] != get_price_per_month(row['price'], row['price_duration'])
+        ]
+        updated = Apartment.objects.filter(
+            pk__in=[row['id'] for row in wrong_rows]
+        ).update(
+            price_per_month=Case(
+                *[
+                    When(
+                        pk=row['id'],
+                        price=row['price'],
+                        price_duration=row['price_duration'],
+                        then=Value(get_price_per_month(row['price'], row['price_duration']))
+                    )
+                    for row in wrong_rows
+                ],
+                default=F('price_per_month'),
+                output_field=BigIntegerField()
+            )
+        ) if wrong_rows else 0
+
+        number_of_batches += 1
+        total_updated += updated
+
+        if progress is not None:
+            progress(number_of_batches, updated)
+
+    return total_updated
+
+def get_version_annotations(name, queryset, field, outer_ref='pk'):
+    """
+    This function returns the annotations that add the number of rows and the
+    latest updated_at of the rows of queryset whose field matches outer_ref of
+    the annotated row. They are named <name>_count and <name>_updated_at.
+    Together they change whenever a related row is added, updated or deleted.
+    """
+    related = queryset.filter(**{field: OuterRef(outer_ref)}).order_by().values(field)
+
+    return {
+        f'{name}_count': Coalesce(
+            Subquery(related.annotate(count=Count('pk')).values('count')), 0
+        ),
+        f'{name}_updated_at': Subquery(
+            related.annotate(updated_at=Max('updated_at')).values('updated_at')
+        )
+    }
+
+def get_etag(*parts):
+    """This function returns a strong ETag computed from the string of each part."""
+    value = '|'.join(str(part) for part in parts)
+    return f'"{sha1(value.encode(), usedforsecurity=False).hexdigest()}"'
+
+def get_validator_headers(etag, last_modified=None):
+    """
+    This function returns the headers that let a client make a conditional
+    request for a resource. Clients must revalidate their copy before using it,
+    and caches must keep a copy for each Authorization header, because the ETag
+    can also depend on the user that made the request.
+    Last-Modified is only sent if last_modified is given. Resources whose ETag
+    depends on more than the update times of their rows must not give it, since
+    a client could then revalidate with If-Modified-Since alone.
+    """
+    headers = {
+        'ETag': etag,
+        'Cache-Control': 'private, no-cache',
+        'Vary': 'Authorization'
+    }
+
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified.timestamp())
+
+    return headers
+
+def get_not_modified_response(request, etag, last_modified=None):
+    """
+    This function compares the If-None-Match header of the request with the
+    etag of the resource, and the If-Modified-Since header with last_modified
+    if it is given.
+    It returns a response with a http status code of 304 if the copy of the
+    client is current, else None.
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified is not None else None
+    )
+
+    if response is None or response.status_code != status.HTTP_304_NOT_MODIFIED:
+        return None
+
+    return Response(
+        status=status.HTTP_304_NOT_MODIFIED,
+        headers=get_validator_headers(etag, last_modified)
+    )
+
 # def reset_advert_exp_time(apartment, extend_time=False):
 #     """
 #     This function resets the time remaining for an apartment advert
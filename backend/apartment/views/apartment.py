@@ -3,16 +3,31 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
-from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
-from drf_spectacular.utils import extend_schema
-from apartment.serializers import ApartmentSerializer
-from apartment.models import Apartment
+from rest_framework.parsers import MultiPartParser, FormParser
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from apartment_search_app.parsers import FastJSONParser
+from apartment.serializers import (
+    ApartmentSerializer,
+    APARTMENT_CARD_COLUMNS,
+    APARTMENT_NESTED_FIELDS
+)
+from apartment.models import Apartment, ApartmentAmenity, ApartmentUserPreferredQuality
 from apartment.utils import (
     save_apartment_amenities,
     save_apartment_images,
     delete_apartment_images,
+    get_version_annotations,
+    get_etag,
+    get_validator_headers,
+    get_not_modified_response,
+    get_sparse_fields,
+    is_included,
+    is_expanded,
     # reset_advert_exp_time
 )
+from apartment_like.models import ApartmentLike
+from image.models import Image
+from user.models import UserProfileInterest
 
 
 class ApartmentView(APIView):
@@ -20,12 +35,117 @@ class ApartmentView(APIView):
 
     serializer_class = ApartmentSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
-    parser_classes = [JSONParser, MultiPartParser, FormParser]
+    parser_classes = [FastJSONParser, MultiPartParser, FormParser]
+
+
+    def get_apartment(self, apartment_id, fields, expand):
+        """
+        This method returns the apartment with the rows serialized with it and
+        their versions. Only the rows of the requested fields are fetched.
+        """
+        # pylint: disable=no-member
+
+        related = [field for field in ('user', 'country', 'state', 'city', 'school')
+                   if is_expanded(field, fields, expand)]
+        if 'user' in related:
+            related[0] = 'user__profile'
+
+        annotations = {}
+        if is_included('images', fields):
+            annotations.update(
+                get_version_annotations('images', Image.objects.all(), 'apartment')
+            )
+        if is_included('amenities', fields):
+            annotations.update(
+                get_version_annotations('amenities', ApartmentAmenity.objects.all(), 'apartment')
+            )
+        if is_included('user_preferred_qualities', fields):
+            annotations.update(get_version_annotations(
+                'qualities', ApartmentUserPreferredQuality.objects.all(), 'apartment'
+            ))
+        if is_expanded('user', fields, expand):
+            annotations.update(get_version_annotations(
+                'owner_interests', UserProfileInterest.objects.all(),
+                'user_profile', outer_ref='user'
+            ))
+
+        return Apartment.objects.select_related(*related).annotate(
+            **annotations
+        ).get(pk=apartment_id)
+
+    def get_versions(self, apartment, fields, expand):
+        """
+        This method returns the last update times of the apartment and of the
+        rows serialized with it.
+        """
+        versions = [apartment.updated_at]
+
+        if is_expanded('user', fields, expand):
+            versions += [apartment.user.updated_at, apartment.user.profile.updated_at,
+                         apartment.owner_interests_updated_at]
+        for field in ('country', 'state', 'city', 'school'):
+            related = getattr(apartment, field) if is_expanded(field, fields, expand) else None
+            if related is not None:
+                versions.append(related.updated_at)
+        for name in ('images', 'amenities', 'qualities'):
+            versions.append(getattr(apartment, f'{name}_updated_at', None))
+
+        return versions
 
+    def get_etag(self, request, apartment, fields, expand):
+        """
+        This method returns the ETag of the serialized apartment. It changes when
+        the apartment or any row shown with it changes, and differs between
+        users that are shown different fields.
+        """
+        # pylint: disable=no-member
 
+        user = request.user
+        liked = is_included('liked', fields) and user.is_authenticated and \
+            ApartmentLike.objects.filter(user_id=user.id, apartment=apartment).exists()
+
+        return get_etag(
+            apartment.pk,
+            *self.get_versions(apartment, fields, expand),
+            getattr(apartment, 'images_count', None),
+            getattr(apartment, 'amenities_count', None),
+            getattr(apartment, 'qualities_count', None),
+            getattr(apartment, 'owner_interests_count', None),
+            apartment.advert_days_left,
+            apartment.like_count,
+            user.id if user.is_authenticated else None,
+            user.is_staff,
+            liked,
+            request.get_host(),
+            fields,
+            expand
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name='fields',
+                location=OpenApiParameter.QUERY,
+                description='Comma separated fields to return',
+                required=False,
+                type=str
+            ),
+            OpenApiParameter(
+                name='expand',
+                location=OpenApiParameter.QUERY,
+                description='Comma separated nested fields to return in full when fields is given',
+                required=False,
+                type=str
+            )
+        ]
+    )
     def get(self, request, apartment_id):
         """
         This method gets an apartment advert from the database based on provided apartment_id.\n
+        Requests with If-None-Match are answered with a http status code of 304
+        and no body if the apartment has not changed. Last-Modified is not sent, since
+        the like count, the days left and whether the user liked the apartment change
+        without updating it.\n
         Returns:\n
             On success: A http status code of 200 and data of the apartment.\n
             On failure: An error message with a corresponding http status code.
@@ -33,19 +153,40 @@ class ApartmentView(APIView):
         # pylint: disable=no-member
         # pylint: disable=unused-argument
 
-        # # Get the requested apartment based on provided apartment_id
+        # Get the fields to return and the nested fields to expand.
         try:
-            apartment = Apartment.objects.get(pk=apartment_id)
+            fields, expand = get_sparse_fields(
+                request, APARTMENT_CARD_COLUMNS, APARTMENT_NESTED_FIELDS
+            )
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Get the requested apartment based on provided apartment_id, with the
+        # versions of the rows serialized with it.
+        try:
+            apartment = self.get_apartment(apartment_id, fields, expand)
         except Apartment.DoesNotExist:
             return Response({'error': 'Apartment not found.'}, status=status.HTTP_404_NOT_FOUND)
 
+        # Return 304 if the copy of the client is current.
+        etag = self.get_etag(request, apartment, fields, expand)
+        response = get_not_modified_response(request, etag)
+        if response is not None:
+            return response
+
         # # Reset the time an apartment advert will be taken down
         # if request.user == apartment.user or request.user.is_staff is True:
         #     reset_advert_exp_time(apartment)
 
         # Serialize the apartment object and return a response.
-        serializer = ApartmentSerializer(apartment, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        serializer = ApartmentSerializer(
+            apartment, context={'request': request}, fields=fields, expand=expand
+        )
+        return Response(
+            serializer.data,
+            status=status.HTTP_200_OK,
+            headers=get_validator_headers(etag)
+        )
 
     def put(self, request, apartment_id):
         """
@@ -101,6 +242,8 @@ class ApartmentView(APIView):
         price = validated_data.get('price')
         listing_type = validated_data.get('listing_type')
         nearest_bus_stop = validated_data.get('nearest_bus_stop')
+        latitude = validated_data.get('latitude')
+        longitude = validated_data.get('longitude')
         approval_status = validated_data.get('approval_status')
 
         # Set default value for when is_taken is None ie when not included in the request.
@@ -132,6 +275,8 @@ class ApartmentView(APIView):
             apartment.price = price
             apartment.listing_type = listing_type
             apartment.nearest_bus_stop = nearest_bus_stop
+            apartment.latitude = latitude
+            apartment.longitude = longitude
 
         if request.user.is_staff is True:
             apartment.approval_status = approval_status
@@ -250,6 +395,10 @@ class ApartmentView(APIView):
                 nearest_bus_stop = validated_data.get('nearest_bus_stop')
                 apartment.nearest_bus_stop = nearest_bus_stop
 
+            if 'latitude' in validated_data.keys():
+                apartment.latitude = validated_data.get('latitude')
+                apartment.longitude = validated_data.get('longitude')
+
             image_upload = None
             if 'image_upload' in validated_data.keys():
                 image_upload = validated_data.get('image_upload')
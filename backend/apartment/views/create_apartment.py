@@ -5,8 +5,9 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
+from rest_framework.parsers import MultiPartParser, FormParser
 from drf_spectacular.utils import extend_schema
+from apartment_search_app.parsers import FastJSONParser
 from apartment.models import Apartment
 from apartment.utils import (
     save_apartment_amenities,
@@ -20,7 +21,7 @@ class CreateApartmentView(APIView):
 
     permission_classes = [IsAuthenticated]
     serializer_class = ApartmentSerializer
-    parser_classes = [JSONParser, MultiPartParser, FormParser]
+    parser_classes = [FastJSONParser, MultiPartParser, FormParser]
 
     @extend_schema(
         request=ApartmentSerializer,
@@ -82,6 +83,8 @@ class CreateApartmentView(APIView):
         price = validated_data.get('price')
         listing_type = validated_data.get('listing_type')
         nearest_bus_stop = validated_data.get('nearest_bus_stop')
+        latitude = validated_data.get('latitude')
+        longitude = validated_data.get('longitude')
 
         # Create and save apartment in the database.
         apartment = Apartment.objects.create(
@@ -96,6 +99,8 @@ class CreateApartmentView(APIView):
             price=price,
             listing_type=listing_type,
             nearest_bus_stop=nearest_bus_stop,
+            latitude=latitude,
+            longitude=longitude,
             advert_exp_time=timezone.now() + timedelta(weeks=4)
         )
 
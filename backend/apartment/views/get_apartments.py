@@ -3,15 +3,23 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
+from rest_framework.parsers import MultiPartParser, FormParser
 from drf_spectacular.utils import extend_schema, OpenApiParameter
+from apartment_search_app.parsers import FastJSONParser
 from apartment.models import Apartment
 from apartment.utils import (
     get_page_and_size,
     get_prev_and_next_page,
-    paginate_queryset
+    paginate_queryset,
+    get_sparse_fields
+)
+from apartment.serializers import (
+    ApartmentSerializer,
+    ApartmentCardSerializer,
+    APARTMENT_CARD_COLUMNS,
+    APARTMENT_NESTED_FIELDS,
+    get_card_columns
 )
-from apartment.serializers import ApartmentSerializer
 
 
 class GetApartmentsView(APIView):
@@ -19,7 +27,7 @@ class GetApartmentsView(APIView):
 
     permission_classes = [IsAuthenticated]
     serializer_class = ApartmentSerializer
-    parser_classes = [JSONParser, MultiPartParser, FormParser]
+    parser_classes = [FastJSONParser, MultiPartParser, FormParser]
 
     @extend_schema(
         parameters=[
@@ -36,6 +44,20 @@ class GetApartmentsView(APIView):
                 description='Number of items per page',
                 required=False,
                 type=int
+            ),
+            OpenApiParameter(
+                name='fields',
+                location=OpenApiParameter.QUERY,
+                description='Comma separated fields to return',
+                required=False,
+                type=str
+            ),
+            OpenApiParameter(
+                name='expand',
+                location=OpenApiParameter.QUERY,
+                description='Comma separated nested fields to return in full when fields is given',
+                required=False,
+                type=str
             )
         ]
     )
@@ -55,6 +77,14 @@ class GetApartmentsView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
 
+        # Get the fields to return and the nested fields to expand.
+        try:
+            fields, expand = get_sparse_fields(
+                request, APARTMENT_CARD_COLUMNS, APARTMENT_NESTED_FIELDS
+            )
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
         # Get the values of page and page_size from query string of the request.
         try:
             page, page_size = get_page_and_size(request)
@@ -62,11 +92,16 @@ class GetApartmentsView(APIView):
             return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
         # Get all apartments
-        apartments = Apartment.objects.all().order_by('-created_at')
+        apartments = Apartment.objects.all().order_by('-created_at').values(
+            *get_card_columns(fields, expand)
+        )
 
         # Return all apartments without pagination if page and page size were not provided.
         if page is None and page_size is None:
-            serializer = ApartmentSerializer(apartments, many=True, context={'request': request})
+            serializer = ApartmentCardSerializer(
+                apartments, many=True, context={'request': request},
+                fields=fields, expand=expand
+            )
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         # Get paginated queryset from the apartments queryset
@@ -78,7 +113,10 @@ class GetApartmentsView(APIView):
             return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
         # serialize paginated queyset.
-        serializer = ApartmentSerializer(paginated_data, many=True, context={'request': request})
+        serializer = ApartmentCardSerializer(
+            paginated_data, many=True, context={'request': request},
+            fields=fields, expand=expand
+        )
 
         # Get values of previous and next pages.
         previous_page, next_page = get_prev_and_next_page(
@@ -90,7 +128,7 @@ class GetApartmentsView(APIView):
         )
 
         data = {
-            'total_number_of_apartments': len(apartments),
+            'total_number_of_apartments': paginated_data.paginator.count,
             'total_pages': total_pages,
             'previous_page': previous_page,
             'current_page': page,
@@ -3,13 +3,19 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from drf_spectacular.utils import extend_schema, OpenApiParameter
-from django.utils import timezone
 from apartment.models import Apartment
-from apartment.serializers import ApartmentSerializer
+from apartment.serializers import (
+    ApartmentSerializer,
+    ApartmentCardSerializer,
+    APARTMENT_CARD_COLUMNS,
+    APARTMENT_NESTED_FIELDS,
+    get_card_columns
+)
 from apartment.utils import (
     paginate_queryset,
     get_prev_and_next_page,
-    get_page_and_size
+    get_page_and_size,
+    get_sparse_fields
 )
 
 
@@ -33,6 +39,20 @@ class GetAvailableApartmentsView(APIView):
                 description='Number of items per page',
                 required=False,
                 type=int
+            ),
+            OpenApiParameter(
+                name='fields',
+                location=OpenApiParameter.QUERY,
+                description='Comma separated fields to return',
+                required=False,
+                type=str
+            ),
+            OpenApiParameter(
+                name='expand',
+                location=OpenApiParameter.QUERY,
+                description='Comma separated nested fields to return in full when fields is given',
+                required=False,
+                type=str
             )
         ],
     )
@@ -45,22 +65,31 @@ class GetAvailableApartmentsView(APIView):
         """
         # pylint: disable=no-member
 
+        # Get the fields to return and the nested fields to expand.
+        try:
+            fields, expand = get_sparse_fields(
+                request, APARTMENT_CARD_COLUMNS, APARTMENT_NESTED_FIELDS
+            )
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
         # Get the values of page and page_size from query string of the request.
         try:
             page, page_size = get_page_and_size(request)
         except ValueError as exc:
             return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Get apartments that are not taken
+        # Get apartments that are approved, not taken and have not expired.
         apartments = Apartment.objects.filter(
-            is_taken=False,
-            approval_status='accepted',
-            advert_exp_time__gt=timezone.now()
-        ).order_by('-created_at')
+            is_active_listing=True
+        ).order_by('-created_at').values(*get_card_columns(fields, expand))
 
         # Return all apartments without pagination if page and page size were not provided.
         if page is None and page_size is None:
-            serializer = ApartmentSerializer(apartments, many=True, context={'request': request})
+            serializer = ApartmentCardSerializer(
+                apartments, many=True, context={'request': request},
+                fields=fields, expand=expand
+            )
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         # Get paginated queryset from the apartments queryset
@@ -72,7 +101,10 @@ class GetAvailableApartmentsView(APIView):
             return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
         # serialize paginated queyset.
-        serializer = ApartmentSerializer(paginated_data, many=True, context={'request': request})
+        serializer = ApartmentCardSerializer(
+            paginated_data, many=True, context={'request': request},
+            fields=fields, expand=expand
+        )
 
         # Get values of previous and next pages.
         previous_page, next_page = get_prev_and_next_page(
@@ -84,7 +116,7 @@ class GetAvailableApartmentsView(APIView):
         )
 
         data = {
-            'total_number_of_apartments': len(apartments),
+            'total_number_of_apartments': paginated_data.paginator.count,
             'total_pages': total_pages,
             'previous_page': previous_page,
             'current_page': page,
@@ -0,0 +1,118 @@
+"""This module defines class ApartmentPriceStatisticsView"""
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from apartment.models import ApartmentPriceStatistic
+from apartment.serializers import ApartmentPriceStatisticSerializer
+from apartment.utils import get_etag, get_validator_headers, get_not_modified_response
+
+
+class ApartmentPriceStatisticsView(APIView):
+    """
+    This class defines a method that returns the statistics of the prices per
+    month of the active adverts of a location. They are read from the summary
+    table built by the aggregate_price_statistics command.
+    """
+
+    serializer_class = ApartmentPriceStatisticSerializer
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name='country',
+                location=OpenApiParameter.QUERY,
+                description='Id of the country',
+                required=False,
+                type=str
+            ),
+            OpenApiParameter(
+                name='state',
+                location=OpenApiParameter.QUERY,
+                description='Id of the state',
+                required=False,
+                type=str
+            ),
+            OpenApiParameter(
+                name='city',
+                location=OpenApiParameter.QUERY,
+                description='Id of the city. The most specific location given is used',
+                required=False,
+                type=str
+            ),
+            OpenApiParameter(
+                name='listing_type',
+                location=OpenApiParameter.QUERY,
+                description='Listing type of the apartments, all listing types by default',
+                required=False,
+                type=str
+            ),
+            OpenApiParameter(
+                name='bedrooms',
+                location=OpenApiParameter.QUERY,
+                description='Number of bedrooms of the apartments, any number by default',
+                required=False,
+                type=int
+            )
+        ],
+        responses={200: ApartmentPriceStatisticSerializer}
+    )
+    def get(self, request):
+        """
+        This method returns the percentiles and histogram of the prices per month
+        of the active adverts of a location, listing type and number of bedrooms.\n
+        Returns:\n
+            On success: A http status code of 200 and the price statistics.\n
+            On failure: An error message with a corresponding http status code.
+        """
+        # pylint: disable=no-member
+
+        location_type = None
+        for name in ('city', 'state', 'country'):
+            location_id = request.GET.get(name, '')
+            if location_id != '':
+                location_type = name
+                break
+
+        if location_type is None:
+            return Response(
+                {'error': 'One of the parameters "country", "state" or "city" is required.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        bedrooms = request.GET.get('bedrooms', '')
+        if bedrooms == '':
+            bedrooms = None
+        else:
+            try:
+                bedrooms = int(bedrooms)
+            except ValueError:
+                return Response(
+                    {'error': 'Value for "bedrooms" must be an int.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        statistic = ApartmentPriceStatistic.objects.filter(
+            location_type=location_type,
+            location_id=location_id,
+            listing_type=request.GET.get('listing_type', ''),
+            bedrooms=bedrooms
+        ).first()
+
+        if statistic is None:
+            return Response(
+                {'error': 'There are no price statistics for this search.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        etag = get_etag(statistic.id, statistic.computed_at.isoformat())
+        response = get_not_modified_response(request, etag, statistic.computed_at)
+        if response is not None:
+            return response
+
+        serializer = ApartmentPriceStatisticSerializer(statistic)
+        return Response(
+            serializer.data,
+            status=status.HTTP_200_OK,
+            headers=get_validator_headers(etag, statistic.computed_at)
+        )
@@ -1,18 +1,31 @@
 """This module defines class ApartmentSearch"""
-from django.utils import timezone
+from django.conf import settings
 from django.db.models import F
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 from amenity.models import Amenity
 from apartment.models import Apartment
-from apartment.serializers import ApartmentSerializer, ApartmentSearchSerializer
+from school.models import School
+from apartment.serializers import (
+    ApartmentSerializer,
+    ApartmentSearchSerializer,
+    ApartmentCardSerializer,
+    APARTMENT_CARD_COLUMNS,
+    APARTMENT_NESTED_FIELDS,
+    get_card_columns
+)
 from apartment.utils import (
     paginate_queryset,
     get_page_and_size,
-    get_prev_and_next_page
+    get_prev_and_next_page,
+    get_sparse_fields
 )
+from apartment.search_index import get_search_index, get_apartments_in_order
+from apartment.full_text_search import search_apartments
+from apartment.geo import filter_near
+from apartment.facets import get_requested_facets, get_facets
 
 
 class ApartmentSearchView(APIView):
@@ -22,90 +35,80 @@ class ApartmentSearchView(APIView):
     """
     serializer_class = ApartmentSearchSerializer
 
-    @extend_schema(
-        responses={200: ApartmentSerializer}
-    )
-    def get(self, request):
+    def get_location(self, search):
         """
-        This method returns apartments that matches the search query
-        entered by the user.
+        This method returns the latitude, longitude and radius in kilometres of
+        the circle apartments are searched in, or None if no location is searched.
+        The centre is the near parameter, or the school if a radius is given
+        without near. It raises ValueError if the parameters are not valid.
         """
         # pylint: disable=no-member
 
-        # serializer = ApartmentSearchSerializer(data=request.data)
-        # serializer.is_valid(raise_exception=True)
-        # validated_data = serializer.validated_data
-
-        all_params = request.GET.dict()
-
-        # save all amenities from request to a list.
-        amenities = []
-        for key in all_params:
-            if key.startswith('amenities'):
-                amenities.append(all_params[key])
-
-        country = all_params.get('country')
-        state = all_params.get('state')
-        city = all_params.get('city')
-        school = all_params.get('school')
-        listing_type = all_params.get('listing_type')
-        max_price = all_params.get('max_price')
-        min_price = all_params.get('min_price')
-        available_for = all_params.get('available_for')
-        sort_type = all_params.get('sort_type')
-        min_floor_num = all_params.get('min_floor_num')
-        max_floor_num = all_params.get('max_floor_num')
-
-        apartments = Apartment.objects.filter(
-            is_taken=False,
-            approval_status='accepted',
-            advert_exp_time__gt=timezone.now()
-        )
-
-        if country is not None and country != "":
-            apartments = apartments.filter(country=country)
-
-        if state is not None and state != "":
-            apartments = apartments.filter(state=state)
+        filters = search.validated_data
+        if 'near' not in filters and ('radius' not in filters or 'school' not in filters):
+            if 'radius' in filters:
+                raise ValueError('The parameter "radius" requires "near" or "school".')
+            return None
 
-        if city is not None and city != "":
-            apartments = apartments.filter(city=city)
+        radius = filters.get('radius', getattr(settings, 'APARTMENT_SEARCH_DEFAULT_RADIUS', 5))
+        if 'near' in filters:
+            return (*filters['near'], radius)
 
-        if school is not None and school != "":
-            apartments = apartments.filter(school=school)
+        if len(filters['school']) > 1:
+            raise ValueError('The parameter "radius" requires "near" or a single "school".')
+        coordinates = School.objects.filter(
+            pk=filters['school'][0]
+        ).values('latitude', 'longitude').first()
+        if coordinates is None:
+            raise ValueError('School not found.')
+        if coordinates['latitude'] is None or coordinates['longitude'] is None:
+            raise ValueError('The location of this school is not known.')
+        return coordinates['latitude'], coordinates['longitude'], radius
 
-        if listing_type is not None and listing_type != "":
-            apartments = apartments.filter(listing_type=listing_type)
-
-        if available_for is not None and available_for != "":
-            apartments = apartments.filter(available_for=available_for)
+    def filter_apartments(self, search, location=None):
+        """
+        This method returns the queryset of the active apartments that match the
+        validated search, filtered with the single condition compiled by the
+        search serializer, in the requested order. If location is given, only the
+        apartments within the radius around it are returned, with their distance
+        in kilometres, nearest first unless sort_type is given.
+        """
+        # pylint: disable=no-member
 
-        if min_price is not None and min_price != "" and max_price is not None and max_price != "":
-            apartments = apartments.filter(price__range=(min_price, max_price))
-        elif (min_price is None or min_price == "") and max_price is not None and max_price != "":
-            apartments = apartments.filter(price__lte=max_price)
-        elif min_price is not None and min_price != "" and (max_price is None or max_price == ""):
-            apartments = apartments.filter(price__gte=min_price)
+        sort_type = search.validated_data.get('sort_type')
+        query = search.validated_data.get('q', '').strip()
 
-        if min_floor_num is not None and min_floor_num != "" \
-            and max_floor_num is not None and max_floor_num != "":
-            apartments = apartments.filter(floor_number__range=(min_floor_num, max_floor_num))
-        elif (min_floor_num is None or min_floor_num == "") \
-            and max_floor_num is not None and max_floor_num != "":
-            apartments = apartments.filter(floor_number__lte=max_floor_num)
-        elif min_floor_num is not None and min_floor_num != "" \
-            and (max_floor_num is None or max_floor_num == ""):
-            apartments = apartments.filter(floor_number__gte=min_floor_num)
+        apartments = Apartment.objects.filter(search.get_filter(location))
 
-        if amenities:
-            apartments = apartments.filter(amenities__name__in=amenities).distinct()
+        # Apartments near the school are searched instead of the apartments
+        # linked to it when a radius is given without near.
+        if location is not None:
+            apartments = filter_near(apartments, *location)
 
-            for amenity_name in amenities:
-                apartments = apartments.filter(amenities__name=amenity_name)
+        # Search the title, description, address and nearest bus stop with the
+        # full-text index of the database.
+        if query != '':
+            apartments = search_apartments(apartments, query)
 
-        # Order the apartments queryset by inverse of created_at
-        if sort_type is None or sort_type == '':
+        # Order the apartments queryset by inverse of created_at, by distance to
+        # the searched location or by relevance to the full-text search.
+        if sort_type == 'distance' and location is None:
+            raise ValueError('The sort type "distance" requires "near" or "school" and "radius".')
+        if sort_type == 'distance' or ((sort_type is None or sort_type == '') \
+            and location is not None):
+            apartments = apartments.order_by('distance', '-created_at')
+        elif (sort_type is None or sort_type == '') and query != '':
+            apartments = apartments.order_by('-relevance', '-created_at')
+        elif sort_type is None or sort_type == '':
             apartments = apartments.order_by('-created_at')
+        elif sort_type in ('price_per_month', '-price_per_month'):
+            # Apartments whose price per month is not backfilled yet are last.
+            price_per_month = F('price_per_month').asc(nulls_last=True) \
+                if sort_type == 'price_per_month' else F('price_per_month').desc(nulls_last=True)
+            apartments = apartments.order_by(price_per_month, '-created_at')
+        elif sort_type == 'popular':
+            # Most liked apartments first, using the like_count index.
+            apartments = apartments.order_by('-like_count', '-created_at')
         elif sort_type in ('bedroom'):
             bedroom = Amenity.objects.get(name='bedroom')
 
@@ -131,15 +134,108 @@ class ApartmentSearchView(APIView):
         else:
             apartments = apartments.order_by(sort_type)
 
+        return apartments
+
+    @extend_schema(
+        parameters=[
+            ApartmentSearchSerializer,
+            OpenApiParameter(
+                name='facets',
+                location=OpenApiParameter.QUERY,
+                description='Comma separated facets to count for the search, from listing_type, '
+                            'available_for, price, amenities and city. The apartments are '
+                            'returned in "apartments" and the counts in "facets"',
+                required=False,
+                type=str
+            ),
+            OpenApiParameter(
+                name='fields',
+                location=OpenApiParameter.QUERY,
+                description='Comma separated fields to return',
+                required=False,
+                type=str
+            ),
+            OpenApiParameter(
+                name='expand',
+                location=OpenApiParameter.QUERY,
+                description='Comma separated nested fields to return in full when fields is given',
+                required=False,
+                type=str
+            )
+        ],
+        responses={200: ApartmentSerializer}
+    )
+    def get(self, request):
+        """
+        This method returns apartments that matches the search query
+        entered by the user.
+        """
+        # pylint: disable=no-member
+
+        # Validate the filters in the query string of the request.
+        search = ApartmentSearchSerializer(data=request.query_params)
+        search.is_valid(raise_exception=True)
+        filters = search.validated_data
+
+        # Get the fields to return and the nested fields to expand.
+        try:
+            fields, expand = get_sparse_fields(
+                request, APARTMENT_CARD_COLUMNS, APARTMENT_NESTED_FIELDS
+            )
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        columns = get_card_columns(fields, expand)
+
+        try:
+            location = self.get_location(search)
+            facets = get_requested_facets(request)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Search the in-process index if it is enabled and can evaluate the
+        # filters. It returns the ordered ids of the matching apartments, and
+        # only the apartments that are returned are read from the database.
+        search_index = get_search_index()
+        apartment_ids = search_index.search(filters) if search_index is not None else None
+
+        if apartment_ids is None:
+            try:
+                apartments = self.filter_apartments(search, location).values(*columns)
+            except ValueError as exc:
+                return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            apartments = apartment_ids
+
         # Get the values of page and page_size from query string of the request.
         try:
             page, page_size = get_page_and_size(request)
         except ValueError as exc:
             return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
+        # Count the apartments of each value of the requested facets.
+        facet_counts = None
+        if facets is not None:
+            facet_counts = get_facets(
+                filters,
+                facets,
+                lambda: self.filter_apartments(search, location),
+                search_index
+            )
+
         # Return all apartments without pagination if page and page size were not provided.
         if page is None and page_size is None:
-            serializer = ApartmentSerializer(apartments, many=True, context={'request': request})
+            if apartment_ids is not None:
+                apartments = get_apartments_in_order(apartment_ids, columns)
+            serializer = ApartmentCardSerializer(
+                apartments, many=True, context={'request': request},
+                fields=fields, expand=expand
+            )
+            if facet_counts is not None:
+                return Response(
+                    {'apartments': serializer.data, 'facets': facet_counts},
+                    status=status.HTTP_200_OK
+                )
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         # Get paginated queryset from the apartments queryset
@@ -151,7 +247,12 @@ class ApartmentSearchView(APIView):
             return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
         # serialize paginated queyset.
-        serializer = ApartmentSerializer(paginated_data, many=True, context={'request': request})
+        page_apartments = paginated_data if apartment_ids is None \
+            else get_apartments_in_order(list(paginated_data), columns)
+        serializer = ApartmentCardSerializer(
+            page_apartments, many=True, context={'request': request},
+            fields=fields, expand=expand
+        )
 
         # Get values of previous and next pages.
         previous_page, next_page = get_prev_and_next_page(
@@ -163,12 +264,14 @@ class ApartmentSearchView(APIView):
         )
 
         data = {
-            'total_number_of_apartments': len(apartments),
+            'total_number_of_apartments': paginated_data.paginator.count,
             'total_pages': total_pages,
             'previous_page': previous_page,
             'current_page': page,
             'next_page': next_page,
             'apartments': serializer.data
         }
+        if facet_counts is not None:
+            data['facets'] = facet_counts
 
         return Response(data, status=status.HTTP_200_OK)
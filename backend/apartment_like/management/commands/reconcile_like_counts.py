@@ -0,0 +1,39 @@
+"""This module defines the reconcile_like_counts command."""
+from django.core.management.base import BaseCommand
+from apartment_like.utils import reconcile_like_counts
+
+
+class Command(BaseCommand):
+    """
+    This class defines a command that recomputes like_count of the apartments
+    from their likes in batches. It is meant to be run periodically.
+    """
+    help = 'Recomputes like_count of the apartments from apartment_likes in bounded batches.'
+
+    def add_arguments(self, parser):
+        """This method defines the arguments accepted by the command."""
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of apartments checked in each batch.'
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            default=None,
+            help='Stop after this number of batches.'
+        )
+
+    def handle(self, *args, **options):
+        """This method recomputes the counts and reports the progress."""
+        def progress(batch_number, corrected):
+            self.stdout.write(f'Batch {batch_number}: corrected {corrected} apartments.')
+
+        total_corrected = reconcile_like_counts(
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            progress=progress
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'Corrected {total_corrected} like counts.'))
@@ -1,6 +1,7 @@
 """This module defines class ApartmentLike."""
 from uuid import uuid4
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.contrib.auth import get_user_model
 from apartment.models import Apartment
 
@@ -20,10 +21,41 @@ class ApartmentLike(models.Model):
         """
         db_table: Name of the table this class creates in the database.
         ordering: The order the instances of this model is displayed on the admin page.
+        indexes: Index used to list the apartments liked by a user, newest like first.
         """
         db_table = 'apartment_likes'
         unique_together = ('user', 'apartment') # Ensures a user can only like an apartment once
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'])
+        ]
+
+    def save(self, *args, **kwargs):
+        """This method saves the like and adds it to like_count of the apartment."""
+        # pylint: disable=no-member
+
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+            if adding:
+                Apartment.objects.filter(pk=self.apartment_id).update(
+                    like_count=F('like_count') + 1
+                )
+
+    def delete(self, *args, **kwargs):
+        """This method deletes the like and removes it from like_count of the apartment."""
+        # pylint: disable=no-member
+
+        with transaction.atomic():
+            deleted = super().delete(*args, **kwargs)
+
+            if deleted[0]:
+                Apartment.objects.filter(pk=self.apartment_id, like_count__gt=0).update(
+                    like_count=F('like_count') - 1
+                )
+
+        return deleted
 
     def __str__(self):
         """This method returns a string representation of the instance of this class."""
@@ -16,3 +16,14 @@ class ApartmentLikeSerializer(serializers.ModelSerializer):
         """
         model = ApartmentLike
         fields = ['id', 'user', 'apartment']
+
+
+class ApartmentLikeStatusSerializer(serializers.Serializer):
+    """
+    This class defines the data returned after an apartment is liked or unliked.
+    """
+    # pylint: disable=abstract-method
+
+    apartment = serializers.CharField()
+    liked = serializers.BooleanField()
+    like_count = serializers.IntegerField()
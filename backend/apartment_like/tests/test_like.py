@@ -0,0 +1,204 @@
+"""This module defines class LikeTest"""
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from country.models import Country
+from state.models import State
+from city.models import City
+from apartment.models import Apartment
+from apartment_like.models import ApartmentLike
+
+
+User = get_user_model()
+
+class LikeTest(TestCase):
+    """This class defines methods that tests like_count and the Like view."""
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        # pylint: disable=no-member
+
+        self.users = [
+            User.objects.create_user(
+                username=f'user{i}',
+                email=f'user{i}@gmail.com',
+                password='password'
+            )
+            for i in range(0, 3)
+        ]
+
+        country = Country.objects.create(name='Nigeria')
+        state = State.objects.create(name='Lagos', country=country)
+        city = City.objects.create(name='Ikeja', state=state)
+        self.apartments = [
+            Apartment.objects.create(
+                user=self.users[0],
+                country=country,
+                state=state,
+                city=city,
+                title=f'Flat {i}',
+                nearest_bus_stop='Allen',
+                price=100000,
+                listing_type='flat',
+                available_for='rent',
+                price_duration='year',
+                approval_status='accepted',
+                advert_exp_time=timezone.now() + timedelta(days=10)
+            )
+            for i in range(0, 3)
+        ]
+
+    def get_like_count(self, apartment):
+        """This method returns the like_count of the apartment saved in the database."""
+        return Apartment.objects.get(pk=apartment.pk).like_count
+
+    def login(self, user):
+        """This method logs the user in and returns the authorization header."""
+        response = self.client.post(
+            path=reverse('login_user'),
+            data={
+                'username': user.username,
+                'password': 'password'
+            },
+            content_type='application/json'
+        )
+        return {'Authorization': f'Bearer {response.json().get("access")}'}
+
+    def test_like_and_unlike(self):
+        """
+        This method tests that liking and unliking an apartment updates like_count,
+        and that repeating either has no effect.
+        """
+        apartment = self.apartments[0]
+        path = reverse('like_apartment', args=[apartment.id])
+        headers = self.login(self.users[1])
+
+        for _ in range(0, 2):
+            response = self.client.post(path=path, headers=headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                response.json(),
+                {'apartment': str(apartment.id), 'liked': True, 'like_count': 1}
+            )
+        self.assertEqual(self.get_like_count(apartment), 1)
+
+        # Saving an apartment read before the like does not overwrite like_count.
+        apartment.title = 'New title'
+        apartment.save()
+        self.assertEqual(self.get_like_count(apartment), 1)
+
+        for _ in range(0, 2):
+            response = self.client.delete(path=path, headers=headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                response.json(),
+                {'apartment': str(apartment.id), 'liked': False, 'like_count': 0}
+            )
+        self.assertEqual(self.get_like_count(apartment), 0)
+
+        for method in (self.client.post, self.client.delete):
+            response = method(path=reverse('like_apartment', args=['unknown']), headers=headers)
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_like_increments_count(self):
+        """
+        This method tests that a like increases like_count without counting the
+        likes of the apartment, and only when the like is saved.
+        """
+        # pylint: disable=no-member
+
+        apartment = self.apartments[0]
+        Apartment.objects.filter(pk=apartment.pk).update(like_count=5)
+        path = reverse('like_apartment', args=[apartment.id])
+        headers = self.login(self.users[1])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(path=path, headers=headers)
+        self.assertEqual(response.json()['like_count'], 6)
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries.captured_queries))
+
+        response = self.client.post(path=path, headers=headers)
+        self.assertEqual(response.json()['like_count'], 6)
+
+    def test_liked_apartments(self):
+        """
+        This method tests that the apartments liked by the user are returned in
+        pages, the most recently liked first.
+        """
+        headers = self.login(self.users[1])
+        for apartment in (self.apartments[2], self.apartments[0], self.apartments[1]):
+            self.client.post(path=reverse('like_apartment', args=[apartment.id]), headers=headers)
+
+        # Apartments liked by other users are not returned.
+        self.client.post(
+            path=reverse('like_apartment', args=[self.apartments[2].id]),
+            headers=self.login(self.users[2])
+        )
+
+        response = self.client.get(
+            path=reverse('get_liked_apartments'),
+            data={'page': 1, 'size': 2, 'fields': 'title,liked'},
+            headers=headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['total_number_of_apartments'], 3)
+        self.assertEqual(
+            response.json()['apartments'],
+            [{'title': 'Flat 1', 'liked': True}, {'title': 'Flat 0', 'liked': True}]
+        )
+
+        response = self.client.get(path=reverse('get_liked_apartments'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_reconcile_like_counts(self):
+        """This method tests that the command corrects counts that drifted."""
+        # pylint: disable=no-member
+
+        for user in self.users:
+            ApartmentLike.objects.create(user=user, apartment=self.apartments[1])
+
+        # Bulk deletes do not update like_count.
+        ApartmentLike.objects.filter(user=self.users[2]).delete()
+        Apartment.objects.filter(pk=self.apartments[2].pk).update(like_count=5)
+
+        out = StringIO()
+        call_command('reconcile_like_counts', batch_size=2, stdout=out)
+
+        self.assertEqual(
+            [self.get_like_count(apartment) for apartment in self.apartments],
+            [0, 2, 0]
+        )
+        self.assertIn('Batch 2: corrected', out.getvalue())
+        self.assertIn('Corrected 2 like counts.', out.getvalue())
+
+    def test_sort_by_popularity(self):
+        """This method tests that search returns the most liked apartments first."""
+        # pylint: disable=no-member
+
+        for user in self.users:
+            ApartmentLike.objects.create(user=user, apartment=self.apartments[1])
+        ApartmentLike.objects.create(user=self.users[0], apartment=self.apartments[2])
+
+        response = self.client.get(
+            path=reverse('search_apartments'),
+            data={'sort_type': 'popular'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [apartment['title'] for apartment in response.json()],
+            ['Flat 1', 'Flat 2', 'Flat 0']
+        )
+        self.assertEqual(
+            [apartment['like_count'] for apartment in response.json()],
+            [3, 1, 0]
+        )
@@ -0,0 +1,11 @@
+"""This module defines the endpoints related with the apartment_like app."""
+from django.urls import path
+from apartment_like.views.like import Like
+from apartment_like.views.get_liked_apartments import GetLikedApartmentsView
+
+
+urlpatterns = [
+    path('api/apartments/liked', GetLikedApartmentsView.as_view(),
+         name='get_liked_apartments'),
+    path('api/apartments/<str:apartment_id>/like', Like.as_view(), name='like_apartment'),
+]
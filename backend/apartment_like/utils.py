@@ -0,0 +1,112 @@
+"""This module defines functions used by the apartment_like app."""
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from apartment.models import Apartment
+from apartment.search_index import refresh_search_index
+from apartment_like.models import ApartmentLike
+
+
+def get_like_count_subquery():
+    """This function returns an expression counting the likes of the outer apartment."""
+    # pylint: disable=no-member
+
+    return Coalesce(
+        Subquery(
+            ApartmentLike.objects.filter(
+                apartment=OuterRef('pk')
+            ).order_by().values('apartment').annotate(count=Count('pk')).values('count')
+        ),
+        0
+    )
+
+def like_apartment(user_id, apartment_id):
+    """
+    This function saves the like of the user for the apartment if it does not
+    exist yet, so liking twice has the same result as liking once. The row of
+    the apartment is locked first, so concurrent likes of the apartment cannot
+    both find that the like does not exist. like_count of the apartment is
+    increased by one if a like was saved. It returns the new like_count.
+    """
+    # pylint: disable=no-member
+
+    with transaction.atomic():
+        # The update of like_count locks the row anyway, this takes the lock
+        # before the like is looked up.
+        list(Apartment.objects.select_for_update().filter(pk=apartment_id).values_list('pk'))
+
+        _, created = ApartmentLike.objects.get_or_create(
+            user_id=user_id,
+            apartment_id=apartment_id
+        )
+
+        # ApartmentLike.save adds a new like to like_count.
+        if created:
+            refresh_search_index(apartment_id)
+
+    return Apartment.objects.filter(pk=apartment_id).values_list('like_count', flat=True).get()
+
+def unlike_apartment(user_id, apartment_id):
+    """
+    This function deletes the like of the user for the apartment by its key, so
+    unliking twice has the same result as unliking once. like_count of the
+    apartment is reduced if a like was deleted. It returns the new like_count.
+    """
+    # pylint: disable=no-member
+
+    with transaction.atomic():
+        deleted, _ = ApartmentLike.objects.filter(
+            user_id=user_id,
+            apartment_id=apartment_id
+        ).delete()
+
+        if deleted:
+            Apartment.objects.filter(pk=apartment_id, like_count__gt=0).update(
+                like_count=F('like_count') - 1
+            )
+            refresh_search_index(apartment_id)
+
+    return Apartment.objects.filter(pk=apartment_id).values_list('like_count', flat=True).get()
+
+def reconcile_like_counts(batch_size=1000, max_batches=None, progress=None):
+    """
+    This function recomputes like_count of the apartments from the apartment_likes
+    table in batches of apartments, and corrects the ones that differ. Counts can
+    drift when likes are deleted in bulk, for example when a user is deleted.
+    If given, progress is called with the batch number and the number of
+    apartments corrected in the batch.
+    It returns the total number of apartments corrected.
+    """
+    # pylint: disable=no-member
+
+    number_of_batches = 0
+    total_corrected = 0
+    last_id = None
+
+    while max_batches is None or number_of_batches < max_batches:
+        apartments = Apartment.objects.order_by('pk')
+        if last_id is not None:
+            apartments = apartments.filter(pk__gt=last_id)
+
+        apartment_ids = list(apartments.values_list('id', flat=True)[:batch_size])
+        if not apartment_ids:
+            break
+        last_id = apartment_ids[-1]
+
+        # Only the apartments whose count is wrong are written.
+        wrong_ids = list(
+            Apartment.objects.filter(pk__in=apartment_ids).annotate(
+                actual_like_count=get_like_count_subquery()
+            ).exclude(like_count=F('actual_like_count')).values_list('id', flat=True)
+        )
+        corrected = Apartment.objects.filter(pk__in=wrong_ids).update(
+            like_count=get_like_count_subquery()
+        ) if wrong_ids else 0
+
+        number_of_batches += 1
+        total_corrected += corrected
+
+        if progress is not None:
+            progress(number_of_batches, corrected)
+
+    return total_corrected
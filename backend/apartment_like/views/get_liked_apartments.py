@@ -0,0 +1,128 @@
+"""This module defines class GetLikedApartmentsView."""
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from apartment.models import Apartment
+from apartment.serializers import (
+    ApartmentSerializer,
+    ApartmentCardSerializer,
+    APARTMENT_CARD_COLUMNS,
+    APARTMENT_NESTED_FIELDS,
+    get_card_columns
+)
+from apartment.utils import (
+    paginate_queryset,
+    get_prev_and_next_page,
+    get_page_and_size,
+    get_sparse_fields
+)
+
+
+class GetLikedApartmentsView(APIView):
+    """This class defines a method that gets the apartments liked by the user."""
+
+    serializer_class = ApartmentSerializer
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name='page',
+                location=OpenApiParameter.QUERY,
+                description='Page number',
+                required=False,
+                type=int
+            ),
+            OpenApiParameter(
+                name='size',
+                location=OpenApiParameter.QUERY,
+                description='Number of items per page',
+                required=False,
+                type=int
+            ),
+            OpenApiParameter(
+                name='fields',
+                location=OpenApiParameter.QUERY,
+                description='Comma separated fields to return',
+                required=False,
+                type=str
+            ),
+            OpenApiParameter(
+                name='expand',
+                location=OpenApiParameter.QUERY,
+                description='Comma separated nested fields to return in full when fields is given',
+                required=False,
+                type=str
+            )
+        ]
+    )
+    def get(self, request):
+        """
+        This method gets a page of the active apartment adverts liked by the user,
+        the most recently liked first.\n
+        Returns:\n
+            On success: A http status code of 200 and data of the apartments.\n
+            On failure: An error message with a corresponding http status code.
+        """
+        # pylint: disable=no-member
+
+        # Get the fields to return and the nested fields to expand.
+        try:
+            fields, expand = get_sparse_fields(
+                request, APARTMENT_CARD_COLUMNS, APARTMENT_NESTED_FIELDS
+            )
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Get the values of page and page_size from query string of the request.
+        # The first page is returned if neither was provided.
+        try:
+            page, page_size = get_page_and_size(request)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if page is None and page_size is None:
+            page, page_size = 1, 4
+
+        # Join the apartments to the likes of the user, which are read with
+        # the (user, created_at) index of apartment_likes.
+        apartments = Apartment.objects.filter(
+            apartment_likes__user_id=request.user.id,
+            is_active_listing=True
+        ).order_by('-apartment_likes__created_at').values(*get_card_columns(fields, expand))
+
+        # Get paginated queryset from the apartments queryset
+        try:
+            paginated_data, total_pages = paginate_queryset(apartments, page, page_size)
+        except ValueError as exc:
+            if str(exc).lower() == 'page not found.':
+                return Response({'error': str(exc)}, status=status.HTTP_404_NOT_FOUND)
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # serialize paginated queyset.
+        serializer = ApartmentCardSerializer(
+            paginated_data, many=True, context={'request': request},
+            fields=fields, expand=expand
+        )
+
+        # Get values of previous and next pages.
+        previous_page, next_page = get_prev_and_next_page(
+            request,
+            page,
+            page_size,
+            total_pages,
+            url_name='get_liked_apartments'
+        )
+
+        data = {
+            'total_number_of_apartments': paginated_data.paginator.count,
+            'total_pages': total_pages,
+            'previous_page': previous_page,
+            'current_page': page,
+            'next_page': next_page,
+            'apartments': serializer.data
+        }
+
+        return Response(data, status=status.HTTP_200_OK)
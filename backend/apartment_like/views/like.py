@@ -2,50 +2,67 @@
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.permissions import IsAuthenticated
 from drf_spectacular.utils import extend_schema
-from apartment_like.models import ApartmentLike
-from apartment_like.serializers import ApartmentLikeSerializer
+from apartment.models import Apartment
+from apartment_like.serializers import ApartmentLikeStatusSerializer
+from apartment_like.utils import like_apartment, unlike_apartment
 
 
 class Like(APIView):
     """
-        This class defines methods that gets, creates, updates and deletes like objects
-        from the database.
+        This class defines methods that likes and unlikes an apartment. Both
+        are idempotent, so repeated requests return the same result.
     """
-    serializer_class = ApartmentLikeSerializer
-    permission_classes = [IsAuthenticatedOrReadOnly]
+    serializer_class = ApartmentLikeStatusSerializer
+    permission_classes = [IsAuthenticated]
 
     @extend_schema(
-        request=ApartmentLikeSerializer,
-        responses={201: ApartmentLikeSerializer}
+        request=None,
+        responses={200: ApartmentLikeStatusSerializer}
     )
     def post(self, request, apartment_id):
         """
-        This method creates and saves apartment like reaction in the database.\n
+        This method saves the like of the user for the apartment if the user has not
+        liked it yet.\n
         Returns:\n
-            On success: A http status code of 201 and id of the user and apartment.\n
+            On success: A http status code of 200, the id and like count of the apartment.\n
             On failure: An error message with a corresponding http status code.
         """
         # pylint: disable=no-member
-        user = request.user
 
-        # Validate data in request body and return error messages if exception is raised.
-        serializer = ApartmentLikeSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        if not Apartment.objects.filter(pk=apartment_id, is_active_listing=True).exists():
+            return Response({'error': 'Apartment not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        # Get the value of each field from validated data
-        validated_data = serializer.validated_data
+        like_count = like_apartment(request.user.id, apartment_id)
 
-        apartment = validated_data.get('apartment')
+        serializer = ApartmentLikeStatusSerializer({
+            'apartment': apartment_id,
+            'liked': True,
+            'like_count': like_count
+        })
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
-        # Create and save apartment like reaction in the database.
-        apartment = ApartmentLike.objects.create(
-            user=user,
-            apartment=apartment_id,
-        )
+    @extend_schema(
+        responses={200: ApartmentLikeStatusSerializer}
+    )
+    def delete(self, request, apartment_id):
+        """
+        This method deletes the like of the user for the apartment if it exists.\n
+        Returns:\n
+            On success: A http status code of 200, the id and like count of the apartment.\n
+            On failure: An error message with a corresponding http status code.
+        """
+        # pylint: disable=no-member
+
+        try:
+            like_count = unlike_apartment(request.user.id, apartment_id)
+        except Apartment.DoesNotExist:
+            return Response({'error': 'Apartment not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        # serialize apartment like reaction object and return a response
-        # that includes the serialized data.
-        serializer = ApartmentLikeSerializer(apartment)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        serializer = ApartmentLikeStatusSerializer({
+            'apartment': apartment_id,
+            'liked': False,
+            'like_count': like_count
+        })
+        return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,43 @@
+"""This module defines class FastJSONRenderer"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    This class renders responses to JSON with orjson if it is installed, and with
+    the json module used by JSONRenderer if it is not. UUIDs are rendered as
+    strings, datetimes with isoformat, keeping their microseconds, with UTC
+    datetimes ending with Z, and Decimals as numbers, as the encoder of
+    JSONRenderer renders them. Values orjson does not support are passed to
+    that encoder. orjson renders NaN and infinity as null where JSONRenderer
+    raises an exception, so the output only matches JSONRenderer for finite
+    numbers.
+    """
+
+    # Options of orjson.dumps. Dictionaries with keys that are not strings are
+    # allowed as the json module allows them.
+    options = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        This method renders data to JSON. Indented JSON, as requested by the browsable
+        API, is rendered by JSONRenderer.
+        """
+        if orjson is None or data is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+
+        # Escape \u2028 and \u2029 as JSONRenderer does, so that the JSON
+        # is valid javascript.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,74 @@
+"""This module defines class FastJSONRendererTest"""
+from io import BytesIO
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+from uuid import uuid4
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from apartment_search_app.parsers import FastJSONParser
+from apartment_search_app.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    """This class defines methods that tests FastJSONRenderer and FastJSONParser."""
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        self.data = {
+            'id': uuid4(),
+            'created_at': datetime(2024, 5, 1, 10, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            'local_time': datetime(2024, 5, 1, 11, 30, tzinfo=dt_timezone(timedelta(hours=1))),
+            'naive_time': datetime(2024, 5, 1, 10, 30),
+            'date': date(2024, 5, 1),
+            'duration': timedelta(days=1),
+            'price': Decimal('1500.50'),
+            'message': gettext_lazy('Apartment not found.'),
+            'title': 'Chambre à louer   \U0001f3e0',
+            'counts': {1: 2},
+            'images': [{'id': 1, 'image': None}, {'id': 2, 'image': 'a.jpg'}],
+            'liked': False
+        }
+
+    def test_same_bytes_as_json_renderer(self):
+        """This method tests that both renderers return the same bytes."""
+        self.assertEqual(
+            FastJSONRenderer().render(self.data),
+            JSONRenderer().render(self.data)
+        )
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+        # Indented JSON is rendered by JSONRenderer.
+        self.assertEqual(
+            FastJSONRenderer().render(self.data, 'application/json; indent=4'),
+            JSONRenderer().render(self.data, 'application/json; indent=4')
+        )
+
+    def test_parser(self):
+        """This method tests that the parser returns the same data as JSONParser."""
+        body = JSONRenderer().render(self.data)
+        self.assertEqual(
+            FastJSONParser().parse(BytesIO(body)),
+            JSONParser().parse(BytesIO(body))
+        )
+
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"title": '))
+
+    def test_without_orjson(self):
+        """This method tests that the json module is used if orjson is not installed."""
+        body = JSONRenderer().render(self.data)
+
+        with mock.patch('apartment_search_app.renderers.orjson', None), \
+                mock.patch('apartment_search_app.parsers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.data), body)
+            self.assertEqual(
+                FastJSONParser().parse(BytesIO(body)),
+                JSONParser().parse(BytesIO(body))
+            )
@@ -29,6 +29,9 @@ urlpatterns = [
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/schema/docs/', SpectacularSwaggerView.as_view(url_name='schema')),
     path('', include('user.urls')),
+    # apartment_like.urls is included first, so api/apartments/liked is not
+    # matched by the apartment detail endpoint.
+    path('', include('apartment_like.urls')),
     path('', include('apartment.urls')),
     path('', include('message.urls')),
     path('', include('country.urls')),
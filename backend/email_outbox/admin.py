@@ -0,0 +1,6 @@
+"""This module defines class OutboxEmailAdmin"""
+from django.contrib import admin
+from email_outbox.models import OutboxEmail
+
+
+admin.site.register(OutboxEmail)
@@ -0,0 +1,74 @@
+"""This module defines the send_outbox_emails command."""
+import time
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from email_outbox.utils import send_outbox_batch
+
+
+class Command(BaseCommand):
+    """
+    This class defines a command that sends the pending emails in the outbox
+    in batches, reusing one email connection for each batch.
+    """
+    help = 'Sends pending emails from the outbox in batches with retries.'
+
+    def add_arguments(self, parser):
+        """This method defines the arguments accepted by the command."""
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of emails sent over one connection.'
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            default=None,
+            help='Stop after this number of batches.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling the outbox instead of stopping when it is empty.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds to wait before polling an empty outbox again in loop mode.'
+        )
+
+    def handle(self, *args, **options):
+        """This method sends the emails and reports the progress."""
+        # pylint: disable=broad-exception-caught
+
+        batch_size = options['batch_size']
+        max_batches = options['max_batches']
+        connection = get_connection()
+
+        number_of_batches = 0
+        total_sent = 0
+        total_failed = 0
+        while max_batches is None or number_of_batches < max_batches:
+            try:
+                sent, failed = send_outbox_batch(batch_size, connection=connection)
+            except Exception as exc:
+                # The email server could not be reached, the batch is left pending.
+                self.stderr.write(f'Failed to send batch: {exc}')
+                sent, failed = 0, 0
+                if not options['loop']:
+                    break
+
+            if sent or failed:
+                number_of_batches += 1
+                total_sent += sent
+                total_failed += failed
+                self.stdout.write(f'Batch {number_of_batches}: sent {sent}, failed {failed}.')
+            elif options['loop']:
+                time.sleep(options['interval'])
+            else:
+                break
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Sent {total_sent} emails, {total_failed} attempts failed.')
+        )
@@ -0,0 +1,48 @@
+"""This module defines class OutboxEmail"""
+from uuid import uuid4
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxEmail(models.Model):
+    """
+    This class defines the fields of the email_outbox table. Emails are added
+    to the table in the transaction of the request and sent by the
+    send_outbox_emails command.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed')
+    ]
+
+    id = models.CharField(default=uuid4, max_length=36,
+                          unique=True, primary_key=True, editable=False)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True, default='')
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField()
+    status = models.CharField(max_length=7, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """
+        db_table: Name of the table this class creates in the database.
+        ordering: The order the instances of this model is displayed on the admin page.
+        indexes: Index used by the worker to find emails that are due to be sent.
+        """
+        db_table = 'email_outbox'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'])
+        ]
+
+    def __str__(self):
+        """This method returns a string representation of the instance of this class."""
+        return f'{self.subject} -- {", ".join(self.to)} -- {self.status}'
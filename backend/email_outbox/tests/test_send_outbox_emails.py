@@ -0,0 +1,126 @@
+"""This module defines class SendOutboxEmailsTest"""
+from io import StringIO
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from email_outbox.models import OutboxEmail
+from email_outbox.utils import enqueue_email, send_outbox_batch
+
+
+class CountingEmailBackend(EmailBackend):
+    """
+    This class defines a locmem email backend that counts the connections
+    it opens and fails to send emails to recipients at fail.example.com.
+    """
+    opened = 0
+
+    def open(self):
+        """This method counts the connections opened."""
+        CountingEmailBackend.opened += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        """This method raises an error for recipients at fail.example.com."""
+        for message in messages:
+            if any(to.endswith('@fail.example.com') for to in message.to):
+                raise ConnectionError('Recipient refused.')
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2, EMAIL_OUTBOX_RETRY_DELAY=60)
+class SendOutboxEmailsTest(TestCase):
+    """This class defines methods that tests the email outbox and its worker."""
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        CountingEmailBackend.opened = 0
+
+    def enqueue(self, to):
+        """This method adds an email to the given recipient to the outbox."""
+        return enqueue_email(
+            subject='FindAccommodation OTP',
+            body='Your OTP: 123456',
+            html_body='<p>Your OTP: 123456</p>',
+            from_email='findaccommodation.online@gmail.com',
+            to=[to]
+        )
+
+    def test_send_batch_over_one_connection(self):
+        """
+        This method tests that pending emails are sent with their html
+        alternative over a single connection.
+        """
+        # pylint: disable=no-member
+
+        for i in range(0, 3):
+            self.enqueue(f'user{i}@example.com')
+
+        sent, failed = send_outbox_batch(connection=CountingEmailBackend())
+
+        self.assertEqual((sent, failed), (3, 0))
+        self.assertEqual(CountingEmailBackend.opened, 1)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].alternatives[0][1], 'text/html')
+        self.assertEqual(OutboxEmail.objects.filter(status='sent').count(), 3)
+
+        # Sent emails are not sent again.
+        self.assertEqual(send_outbox_batch(connection=CountingEmailBackend()), (0, 0))
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_retry_with_backoff(self):
+        """
+        This method tests that a failed email is retried after a delay
+        and marked as failed after the maximum number of attempts.
+        """
+        # pylint: disable=no-member
+
+        email = self.enqueue('user@fail.example.com')
+        self.enqueue('user@example.com')
+
+        sent, failed = send_outbox_batch(connection=CountingEmailBackend())
+        self.assertEqual((sent, failed), (1, 1))
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'pending')
+        self.assertEqual(email.attempts, 1)
+        self.assertEqual(email.last_error, 'Recipient refused.')
+        self.assertGreater(email.next_attempt_at, timezone.now())
+
+        # The email is not due yet.
+        self.assertEqual(send_outbox_batch(connection=CountingEmailBackend()), (0, 0))
+
+        email.next_attempt_at = timezone.now()
+        email.save()
+        send_outbox_batch(connection=CountingEmailBackend())
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'failed')
+        self.assertEqual(email.attempts, 2)
+
+    def test_enqueue_in_rolled_back_transaction(self):
+        """This method tests that an email is not queued if the transaction rolls back."""
+        # pylint: disable=no-member
+
+        with transaction.atomic():
+            self.enqueue('user@example.com')
+            transaction.set_rollback(True)
+
+        self.assertEqual(OutboxEmail.objects.count(), 0)
+
+    def test_send_outbox_emails_command(self):
+        """This method tests that the command sends the pending emails in batches."""
+        for i in range(0, 5):
+            self.enqueue(f'user{i}@example.com')
+
+        out = StringIO()
+        call_command('send_outbox_emails', batch_size=2, stdout=out)
+
+        self.assertIn('Batch 3: sent 1, failed 0.', out.getvalue())
+        self.assertIn('Sent 5 emails, 0 attempts failed.', out.getvalue())
+        self.assertEqual(len(mail.outbox), 5)
@@ -0,0 +1,118 @@
+"""This module defines the functions utilized in the email_outbox app."""
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+from email_outbox.models import OutboxEmail
+
+
+def enqueue_email(subject, body, to, from_email, html_body=''):
+    """
+    This function adds an email to the outbox. The email is saved in the
+    transaction of the caller, so it is only sent if the transaction commits.
+    It returns the OutboxEmail object.
+    """
+    # pylint: disable=no-member
+
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=body,
+        html_body=html_body,
+        from_email=from_email,
+        to=list(to)
+    )
+
+def get_retry_delay(attempts):
+    """
+    This function returns the time to wait before the next attempt at sending
+    an email that failed the given number of times. The delay doubles with
+    each attempt, starting from EMAIL_OUTBOX_RETRY_DELAY seconds and capped
+    at EMAIL_OUTBOX_MAX_RETRY_DELAY seconds.
+    """
+    base_delay = getattr(settings, 'EMAIL_OUTBOX_RETRY_DELAY', 30)
+    max_delay = getattr(settings, 'EMAIL_OUTBOX_MAX_RETRY_DELAY', 3600)
+    return timedelta(seconds=min(base_delay * 2 ** (attempts - 1), max_delay))
+
+def build_message(email, connection):
+    """This function returns the EmailMultiAlternatives message of an OutboxEmail object."""
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=email.to,
+        connection=connection
+    )
+
+    if email.html_body:
+        message.attach_alternative(email.html_body, 'text/html')
+
+    return message
+
+def send_outbox_batch(batch_size=100, connection=None):
+    """
+    This function sends the pending emails that are due over a single email
+    connection. Emails that fail are retried later with a growing delay and
+    marked as failed after EMAIL_OUTBOX_MAX_ATTEMPTS attempts.
+    Rows are locked while they are sent, and rows locked by another worker
+    are skipped on databases that support it.
+    It returns the number of emails sent and the number that failed.
+    """
+    # pylint: disable=no-member
+    # pylint: disable=broad-exception-caught
+
+    max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+    connection = connection or get_connection()
+    sent = 0
+    failed = 0
+
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True).filter(
+                status='pending',
+                next_attempt_at__lte=timezone.now()
+            ).order_by('next_attempt_at')[:batch_size]
+        )
+
+        if not emails:
+            return sent, failed
+
+        # Open the connection once for the whole batch.
+        connection.open()
+        try:
+            for email in emails:
+                email.attempts += 1
+
+                try:
+                    connection.send_messages([build_message(email, connection)])
+                except Exception as exc:
+                    failed += 1
+                    email.last_error = str(exc)
+
+                    if email.attempts >= max_attempts:
+                        email.status = 'failed'
+                    else:
+                        email.next_attempt_at = timezone.now() + get_retry_delay(email.attempts)
+                else:
+                    sent += 1
+                    email.status = 'sent'
+                    email.sent_at = timezone.now()
+                    email.last_error = ''
+
+                email.save(update_fields=[
+                    'attempts', 'status', 'next_attempt_at',
+                    'last_error', 'sent_at', 'updated_at'
+                ])
+
+                if email.status != 'sent':
+                    # Reopen the connection in case the server dropped it, and leave
+                    # the rest of the batch for a later run if the server is down.
+                    connection.close()
+                    try:
+                        connection.open()
+                    except Exception:
+                        break
+        finally:
+            connection.close()
+
+    return sent, failed
@@ -1,6 +1,7 @@
 """This module defines class MessageAdmin"""
 from django.contrib import admin
-from message.models import Message
+from message.models import Message, ArchivedMessage
 
 
 admin.site.register(Message)
+admin.site.register(ArchivedMessage)
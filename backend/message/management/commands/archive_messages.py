@@ -0,0 +1,61 @@
+"""This module defines the archive_messages command."""
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from message.utils import get_archive_cutoff, archive_message_batch
+
+
+class Command(BaseCommand):
+    """
+    This class defines a command that moves messages older than the hot window
+    from the messages table to the archived_messages table in batches.
+    """
+    help = 'Moves old messages to the archived_messages table in bounded transactions.'
+
+    def add_arguments(self, parser):
+        """This method defines the arguments accepted by the command."""
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Archive messages older than this number of days. '\
+                 'Defaults to MESSAGE_HOT_WINDOW_DAYS.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of messages moved in each transaction.'
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            default=None,
+            help='Stop after this number of batches.'
+        )
+
+    def handle(self, *args, **options):
+        """This method moves the messages and reports the progress."""
+        days = options['days']
+        batch_size = options['batch_size']
+        max_batches = options['max_batches']
+
+        if days is None:
+            cutoff = get_archive_cutoff()
+        else:
+            cutoff = timezone.now() - timedelta(days=days)
+
+        number_of_batches = 0
+        total_archived = 0
+        while max_batches is None or number_of_batches < max_batches:
+            archived = archive_message_batch(cutoff, batch_size)
+            if archived == 0:
+                break
+
+            number_of_batches += 1
+            total_archived += archived
+            self.stdout.write(f'Batch {number_of_batches}: archived {archived} messages.')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Archived {total_archived} messages created before {cutoff}.')
+        )
@@ -1,4 +1,4 @@
-"""This module defines class Message."""
+"""This module defines class Message and class ArchivedMessage."""
 from uuid import uuid4
 from django.db import models
 from django.contrib.auth import get_user_model
@@ -14,8 +14,11 @@ class Message(models.Model):
     receiver = models.ForeignKey(User, on_delete=models.CASCADE, related_name='received_messages')
     text = models.TextField(null=True, blank=True)
     image = models.ImageField(upload_to='message_images', null=True, blank=True)
-    parent_message = models.ForeignKey('self', related_name='replies',
-                                       null=True, blank=True, on_delete=models.CASCADE)
+    thumbnail = models.ImageField(upload_to='message_thumbnails', null=True, blank=True)
+    # The parent message can be moved to the archived_messages table before its
+    # replies, so no database constraint is enforced on this field.
+    parent_message = models.ForeignKey('self', related_name='replies', null=True, blank=True,
+                                       on_delete=models.DO_NOTHING, db_constraint=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -23,9 +26,53 @@ class Message(models.Model):
         """
         db_table: Name of the table this class creates in the database.
         ordering: The order the instances of this model is displayed on the admin page.
+        indexes: Indexes used by the inbox, the thread view and the archive_messages command.
         """
         db_table = 'messages'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['sender', 'receiver', '-created_at']),
+            models.Index(fields=['created_at']),
+        ]
+
+    def __str__(self):
+        """This method returns a string representation of the instance of this class."""
+        # pylint: disable=no-member
+        return f'message_id: {self.id} - sent by: {self.sender.username} '\
+               f'- sent to: {self.receiver.username}'
+
+
+class ArchivedMessage(models.Model):
+    """
+    This class defines the fields of the archived_messages table in the database.
+    Messages older than the hot window are moved here by the archive_messages command.
+    """
+    id = models.CharField(max_length=36, unique=True, primary_key=True, editable=False)
+    sender = models.ForeignKey(User, on_delete=models.CASCADE,
+                               related_name='archived_sent_messages')
+    receiver = models.ForeignKey(User, on_delete=models.CASCADE,
+                                 related_name='archived_received_messages')
+    text = models.TextField(null=True, blank=True)
+    image = models.ImageField(upload_to='message_images', null=True, blank=True)
+    thumbnail = models.ImageField(upload_to='message_thumbnails', null=True, blank=True)
+    # The parent message can be in either the messages or the archived_messages table.
+    parent_message = models.ForeignKey(Message, related_name='+', null=True, blank=True,
+                                       on_delete=models.DO_NOTHING, db_constraint=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """
+        db_table: Name of the table this class creates in the database.
+        ordering: The order the instances of this model is displayed on the admin page.
+        indexes: Indexes used by the inbox and the thread view.
+        """
+        db_table = 'archived_messages'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['sender', 'receiver', '-created_at']),
+        ]
 
     def __str__(self):
         """This method returns a string representation of the instance of this class."""
@@ -1,7 +1,8 @@
 """This module defines class MessageSerializer."""
+import os
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from user.utils import check_html_tags
+from user.utils import check_html_tags, resize_image, create_thumbnail
 from message.models import Message
 
 
@@ -20,6 +21,7 @@ class MessageSerializer(serializers.ModelSerializer):
         required=True,
         queryset=User.objects.prefetch_related('received_messages').all()
     )
+    thumbnail = serializers.ImageField(read_only=True)
 
     class Meta:
         """
@@ -28,7 +30,10 @@ class MessageSerializer(serializers.ModelSerializer):
                     to be validated
         """
         model = Message
-        fields = ['id', 'sender', 'receiver', 'text', 'image', 'parent_message', 'created_at']
+        fields = [
+            'id', 'sender', 'receiver', 'text', 'image', 'thumbnail',
+            'parent_message', 'created_at'
+        ]
 
     def validate(self, attrs):
         """
@@ -40,6 +45,10 @@ class MessageSerializer(serializers.ModelSerializer):
         if text is None and image is None:
             raise serializers.ValidationError('The field "text" or "image" is required.')
 
+        # Create a small thumbnail for the image to be used in chat views.
+        if image is not None:
+            attrs['thumbnail'] = create_thumbnail(image=image, size=200)
+
         return attrs
 
     def validate_text(self, text):
@@ -54,3 +63,24 @@ class MessageSerializer(serializers.ModelSerializer):
             )
 
         return validated_value
+
+    def validate_image(self, image):
+        """This method validates the image and converts it to a resized jpeg image."""
+        if image is None:
+            return image
+
+        allowed_mimetypes = ['image/jpeg', 'image/png', 'image/webp']
+
+        if image.content_type not in allowed_mimetypes:
+            raise serializers.ValidationError(
+                'Invalid mime type. Only image/jpeg, image/png or image/webp can be used.'
+            )
+
+        resized_image = resize_image(image=image, new_width=1024)
+
+        # The resized image is always saved in jpeg format.
+        image_name = os.path.splitext(os.path.basename(resized_image.name))[0]
+        resized_image.name = f'{image_name}.jpg'
+        resized_image.content_type = 'image/jpeg'
+
+        return resized_image
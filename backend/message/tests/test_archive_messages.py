@@ -0,0 +1,182 @@
+"""This module defines class ArchiveMessagesTest."""
+from datetime import timedelta
+from io import StringIO
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from message.models import Message, ArchivedMessage
+
+
+User = get_user_model()
+
+class ArchiveMessagesTest(TestCase):
+    """
+    This class defines methods that tests the archive_messages command and the
+    message views reading across the messages and archived_messages tables.
+    """
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        # Register three users
+        for username in ('test_user1', 'test_user2', 'test_user3'):
+            self.client.post(
+                path=reverse('register_user'),
+                data={
+                    'username': username,
+                    'email': f'{username}@gmail.com',
+                    'password': 'password'
+                },
+                content_type='application/json'
+            )
+
+        self.user1 = User.objects.get(username='test_user1')
+        self.user2 = User.objects.get(username='test_user2')
+        self.user3 = User.objects.get(username='test_user3')
+
+        # Create old and recent messages between user1 and user2.
+        # pylint: disable=no-member
+        now = timezone.now()
+        self.first_message = None
+        for i in range(6):
+            message = Message.objects.create(
+                sender=self.user1 if i % 2 == 0 else self.user2,
+                receiver=self.user2 if i % 2 == 0 else self.user1,
+                text=f'message {i}',
+                parent_message=self.first_message
+            )
+            if self.first_message is None:
+                self.first_message = message
+
+            days_ago = 400 - i if i < 4 else 5 - i
+            Message.objects.filter(pk=message.pk).update(
+                created_at=now - timedelta(days=days_ago)
+            )
+
+        # Create an old message between user1 and user3.
+        message = Message.objects.create(sender=self.user3, receiver=self.user1, text='hello')
+        Message.objects.filter(pk=message.pk).update(created_at=now - timedelta(days=500))
+
+    def login(self):
+        """This method logs in user1 and returns the authorization header."""
+        response = self.client.post(
+            path=reverse('login_user'),
+            data={
+                'username': 'test_user1',
+                'password': 'password'
+            },
+            content_type='application/json'
+        )
+        return {'Authorization': f'Bearer {response.json().get("access")}'}
+
+    def test_messages_are_archived_in_batches(self):
+        """This method tests that old messages are moved in batches of the given size."""
+        # pylint: disable=no-member
+        output = StringIO()
+        call_command('archive_messages', '--days=180', '--batch-size=2', stdout=output)
+
+        self.assertEqual(Message.objects.count(), 2)
+        self.assertEqual(ArchivedMessage.objects.count(), 5)
+        self.assertIn('Batch 3: archived 1 messages.', output.getvalue())
+        self.assertIn('Archived 5 messages', output.getvalue())
+
+        # Replies in the messages table keep the id of their archived parent message.
+        for message in Message.objects.all():
+            self.assertEqual(message.parent_message_id, str(self.first_message.id))
+
+    def test_max_batches(self):
+        """This method tests that the command stops after the given number of batches."""
+        # pylint: disable=no-member
+        call_command('archive_messages', '--days=180', '--batch-size=2',
+                     '--max-batches=1', stdout=StringIO())
+
+        self.assertEqual(ArchivedMessage.objects.count(), 2)
+        self.assertEqual(Message.objects.count(), 5)
+
+    def test_thread_pages_past_recent_messages(self):
+        """
+        This method tests that the thread view returns archived messages on the
+        pages after the recent messages.
+        """
+        call_command('archive_messages', '--days=180', stdout=StringIO())
+        headers = self.login()
+
+        path = reverse('get_user_to_user_messages', kwargs={
+            'user_id': self.user1.id,
+            'user2_id': self.user2.id
+        })
+
+        response = self.client.get(path=f'{path}?page=1&size=3', headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data.get('total_number_of_messages'), 6)
+        self.assertEqual(data.get('total_pages'), 2)
+        self.assertIsNotNone(data.get('next_page'))
+        self.assertEqual(
+            [message['text'] for message in data.get('messages')],
+            ['message 5', 'message 4', 'message 3']
+        )
+
+        response = self.client.get(path=f'{path}?page=2&size=3', headers=headers)
+        data = response.json()
+        self.assertEqual(data.get('total_number_of_messages'), 6)
+        self.assertEqual(data.get('total_pages'), 2)
+        self.assertIsNone(data.get('next_page'))
+        self.assertEqual(
+            [message['text'] for message in data.get('messages')],
+            ['message 2', 'message 1', 'message 0']
+        )
+
+        response = self.client.get(path=f'{path}?page=3&size=3', headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(path=path, headers=headers)
+        self.assertEqual(len(response.json()), 6)
+
+    def test_inbox_includes_archived_conversations(self):
+        """
+        This method tests that the inbox returns the last message of a
+        conversation whose messages have all been archived.
+        """
+        call_command('archive_messages', '--days=180', stdout=StringIO())
+        headers = self.login()
+
+        path = reverse('get_user_messages', kwargs={'user_id': self.user1.id})
+        response = self.client.get(path=f'{path}?page=1&size=10', headers=headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data.get('total_number_of_messages'), 2)
+        self.assertEqual(
+            [message['text'] for message in data.get('messages')],
+            ['message 5', 'hello']
+        )
+
+    def test_archive_is_not_read_within_recent_messages(self):
+        """
+        This method tests that the archived messages are only counted for a page
+        that ends before the last recent message.
+        """
+        headers = self.login()
+        path = reverse('get_user_to_user_messages', kwargs={
+            'user_id': self.user1.id,
+            'user2_id': self.user2.id
+        })
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path=f'{path}?page=1&size=3', headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json().get('messages')), 3)
+        archive_queries = [
+            query['sql'] for query in queries.captured_queries
+            if 'archived_messages' in query['sql']
+        ]
+        self.assertEqual(len(archive_queries), 1)
+        self.assertIn('COUNT(', archive_queries[0])
@@ -0,0 +1,142 @@
+"""This module defines class CreateMessageTest."""
+import shutil
+import tempfile
+from io import BytesIO
+from PIL import Image
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from message.models import Message
+
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class CreateMessageTest(TestCase):
+    """This class defines methods that tests CreateMessageView."""
+
+    @classmethod
+    def tearDownClass(cls):
+        """This method removes the images saved while running the tests."""
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        # Register the sender and the receiver
+        for username in ('test_user1', 'test_user2'):
+            self.client.post(
+                path=reverse('register_user'),
+                data={
+                    'username': username,
+                    'email': f'{username}@gmail.com',
+                    'password': 'password'
+                },
+                content_type='application/json'
+            )
+
+        # Login the sender
+        response = self.client.post(
+            path=reverse('login_user'),
+            data={
+                'username': 'test_user1',
+                'password': 'password'
+            },
+            content_type='application/json'
+        )
+
+        self.headers = {'Authorization': f'Bearer {response.json().get("access")}'}
+        self.receiver = User.objects.get(username='test_user2')
+
+    def get_image(self, width, height, image_format='JPEG', content_type='image/jpeg'):
+        """This method returns an uploadable image of the given size."""
+        buffer = BytesIO()
+        Image.new('RGB', (width, height), color=(200, 120, 40)).save(buffer, format=image_format)
+        return SimpleUploadedFile(
+            f'photo.{image_format.lower()}',
+            buffer.getvalue(),
+            content_type=content_type
+        )
+
+    def test_image_is_resized_and_thumbnail_created(self):
+        """
+        This method tests that an uploaded image is resized and that a
+        thumbnail of the image is saved and returned in the response.
+        """
+        response = self.client.post(
+            path=reverse('create_message'),
+            data={
+                'sender': '',
+                'receiver': self.receiver.id,
+                'image': self.get_image(3000, 2000)
+            },
+            headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIsNotNone(response.json().get('thumbnail'))
+
+        message = Message.objects.get(pk=response.json().get('id'))
+        with Image.open(message.image.path) as image:
+            self.assertEqual(image.size, (1024, 682))
+        with Image.open(message.thumbnail.path) as thumbnail:
+            self.assertEqual(thumbnail.size, (200, 133))
+            self.assertEqual(thumbnail.format, 'JPEG')
+
+    def test_png_image_is_converted_to_jpeg(self):
+        """This method tests that png images are saved in jpeg format."""
+        response = self.client.post(
+            path=reverse('create_message'),
+            data={
+                'sender': '',
+                'receiver': self.receiver.id,
+                'image': self.get_image(300, 300, 'PNG', 'image/png')
+            },
+            headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        message = Message.objects.get(pk=response.json().get('id'))
+        self.assertTrue(message.image.name.endswith('.jpg'))
+        with Image.open(message.image.path) as image:
+            self.assertEqual(image.format, 'JPEG')
+            self.assertEqual(image.size, (300, 300))
+
+    def test_text_message_has_no_thumbnail(self):
+        """This method tests that a text message is saved without a thumbnail."""
+        response = self.client.post(
+            path=reverse('create_message'),
+            data={
+                'sender': None,
+                'receiver': self.receiver.id,
+                'text': 'Is the apartment still available?'
+            },
+            headers=self.headers,
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIsNone(response.json().get('thumbnail'))
+        self.assertIsNone(response.json().get('image'))
+
+    def test_invalid_mime_type(self):
+        """This method tests that a http status code of 400 is returned for gif images."""
+        response = self.client.post(
+            path=reverse('create_message'),
+            data={
+                'sender': '',
+                'receiver': self.receiver.id,
+                'image': self.get_image(100, 100, 'GIF', 'image/gif')
+            },
+            headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
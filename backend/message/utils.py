@@ -0,0 +1,121 @@
+"""This module defines the functions utilized in the message app."""
+from datetime import timedelta
+from math import ceil
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Subquery, OuterRef, Q
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from message.models import Message, ArchivedMessage
+
+
+User = get_user_model()
+
+def get_archive_cutoff():
+    """
+    This function returns the time before which messages are moved from the
+    messages table to the archived_messages table. The number of days kept in
+    the messages table is set with MESSAGE_HOT_WINDOW_DAYS in the settings.
+    """
+    hot_window_days = getattr(settings, 'MESSAGE_HOT_WINDOW_DAYS', 180)
+    return timezone.now() - timedelta(days=hot_window_days)
+
+def archive_message_batch(cutoff, batch_size):
+    """
+    This function moves the oldest messages created before the cutoff from the
+    messages table to the archived_messages table in a single transaction.
+    It returns the number of messages that were moved.
+    """
+    # pylint: disable=no-member
+
+    with transaction.atomic():
+        messages = list(
+            Message.objects.select_for_update().filter(
+                created_at__lt=cutoff
+            ).order_by('created_at')[:batch_size]
+        )
+
+        if not messages:
+            return 0
+
+        ArchivedMessage.objects.bulk_create(
+            [
+                ArchivedMessage(
+                    id=message.id,
+                    sender_id=message.sender_id,
+                    receiver_id=message.receiver_id,
+                    text=message.text,
+                    image=message.image.name or None,
+                    thumbnail=message.thumbnail.name or None,
+                    parent_message_id=message.parent_message_id,
+                    created_at=message.created_at,
+                    updated_at=message.updated_at
+                )
+                for message in messages
+            ],
+            ignore_conflicts=True
+        )
+
+        Message.objects.filter(pk__in=[message.id for message in messages]).delete()
+
+    return len(messages)
+
+def get_last_archived_messages(user_id):
+    """
+    This function returns the last archived message the user sent to or received
+    from each user that the user has no message with in the messages table.
+    """
+    # pylint: disable=no-member
+
+    # Users the user has messages with in the messages table.
+    active_users = User.objects.filter(
+        Q(sent_messages__receiver=user_id) | Q(received_messages__sender=user_id)
+    ).values('id')
+
+    return ArchivedMessage.objects.filter(
+        id__in=Subquery(
+            User.objects.filter(
+                Q(archived_sent_messages__receiver=user_id) |
+                Q(archived_received_messages__sender=user_id)
+            ).exclude(id__in=active_users).distinct().annotate(
+                last_msg=Subquery(
+                    ArchivedMessage.objects.filter(
+                        Q(sender=OuterRef('id'), receiver=user_id) |
+                        Q(receiver=OuterRef('id'), sender=user_id)
+                    ).order_by('-created_at').values_list('id', flat=True)[:1]
+                )
+            ).values_list('last_msg', flat=True)
+        )
+    ).order_by('-created_at')
+
+def paginate_message_tiers(messages, archived_messages, page, page_size):
+    """
+    This function paginates messages from the messages table followed by messages
+    from the archived_messages table. Archived messages are counted, but only read
+    when the requested page goes past the messages in the messages table.
+    It returns the messages on the page, the total number of messages and the
+    total number of pages.
+    """
+    if page_size < 1:
+        raise ValueError('Page not found.')
+
+    number_of_messages = messages.count()
+    total_number_of_messages = number_of_messages + archived_messages.count()
+    total_pages = max(ceil(total_number_of_messages / page_size), 1)
+
+    if page < 1 or page > total_pages:
+        raise ValueError('Page not found.')
+
+    start = (page - 1) * page_size
+    end = start + page_size
+
+    paginated_data = []
+    if start < number_of_messages:
+        paginated_data.extend(messages[start:min(end, number_of_messages)])
+
+    if end > number_of_messages:
+        archive_start = max(start - number_of_messages, 0)
+        archive_end = end - number_of_messages
+        paginated_data.extend(archived_messages[archive_start:archive_end])
+
+    return paginated_data, total_number_of_messages, total_pages
@@ -30,6 +30,7 @@ class CreateMessageView(APIView):
         receiver = validated_data.get('receiver')
         text = validated_data.get('text')
         image = validated_data.get('image')
+        thumbnail = validated_data.get('thumbnail')
         parent_message = validated_data.get('parent_message')
 
         message = Message.objects.create(
@@ -37,6 +38,7 @@ class CreateMessageView(APIView):
             receiver=receiver,
             text=text,
             image=image,
+            thumbnail=thumbnail,
             parent_message=parent_message
         )
 
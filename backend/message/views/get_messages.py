@@ -1,4 +1,5 @@
 """This module defines class GetUserMessagesView."""
+from itertools import chain
 from django.db.models import Subquery, OuterRef, Q
 from django.contrib.auth import get_user_model
 from rest_framework import status
@@ -8,10 +9,10 @@ from rest_framework.permissions import IsAuthenticated
 from drf_spectacular.utils import extend_schema
 from message.serializers import MessageSerializer
 from message.models import Message
+from message.utils import paginate_message_tiers, get_last_archived_messages
 from apartment.utils import (
     get_page_and_size,
-    get_prev_and_next_page,
-    paginate_queryset
+    get_prev_and_next_page
 )
 
 
@@ -57,6 +58,9 @@ class GetUserMessagesView(APIView):
             )
         ).order_by('-created_at')
 
+        # Get the last archived message with each user that has no recent messages.
+        archived_messages = get_last_archived_messages(user_id)
+
         # Get the values of page and page_size from query string of the request.
         try:
             page, page_size = get_page_and_size(request)
@@ -65,12 +69,17 @@ class GetUserMessagesView(APIView):
 
         # Return the messages without pagination if page and page size were not provided.
         if page is None and page_size is None:
-            serializer = MessageSerializer(messages, many=True)
+            # The messages are streamed from both tables without being cached.
+            serializer = MessageSerializer(
+                chain(messages.iterator(), archived_messages.iterator()), many=True
+            )
             return Response(serializer.data, status=status.HTTP_200_OK)
 
-        # Get paginated queryset from the messages queryset
+        # Get paginated messages from the messages and archived messages querysets.
         try:
-            paginated_data, total_pages = paginate_queryset(messages, page, page_size)
+            paginated_data, total_number_of_messages, total_pages = paginate_message_tiers(
+                messages, archived_messages, page, page_size
+            )
         except ValueError as exc:
             if str(exc).lower() == 'page not found.':
                 return Response({'error': str(exc)}, status=status.HTTP_404_NOT_FOUND)
@@ -90,7 +99,7 @@ class GetUserMessagesView(APIView):
         )
 
         data = {
-            'total_number_of_messages': len(messages),
+            'total_number_of_messages': total_number_of_messages,
             'total_pages': total_pages,
             'previous_page': previous_page,
             'current_page': page,
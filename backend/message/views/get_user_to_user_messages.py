@@ -1,4 +1,5 @@
 """This module defines class GetUserToUserMessages."""
+from itertools import chain
 from django.db.models import Q
 from django.contrib.auth import get_user_model
 from rest_framework import status
@@ -7,11 +8,11 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from drf_spectacular.utils import extend_schema
 from message.serializers import MessageSerializer
-from message.models import Message
+from message.models import Message, ArchivedMessage
+from message.utils import paginate_message_tiers
 from apartment.utils import (
     get_page_and_size,
-    get_prev_and_next_page,
-    paginate_queryset
+    get_prev_and_next_page
 )
 
 
@@ -51,6 +52,12 @@ class GetUserToUserMessages(APIView):
             Q(sender=user2_id, receiver=user_id)
         ).order_by('-created_at')
 
+        # Get older messages between both users from the archived messages.
+        archived_messages = ArchivedMessage.objects.filter(
+            Q(sender=user_id, receiver=user2_id) |
+            Q(sender=user2_id, receiver=user_id)
+        ).order_by('-created_at')
+
         # Get the values of page and page_size from query string of the request.
         try:
             page, page_size = get_page_and_size(request)
@@ -59,12 +66,17 @@ class GetUserToUserMessages(APIView):
 
         # Return the messages without pagination if page and page size were not provided.
         if page is None and page_size is None:
-            serializer = MessageSerializer(messages, many=True)
+            # The messages are streamed from both tables without being cached.
+            serializer = MessageSerializer(
+                chain(messages.iterator(), archived_messages.iterator()), many=True
+            )
             return Response(serializer.data, status=status.HTTP_200_OK)
 
-        # Get paginated queryset from the messages queryset
+        # Get paginated messages from the messages and archived messages querysets.
         try:
-            paginated_data, total_pages = paginate_queryset(messages, page, page_size)
+            paginated_data, total_number_of_messages, total_pages = paginate_message_tiers(
+                messages, archived_messages, page, page_size
+            )
         except ValueError as exc:
             if str(exc).lower() == 'page not found.':
                 return Response({'error': str(exc)}, status=status.HTTP_404_NOT_FOUND)
@@ -85,7 +97,7 @@ class GetUserToUserMessages(APIView):
         )
 
         data = {
-            'total_number_of_messages': len(messages),
+            'total_number_of_messages': total_number_of_messages,
             'total_pages': total_pages,
             'previous_page': previous_page,
             'current_page': page,
@@ -1,6 +1,7 @@
 """This module defines class School"""
 from uuid import uuid4
 from django.db import models
+from django.core.validators import MaxValueValidator, MinValueValidator
 from city.models import City
 from state.models import State
 from country.models import Country
@@ -13,6 +14,11 @@ class School(models.Model):
     state = models.ForeignKey(State, on_delete=models.CASCADE, related_name='schools')
     city = models.ForeignKey(City, on_delete=models.CASCADE, related_name='schools')
     name = models.CharField(max_length=500)
+    # Coordinates of the school, used to search the apartments near it.
+    latitude = models.FloatField(null=True, blank=True,
+                                 validators=[MinValueValidator(-90), MaxValueValidator(90)])
+    longitude = models.FloatField(null=True, blank=True,
+                                  validators=[MinValueValidator(-180), MaxValueValidator(180)])
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -15,4 +15,4 @@ class SchoolModelSerializer(serializers.ModelSerializer):
             fields: The class attributes of the named model to be validated or serialized.
         """
         model = School
-        fields = ['id', 'name', 'country', 'state', 'city']
+        fields = ['id', 'name', 'country', 'state', 'city', 'latitude', 'longitude']
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class UserConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'user'
+
+    def ready(self):
+        """This method connects the signal handlers and registers the checks of the user app."""
+        # pylint: disable=import-outside-toplevel
+        # pylint: disable=unused-import
+        from user import signals, checks
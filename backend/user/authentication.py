@@ -0,0 +1,269 @@
+"""This module defines class ClaimsJWTAuthentication and class TokenClaimUser."""
+import time
+from copy import copy
+from threading import Lock
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.utils.functional import LazyObject, empty
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+
+User = get_user_model()
+
+# Full user objects kept by this process, keyed by user id.
+# Each value is a tuple of the time the entry expires and the user object.
+_user_cache = {}
+_user_cache_lock = Lock()
+
+def get_user_cache_ttl():
+    """
+    This function returns the number of seconds a user object is kept in the
+    per-process user cache. It is set with USER_CACHE_TTL in the settings.
+    """
+    return getattr(settings, 'USER_CACHE_TTL', 30)
+
+def get_cached_user(user_id):
+    """
+    This function returns a copy of the user with the given id from the
+    per-process user cache. The user is fetched from the database and cached
+    when it is not in the cache or its entry has expired.
+    It returns None if the user does not exist.
+    """
+    user_id = str(user_id)
+    now = time.monotonic()
+
+    with _user_cache_lock:
+        entry = _user_cache.get(user_id)
+
+    if entry is not None and entry[0] > now:
+        # Return a copy so changes made to the user in a view are not shared
+        # with other requests.
+        return copy(entry[1])
+
+    try:
+        user = User.objects.get(pk=user_id)
+    except User.DoesNotExist:
+        return None
+
+    max_size = getattr(settings, 'USER_CACHE_MAX_SIZE', 10000)
+
+    with _user_cache_lock:
+        if len(_user_cache) >= max_size:
+            # Remove the oldest entry to keep the cache within its size.
+            _user_cache.pop(next(iter(_user_cache)))
+        _user_cache[user_id] = (now + get_user_cache_ttl(), user)
+
+    return copy(user)
+
+def invalidate_cached_user(user_id):
+    """This function removes the user with the given id from the per-process user cache."""
+    with _user_cache_lock:
+        _user_cache.pop(str(user_id), None)
+
+def clear_user_cache():
+    """This function removes all users from the per-process user cache."""
+    with _user_cache_lock:
+        _user_cache.clear()
+
+def get_revoked_user_key(user_id):
+    """This function returns the cache key that marks a user's access tokens as revoked."""
+    return f'revoked_user:{user_id}'
+
+def revoke_user_access(user_id):
+    """
+    This function marks the access tokens of a user as revoked in the cache.
+    It is used when a user is deactivated or deleted, since the claims in an
+    access token stay valid until the token expires. The mark is kept for as
+    long as an access token lives.
+    """
+    timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()) + 1
+    cache.set(get_revoked_user_key(user_id), True, timeout=timeout)
+
+def restore_user_access(user_id):
+    """This function removes the revoked mark of a user from the cache."""
+    cache.delete(get_revoked_user_key(user_id))
+
+def is_user_access_revoked(user_id):
+    """This function returns True if the access tokens of a user were revoked."""
+    return cache.get(get_revoked_user_key(user_id)) is not None
+
+def get_user_claims_key(user_id):
+    """This function returns the cache key of the current claims of a user."""
+    return f'user_claims:{user_id}'
+
+def set_user_claims(user):
+    """
+    This function keeps the username, is_staff and is_active of a user in the
+    cache for as long as an access token lives. Access tokens are only trusted
+    while these claims are in the cache and match theirs.
+    """
+    timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()) + 1
+    cache.set(
+        get_user_claims_key(user.pk),
+        {'username': user.username, 'is_staff': user.is_staff, 'is_active': user.is_active},
+        timeout=timeout
+    )
+
+def delete_user_claims(user_id):
+    """This function removes the claims of a user from the cache."""
+    cache.delete(get_user_claims_key(user_id))
+
+
+class TokenClaimUser(LazyObject):
+    """
+    This class defines a user built from the claims of an access token.
+    The id, pk, username and is_staff attributes are read from the token,
+    so reading them does not query the database. The user is active and not
+    suspended, since suspending or deactivating a user revokes its tokens.
+    The full user object is loaded from the per-process user cache the first
+    time any other attribute is read or set.
+    Revoked access tokens are marked in the default cache, which must be shared
+    by all processes, like Redis or Memcached. With a per-process cache such as
+    LocMemCache, a user revoked in one process is still accepted by the others
+    until the access token expires.
+    """
+
+    def __init__(self, user_id, username, is_staff):
+        """This method initializes the user with the claims of the access token."""
+        super().__init__()
+        self.__dict__['_claims'] = {
+            'id': user_id,
+            'pk': user_id,
+            'username': username,
+            'is_staff': is_staff,
+            'is_active': True,
+            'is_suspended': False,
+            'is_authenticated': True,
+            'is_anonymous': False
+        }
+
+    def _setup(self):
+        """This method loads the full user object of the claims."""
+        user = get_cached_user(self.__dict__['_claims']['id'])
+
+        if user is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+
+        if not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+
+        self._wrapped = user
+
+    def __getattr__(self, name):
+        """
+        This method returns the value of a claim while the full user object
+        has not been loaded. Any other attribute loads the full user object.
+        """
+        claims = self.__dict__['_claims']
+
+        if self._wrapped is empty and name in claims:
+            return claims[name]
+
+        if self._wrapped is empty:
+            self._setup()
+
+        return getattr(self._wrapped, name)
+
+    def __bool__(self):
+        """
+        This method returns True without loading the full user object, so
+        permission classes such as IsAuthenticated and IsAdminUser only read
+        the claims.
+        """
+        return True
+
+    @property
+    def __class__(self):
+        """
+        This property returns the user model while the full user object has not
+        been loaded, so isinstance checks against it do not load the user.
+        """
+        if self._wrapped is empty:
+            return User
+        return self._wrapped.__class__
+
+    def __eq__(self, other):
+        """This method compares the user with another user by primary key."""
+        if isinstance(other, TokenClaimUser):
+            return self.pk == other.pk
+
+        if isinstance(other, User):
+            return other.pk is not None and self.pk == str(other.pk)
+
+        return NotImplemented
+
+    def __ne__(self, other):
+        """This method returns the opposite of __eq__."""
+        result = self.__eq__(other)
+
+        if result is NotImplemented:
+            return result
+
+        return not result
+
+    def __hash__(self):
+        """This method returns the same hash as the user model for the same user."""
+        return hash(self.pk)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    This class authenticates requests with an access token without fetching
+    the user from the database. It returns a TokenClaimUser built from the
+    user_id, username and is_staff claims added to the token in LoginView
+    and CustomTokenRefreshView.
+    """
+
+    def get_user(self, validated_token):
+        """
+        This method returns the user of the validated access token.
+        The claims of the token are only trusted while the current claims of
+        the user are in the cache and match them. Tokens without the username
+        and is_staff claims, tokens whose claims are no longer those of the
+        user, users whose claims are not in the cache, or when the password of
+        the user must be checked against the token, fall back to the full user
+        object. A user loaded because its claims were not in the cache is read
+        from the database and its claims are cached again.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as exc:
+            raise InvalidToken('Token contained no recognizable user identification') from exc
+
+        # The revoked mark and the current claims of the user are read at once.
+        values = cache.get_many([get_revoked_user_key(user_id), get_user_claims_key(user_id)])
+        if get_revoked_user_key(user_id) in values:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+
+        username = validated_token.get('username')
+        is_staff = validated_token.get('is_staff')
+        claims = values.get(get_user_claims_key(user_id))
+
+        if claims is None:
+            # pylint: disable=no-member
+            try:
+                user = User.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except User.DoesNotExist as exc:
+                raise AuthenticationFailed('User not found', code='user_not_found') from exc
+
+            set_user_claims(user)
+        elif username is None or is_staff is None or claims != {
+            'username': username, 'is_staff': str(is_staff) == 'True', 'is_active': True
+        }:
+            user = get_cached_user(user_id)
+
+            if user is None:
+                raise AuthenticationFailed('User not found', code='user_not_found')
+        else:
+            return TokenClaimUser(str(user_id), username, str(is_staff) == 'True')
+
+        if not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+
+        return user
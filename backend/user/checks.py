@@ -0,0 +1,35 @@
+"""This module defines the system checks of the user app."""
+from django.conf import settings
+from django.core.checks import Warning as CheckWarning, register
+
+
+# Cache backends whose entries are only seen by the process that set them.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache'
+)
+
+@register()
+def check_revocation_cache(app_configs, **kwargs):
+    """
+    This function warns when ClaimsJWTAuthentication is used with a default
+    cache that is not shared by the processes, since revoked access tokens are
+    marked in that cache. It does not warn when DEBUG is True.
+    """
+    # pylint: disable=unused-argument
+
+    authentication_classes = getattr(settings, 'REST_FRAMEWORK', {}).get(
+        'DEFAULT_AUTHENTICATION_CLASSES', []
+    )
+    if settings.DEBUG \
+        or 'user.authentication.ClaimsJWTAuthentication' not in authentication_classes:
+        return []
+
+    if settings.CACHES.get('default', {}).get('BACKEND') in PROCESS_LOCAL_CACHES:
+        return [CheckWarning(
+            'The default cache is not shared by the processes, so a user whose access '
+            'is revoked in one process can still use the API in the others.',
+            hint='Set the default cache to a shared backend such as Redis or Memcached.',
+            id='user.W001'
+        )]
+    return []
@@ -19,8 +19,11 @@ class CustomModelBackend(ModelBackend):
 
         User = get_user_model()
 
+        # Load the suspension of the user in the same query, it is read at login.
         try:
-            user = User.objects.get(Q(username=username) | Q(email=username))
+            user = User.objects.select_related('suspension').get(
+                Q(username=username) | Q(email=username)
+            )
         except User.DoesNotExist:
             return None
 
@@ -0,0 +1,95 @@
+"""This module defines the benchmark_blacklist_tokens command."""
+import time
+from datetime import timedelta
+from uuid import uuid4
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+from user.utils import blacklist_outstanding_tokens
+
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    """
+    This class defines a command that measures the time and number of queries
+    blacklist_outstanding_tokens takes at login for users with token histories
+    of increasing size. All rows it creates are rolled back.
+    """
+    help = 'Measures the login token blacklisting cost as the token history of a user grows.'
+
+    def add_arguments(self, parser):
+        """This method defines the arguments accepted by the command."""
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[10, 100, 1000, 10000],
+            help='Numbers of expired and blacklisted tokens in the history of the user.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Number of logins measured for each size.'
+        )
+
+    def handle(self, *args, **options):
+        """This method runs the benchmark for each size and reports the results."""
+        for size in options['sizes']:
+            with transaction.atomic():
+                elapsed, queries = self.measure(size, options['repeat'])
+                transaction.set_rollback(True)
+
+            self.stdout.write(
+                f'{size} tokens in history: {elapsed * 1000:.2f} ms per login, '\
+                f'{queries} queries'
+            )
+
+    def measure(self, size, repeat):
+        """
+        This method creates a user with a token history of the given size and
+        returns the average time and the number of queries of a login.
+        """
+        # pylint: disable=no-member
+
+        user = User.objects.create_user(
+            username=f'benchmark_{uuid4().hex[:12]}',
+            email=f'benchmark_{uuid4().hex[:12]}@example.com',
+            password=uuid4().hex
+        )
+
+        # Half of the history expired, the other half was blacklisted at earlier logins.
+        now = timezone.now()
+        tokens = OutstandingToken.objects.bulk_create([
+            OutstandingToken(
+                user=user,
+                jti=uuid4().hex,
+                token='',
+                created_at=now - timedelta(days=2),
+                expires_at=now + timedelta(days=1) if i % 2 else now - timedelta(days=1)
+            )
+            for i in range(size)
+        ])
+        BlacklistedToken.objects.bulk_create(
+            [BlacklistedToken(token=token) for token in tokens[1::2]]
+        )
+
+        total = 0
+        queries = 0
+        for _ in range(repeat):
+            # Each login leaves one outstanding token to blacklist.
+            RefreshToken.for_user(user)
+
+            with CaptureQueriesContext(connection) as context:
+                start = time.perf_counter()
+                blacklist_outstanding_tokens(user)
+                total += time.perf_counter() - start
+
+            queries = len(context.captured_queries)
+
+        return total / repeat, queries
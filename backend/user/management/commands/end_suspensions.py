@@ -0,0 +1,48 @@
+"""This module defines the end_suspensions command."""
+from django.core.management.base import BaseCommand
+from user.utils import end_expired_suspensions, backfill_suspension_status
+
+
+class Command(BaseCommand):
+    """
+    This class defines a command that ends expired suspensions and reactivates
+    their users in batches. It is meant to be run periodically.
+    """
+    help = 'Ends expired suspensions and reactivates their users in bounded batches.'
+
+    def add_arguments(self, parser):
+        """This method defines the arguments accepted by the command."""
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of suspensions ended in each transaction.'
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            default=None,
+            help='Stop after this number of batches.'
+        )
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='Set is_suspended of every user from the user\'s suspension first.'
+        )
+
+    def handle(self, *args, **options):
+        """This method ends the suspensions and reports the progress."""
+        if options['backfill']:
+            suspended = backfill_suspension_status()
+            self.stdout.write(f'Marked {suspended} users as suspended.')
+
+        def progress(batch_number, ended):
+            self.stdout.write(f'Batch {batch_number}: ended {ended} suspensions.')
+
+        total_ended = end_expired_suspensions(
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            progress=progress
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'Ended {total_ended} expired suspensions.'))
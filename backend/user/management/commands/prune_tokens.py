@@ -0,0 +1,40 @@
+"""This module defines the prune_tokens command."""
+from django.core.management.base import BaseCommand
+from user.utils import prune_expired_tokens
+
+
+class Command(BaseCommand):
+    """
+    This class defines a command that deletes expired outstanding and
+    blacklisted tokens in batches.
+    """
+    help = 'Deletes expired outstanding and blacklisted tokens in bounded batches.'
+
+    def add_arguments(self, parser):
+        """This method defines the arguments accepted by the command."""
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of outstanding tokens deleted in each transaction.'
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            default=None,
+            help='Stop after this number of batches.'
+        )
+
+    def handle(self, *args, **options):
+        """This method deletes the tokens and reports the progress."""
+
+        def progress(batch_number, deleted):
+            self.stdout.write(f'Batch {batch_number}: deleted {deleted} tokens.')
+
+        total_deleted = prune_expired_tokens(
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            progress=progress
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {total_deleted} expired tokens.'))
@@ -50,6 +50,9 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False)
     is_superuser = models.BooleanField(default=False, editable=False)
     is_verified = models.BooleanField(default=False)
+    # True while the user has a suspension that has not ended. It is kept in
+    # sync by UserSuspension.save so suspension checks do not need a join.
+    is_suspended = models.BooleanField(default=False, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -63,9 +66,13 @@ class User(AbstractBaseUser, PermissionsMixin):
         """
         db_table: Name of the table this class creates in the database.
         ordering: The order the instances of this model is displayed on the admin page.
+        indexes: Index used by the cursor pagination of the user listing.
         """
         db_table = 'users'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'])
+        ]
 
     def __str__(self):
         """This method returns a string representation of the instance of this class."""
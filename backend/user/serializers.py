@@ -3,7 +3,6 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
-from user_verification_token.models import VerificationToken
 from user.models import UserProfile, UserProfileInterest
 from user.utils import check_html_tags, resize_image
 from user_suspension.models import UserSuspension
@@ -13,6 +12,35 @@ from user_interest.serializers import UserInterestSerializer
 
 User = get_user_model()
 
+class SparseFieldsMixin:
+    """
+    This class lets a serializer return only some of its fields. The fields
+    argument lists the fields to return. The nested fields that are not in the
+    expand argument are returned as primary keys; all are returned in full if
+    expand is None. All fields are returned if fields is None.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        """This method removes the fields that were not requested."""
+        super().__init__(*args, **kwargs)
+
+        if fields is None:
+            return
+
+        for name in list(self.fields):
+            field = self.fields[name]
+
+            if name not in fields:
+                self.fields.pop(name)
+            elif expand is not None and name not in expand and \
+                    isinstance(field, serializers.BaseSerializer):
+                kwargs = {'source': field.source} if field.source != name else {}
+                self.fields[name] = serializers.PrimaryKeyRelatedField(
+                    read_only=True,
+                    many=isinstance(field, serializers.ListSerializer),
+                    **kwargs
+                )
+
 class UserProfileInterestSerializer(serializers.ModelSerializer):
     """
     This class defines class attributes of the UserProfileInterest model
@@ -239,7 +267,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
         return resized_thumbnail
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     This class defines class attributes of the User model to
     be validated when a request to register a user is made.
@@ -286,7 +314,9 @@ class UserSerializer(serializers.ModelSerializer):
         object is serialized using the UserSerializer.
         """
         data = super().to_representation(instance)
-        data['profile_information'].pop('remove_thumbnail')
+        profile_information = data.get('profile_information')
+        if profile_information is not None:
+            profile_information.pop('remove_thumbnail')
 
         # Check if current user is the owner of the profile
         user = self.context['request'].user
@@ -317,8 +347,8 @@ class UserSerializer(serializers.ModelSerializer):
                     'updated_at', 'last_login', 'groups', 'user_permissions'
                 ):
                     data.pop(field, None)
-                else:
-                    data['profile_information'].pop(field, None)
+                elif profile_information is not None:
+                    profile_information.pop(field, None)
 
         return data
 
@@ -357,16 +387,19 @@ class UserSerializer(serializers.ModelSerializer):
         return value
 
 
-class VerificationTokenSerializer(serializers.ModelSerializer):
-    """This defines attributes of the VerificationModel that will be validated"""
-    class Meta:
-        """
-            model: Name of the model
-            fields: The class attributes of the above name model
-                    to be validated
-        """
-        model = VerificationToken
-        fields = ['verification_token']
+# pylint: disable=abstract-method
+class VerificationTokenSerializer(serializers.Serializer):
+    """This class validates the One Time Password submitted by a user."""
+    verification_token = serializers.CharField(max_length=6)
+
+
+# pylint: disable=abstract-method
+class PasswordResetTokenSerializer(VerificationTokenSerializer):
+    """
+    This class validates the One Time Password for password reset and
+    the request_id it was sent with.
+    """
+    request_id = serializers.CharField(max_length=36)
 
 
 # pylint: disable=abstract-method
@@ -596,3 +629,29 @@ class ValidatePhoneOTPSerializer(serializers.Serializer):
             raise serializers.ValidationError('The One Time Password entered is incorrect.')
 
         return otp
+
+
+# pylint: disable=abstract-method
+class UserFilterSerializer(serializers.Serializer):
+    """
+    This class validates the query parameters used to filter
+    the users returned to a staff.
+    """
+    verified = serializers.BooleanField(required=False)
+    staff = serializers.BooleanField(required=False)
+    suspended = serializers.BooleanField(required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        """This method checks that the created range is not empty."""
+        created_after = attrs.get('created_after')
+        created_before = attrs.get('created_before')
+
+        if created_after is not None and created_before is not None:
+            if created_after >= created_before:
+                raise serializers.ValidationError(
+                    'The field "created_after" must be earlier than "created_before".'
+                )
+
+        return attrs
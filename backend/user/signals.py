@@ -0,0 +1,102 @@
+"""
+This module defines the signal handlers that keep the per-process user
+cache used by ClaimsJWTAuthentication up to date, and the handler that adds
+indexes to the token blacklist tables.
+"""
+from django.db import connections
+from django.db.models import Index
+from django.db.models.signals import post_save, post_delete, post_migrate
+from django.dispatch import receiver
+from django.contrib.auth import get_user_model
+from user.models import UserProfile
+from user.authentication import (
+    invalidate_cached_user,
+    delete_user_claims,
+    revoke_user_access,
+    restore_user_access,
+    set_user_claims
+)
+from user_suspension.models import UserSuspension
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+
+# Indexes added to the outstanding tokens table of the token_blacklist app,
+# whose migrations are not part of this project. (user, expires_at) supports
+# the lookups made at login and refresh, expires_at supports pruning.
+OUTSTANDING_TOKEN_INDEXES = [
+    Index(fields=['user', 'expires_at'], name='outstanding_user_expires_idx'),
+    Index(fields=['expires_at'], name='outstanding_expires_idx')
+]
+
+
+User = get_user_model()
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    """
+    This function removes a saved user from the user cache, keeps the current
+    claims of the user and revokes the access tokens of the user if the user
+    was deactivated.
+    """
+    # pylint: disable=unused-argument
+
+    invalidate_cached_user(instance.pk)
+    set_user_claims(instance)
+
+    if instance.is_active:
+        restore_user_access(instance.pk)
+    else:
+        revoke_user_access(instance.pk)
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    """
+    This function removes a deleted user and its claims from the user cache
+    and revokes its access tokens.
+    """
+    # pylint: disable=unused-argument
+
+    invalidate_cached_user(instance.pk)
+    delete_user_claims(instance.pk)
+    revoke_user_access(instance.pk)
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def user_profile_changed(sender, instance, **kwargs):
+    """This function removes the user of a changed profile from the user cache."""
+    # pylint: disable=unused-argument
+
+    invalidate_cached_user(instance.user_id)
+
+@receiver(post_save, sender=UserSuspension)
+@receiver(post_delete, sender=UserSuspension)
+def user_suspension_changed(sender, instance, **kwargs):
+    """This function removes the user of a changed suspension from the user cache."""
+    # pylint: disable=unused-argument
+
+    invalidate_cached_user(instance.user_id)
+
+@receiver(post_migrate)
+def create_token_indexes(sender, using, **kwargs):
+    """
+    This function adds the missing indexes to the outstanding tokens table
+    after the migrations of the token_blacklist app have run.
+    """
+    # pylint: disable=unused-argument
+    # pylint: disable=no-member
+
+    if sender.label != 'token_blacklist':
+        return
+
+    connection = connections[using]
+    table = OutstandingToken._meta.db_table
+
+    with connection.cursor() as cursor:
+        if table not in connection.introspection.table_names(cursor):
+            return
+        existing = connection.introspection.get_constraints(cursor, table)
+
+    with connection.schema_editor() as schema_editor:
+        for index in OUTSTANDING_TOKEN_INDEXES:
+            if index.name not in existing:
+                schema_editor.add_index(OutstandingToken, index)
@@ -0,0 +1,225 @@
+"""This module defines class ClaimsJWTAuthenticationTest"""
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from user.authentication import ClaimsJWTAuthentication, TokenClaimUser, clear_user_cache
+from user.checks import check_revocation_cache
+
+
+User = get_user_model()
+
+class AuthenticatedView(APIView):
+    """This class defines a view that only authenticated users can access."""
+    authentication_classes = [ClaimsJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """This method returns the id of the user."""
+        return Response({'id': request.user.id, 'is_user': isinstance(request.user, User)})
+
+
+class AdminView(AuthenticatedView):
+    """This class defines a view that only staff users can access."""
+    permission_classes = [IsAdminUser]
+
+
+class ClaimsJWTAuthenticationTest(TestCase):
+    """This class defines methods that tests ClaimsJWTAuthentication class."""
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        clear_user_cache()
+        cache.clear()
+
+        # Data for a user to be registered
+        data = {
+            'username': 'test_user',
+            'email': 'test_user@gmail.com',
+            'password': 'password'
+        }
+
+        # Register the user
+        self.client.post(
+            path=reverse('register_user'),
+            data=data,
+            content_type='application/json'
+        )
+
+        # Login data
+        response = self.client.post(
+            path=reverse('login_user'),
+            data={
+                'username': 'test_user',
+                'password': 'password'
+            },
+            content_type='application/json'
+        )
+
+        self.user = User.objects.get(username='test_user')
+        self.access_token = response.json().get('access')
+        self.factory = APIRequestFactory()
+
+    def authenticate(self):
+        """This method authenticates a request that has the access token in its header."""
+        request = self.factory.get('/', HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+        user, _ = ClaimsJWTAuthentication().authenticate(request)
+        return user
+
+    def test_claims_without_query(self):
+        """
+        This method tests that the id, username and is_staff of the user
+        are read from the access token without querying the database.
+        """
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+            self.assertIsInstance(user, TokenClaimUser)
+            self.assertEqual(user.id, self.user.id)
+            self.assertEqual(user.username, 'test_user')
+            self.assertIs(user.is_staff, False)
+            self.assertIs(user.is_authenticated, True)
+            self.assertEqual(user, self.user)
+            self.assertNotEqual(self.user, User(username='other_user'))
+
+    def test_full_user_is_cached(self):
+        """
+        This method tests that the full user object is fetched once
+        and then read from the user cache.
+        """
+        with self.assertNumQueries(1):
+            self.assertEqual(self.authenticate().email, 'test_user@gmail.com')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authenticate().email, 'test_user@gmail.com')
+
+    def test_cache_invalidated_on_profile_change(self):
+        """This method tests that a change to the profile removes the user from the cache."""
+        self.assertEqual(self.authenticate().email, 'test_user@gmail.com')
+
+        self.user.profile.save()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.authenticate().email, 'test_user@gmail.com')
+
+    def test_changes_not_shared(self):
+        """This method tests that changes to a cached user are not seen by other requests."""
+        user = self.authenticate()
+        user.email = 'changed@gmail.com'
+
+        self.assertEqual(self.authenticate().email, 'test_user@gmail.com')
+
+    def test_inactive_user(self):
+        """This method tests that the access token of a deactivated user is rejected."""
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_permission_classes_without_query(self):
+        """
+        This method tests that the IsAuthenticated and IsAdminUser permission
+        classes check a request without querying the database.
+        """
+        request = self.factory.get('/', HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+        with self.assertNumQueries(0):
+            response = AuthenticatedView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'id': str(self.user.id), 'is_user': True})
+
+        request = self.factory.get('/', HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+        with self.assertNumQueries(0):
+            response = AdminView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_revocation_cache_check(self):
+        """This method tests that a cache that is not shared is reported."""
+        rest_framework = {
+            'DEFAULT_AUTHENTICATION_CLASSES': ['user.authentication.ClaimsJWTAuthentication']
+        }
+        local_cache = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        shared_cache = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}
+
+        with override_settings(REST_FRAMEWORK=rest_framework, CACHES=local_cache, DEBUG=False):
+            self.assertEqual(
+                [error.id for error in check_revocation_cache(None)], ['user.W001']
+            )
+        with override_settings(REST_FRAMEWORK=rest_framework, CACHES=shared_cache, DEBUG=False):
+            self.assertEqual(check_revocation_cache(None), [])
+
+    def test_changed_claims_not_trusted(self):
+        """
+        This method tests that the full user object is loaded for an access
+        token issued before the staff status of the user was changed.
+        """
+        self.user.is_staff = True
+        self.user.save()
+
+        request = self.factory.get('/', HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+        response = AdminView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # An access token of the staff user is not trusted once the user is
+        # no longer a staff.
+        response = self.client.post(
+            path=reverse('login_user'),
+            data={
+                'username': 'test_user',
+                'password': 'password'
+            },
+            content_type='application/json'
+        )
+        staff_token = response.json().get('access')
+        self.user.is_staff = False
+        self.user.save()
+
+        request = self.factory.get('/', HTTP_AUTHORIZATION=f'Bearer {staff_token}')
+        response = AdminView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_missing_claims_not_trusted(self):
+        """
+        This method tests that the user is loaded from the database when its
+        claims are no longer in the cache, and that its claims are cached again.
+        """
+        # pylint: disable=no-member
+
+        response = self.client.post(
+            path=reverse('login_user'),
+            data={
+                'username': 'test_user',
+                'password': 'password'
+            },
+            content_type='application/json'
+        )
+        access_token = response.json().get('access')
+
+        # The user is deactivated while its cached claims and revoked mark are lost.
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        cache.clear()
+
+        request = self.factory.get('/', HTTP_AUTHORIZATION=f'Bearer {access_token}')
+        response = AuthenticatedView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        User.objects.filter(pk=self.user.pk).update(is_active=True)
+        cache.clear()
+
+        request = self.factory.get('/', HTTP_AUTHORIZATION=f'Bearer {access_token}')
+        with self.assertNumQueries(1):
+            response = AuthenticatedView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        request = self.factory.get('/', HTTP_AUTHORIZATION=f'Bearer {access_token}')
+        with self.assertNumQueries(0):
+            response = AuthenticatedView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,122 @@
+"""This module defines class EndSuspensionsTest"""
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from user_suspension.models import UserSuspension
+from user.authentication import get_cached_user, is_user_access_revoked
+
+
+User = get_user_model()
+
+class EndSuspensionsTest(TestCase):
+    """
+    This class defines methods that tests is_suspended of users and the
+    end_suspensions command.
+    """
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        # pylint: disable=no-member
+
+        self.users = []
+        for i in range(0, 4):
+            user = User.objects.create_user(
+                username=f'test_user{i}',
+                email=f'test_user{i}@gmail.com',
+                password='password'
+            )
+            user.is_active = False
+            user.save()
+            self.users.append(user)
+
+        # Three suspensions that have expired and one permanent suspension.
+        for user in self.users[:3]:
+            UserSuspension.objects.create(
+                user=user,
+                start_time=timezone.now() - timedelta(hours=2),
+                end_time=timezone.now() - timedelta(hours=1),
+                duration=1,
+                number_of_suspensions=1
+            )
+        UserSuspension.objects.create(
+            user=self.users[3],
+            start_time=timezone.now(),
+            is_permanent=True,
+            number_of_suspensions=1
+        )
+
+    def test_is_suspended_kept_in_sync(self):
+        """This method tests that saving a suspension sets is_suspended of its user."""
+        user = User.objects.get(pk=self.users[0].pk)
+        self.assertTrue(user.is_suspended)
+
+        user.suspension.has_ended = True
+        user.suspension.save()
+        self.assertFalse(user.is_suspended)
+        self.assertFalse(User.objects.get(pk=user.pk).is_suspended)
+
+    def test_expired_suspensions_are_ended_in_batches(self):
+        """
+        This method tests that expired suspensions are ended in batches of the
+        given size, and that their users are reactivated and removed from the
+        user cache.
+        """
+        # pylint: disable=no-member
+
+        self.assertFalse(get_cached_user(self.users[0].pk).is_active)
+        self.assertTrue(is_user_access_revoked(self.users[0].pk))
+
+        output = StringIO()
+        call_command('end_suspensions', batch_size=2, stdout=output)
+
+        self.assertIn('Batch 2: ended 1 suspensions.', output.getvalue())
+        self.assertIn('Ended 3 expired suspensions.', output.getvalue())
+
+        self.assertEqual(
+            UserSuspension.objects.filter(has_ended=False).get().user_id,
+            str(self.users[3].pk)
+        )
+        self.assertEqual(User.objects.filter(is_active=True, is_suspended=False).count(), 3)
+        self.assertTrue(get_cached_user(self.users[0].pk).is_active)
+        self.assertFalse(is_user_access_revoked(self.users[0].pk))
+
+    def test_backfill(self):
+        """This method tests that --backfill sets is_suspended from the suspensions."""
+        User.objects.update(is_suspended=False)
+
+        output = StringIO()
+        call_command('end_suspensions', backfill=True, stdout=output)
+
+        self.assertIn('Marked 4 users as suspended.', output.getvalue())
+        self.assertEqual(
+            list(User.objects.filter(is_suspended=True).values_list('username', flat=True)),
+            ['test_user3']
+        )
+
+    def test_suspended_profile(self):
+        """This method tests that the profile of a suspended user is not shown to other users."""
+        User.objects.create_user(
+            username='viewer',
+            email='viewer@gmail.com',
+            password='password'
+        )
+        response = self.client.post(
+            path=reverse('login_user'),
+            data={'username': 'viewer', 'password': 'password'},
+            content_type='application/json'
+        )
+        headers = {'Authorization': f'Bearer {response.json().get("access")}'}
+
+        response = self.client.get(
+            path=reverse('user_profile', args=[self.users[3].pk]),
+            headers=headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -1,9 +1,17 @@
 """This method defines class GetUsersTest."""
+from datetime import timedelta
+from unittest import mock
 from django.test import TestCase
+from django.utils import timezone
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from user_interest.models import UserInterest
+from user.models import UserProfileInterest
+from user.authentication import ClaimsJWTAuthentication, clear_user_cache
+from user.views.get_users import UserView
 from user.serializers import UserSerializer
 
 
@@ -101,4 +109,105 @@ class GetUsersTest(TestCase):
         users = User.objects.all()
         serializer = UserSerializer(users, many=True, context={'request': request})
         self.assertEqual(response2.status_code, status.HTTP_200_OK)
-        self.assertEqual(serializer.data, response2.json())
+        self.assertEqual(serializer.data, response2.json().get('users'))
+
+    def staff_headers(self):
+        """This method makes the user a staff and returns a new authorization header."""
+        self.user.is_staff = True
+        self.user.save()
+
+        response = self.client.post(
+            path=reverse('login_user'),
+            data={
+                'username': 'test_user',
+                'password': 'password'
+            },
+            content_type='application/json'
+        )
+        return {'Authorization': f'Bearer {response.json().get("access")}'}
+
+    def test_users_are_paginated_with_cursor(self):
+        """
+        This method tests that the users are returned newest first in pages,
+        with a fixed number of queries for each page.
+        """
+        # pylint: disable=no-member
+
+        interest = UserInterest.objects.create(name='reading')
+
+        for i in range(0, 5):
+            user = User.objects.create_user(
+                username=f'user{i}',
+                email=f'user{i}@gmail.com',
+                password='password'
+            )
+            UserProfileInterest.objects.create(user_profile=user.profile, user_interest=interest)
+            User.objects.filter(pk=user.pk).update(
+                created_at=timezone.now() + timedelta(minutes=i + 1)
+            )
+
+        headers = self.staff_headers()
+
+        # The page of users and their profile interests, and the staff user
+        # unless it is read from the claims of the access token.
+        for authentication_class, num_queries in (
+            (JWTAuthentication, 3),
+            (ClaimsJWTAuthentication, 2)
+        ):
+            with self.subTest(authentication_class=authentication_class.__name__), \
+                    mock.patch.object(UserView, 'authentication_classes', [authentication_class]):
+                usernames = []
+                url = f'{reverse("get_users")}?size=2'
+                while url is not None:
+                    clear_user_cache()
+                    with self.assertNumQueries(num_queries):
+                        response = self.client.get(path=url, headers=headers)
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+                    usernames += [user['username'] for user in response.json().get('users')]
+                    url = response.json().get('next_page')
+
+                self.assertEqual(
+                    usernames,
+                    ['user4', 'user3', 'user2', 'user1', 'user0', 'test_user']
+                )
+
+    def test_users_are_filtered(self):
+        """This method tests that the users are filtered with the query parameters."""
+        User.objects.create_user(
+            username='verified_user',
+            email='verified_user@gmail.com',
+            password='password',
+            is_verified=True
+        )
+        headers = self.staff_headers()
+
+        response = self.client.get(
+            path=reverse('get_users'),
+            data={'verified': 'true'},
+            headers=headers
+        )
+        usernames = [user['username'] for user in response.json().get('users')]
+        self.assertEqual(usernames, ['verified_user'])
+
+        response = self.client.get(
+            path=reverse('get_users'),
+            data={'staff': 'true', 'suspended': 'false'},
+            headers=headers
+        )
+        usernames = [user['username'] for user in response.json().get('users')]
+        self.assertEqual(usernames, ['test_user'])
+
+        response = self.client.get(
+            path=reverse('get_users'),
+            data={'created_after': timezone.now().isoformat()},
+            headers=headers
+        )
+        self.assertEqual(response.json().get('users'), [])
+
+        response = self.client.get(
+            path=reverse('get_users'),
+            data={'verified': 'maybe'},
+            headers=headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
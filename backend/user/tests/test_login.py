@@ -234,3 +234,29 @@ class LoginViewTest(TestCase):
         # Test user is_active attribute after login
         user = User.objects.get(username='test_user')
         self.assertEqual(user.is_active, True)
+
+    def test_suspended_user_without_flag(self):
+        """
+        This method tests that a user suspended before is_suspended was
+        backfilled is unable to login.
+        """
+        # pylint: disable=no-member
+
+        user = User.objects.get(username='test_user')
+        UserSuspension.objects.create(
+            user=user,
+            is_permanent=True,
+            duration=None,
+            start_time=timezone.now(),
+            end_time=None,
+            number_of_suspensions=1
+        )
+        User.objects.filter(pk=user.pk).update(is_active=False, is_suspended=False)
+
+        response = self.client.post(
+            path=reverse('login_user'),
+            data=self.login_data,
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.json().get('error'), 'Account has been permanently suspended.')
@@ -0,0 +1,93 @@
+"""This module defines class PruneTokensTest"""
+from datetime import timedelta
+from io import StringIO
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from user.utils import prune_expired_tokens
+
+
+User = get_user_model()
+
+class PruneTokensTest(TestCase):
+    """This class defines methods that tests the pruning of expired tokens."""
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        # pylint: disable=no-member
+
+        self.user = User.objects.create_user(
+            username='test_user',
+            email='test_user@gmail.com',
+            password='password'
+        )
+
+        # Five expired tokens, two of which are blacklisted.
+        for i in range(0, 5):
+            token = OutstandingToken.objects.create(
+                user=self.user,
+                jti=f'expired_{i}',
+                token=f'expired_{i}',
+                expires_at=timezone.now() - timedelta(days=1)
+            )
+            if i < 2:
+                BlacklistedToken.objects.create(token=token)
+
+        # A blacklisted token that has not expired.
+        self.valid_token = RefreshToken.for_user(self.user)
+        self.valid_token.blacklist()
+
+    def test_prune_expired_tokens(self):
+        """
+        This method tests that only expired tokens and their blacklisted tokens
+        are deleted, in batches of the given size.
+        """
+        # pylint: disable=no-member
+
+        batches = []
+        deleted = prune_expired_tokens(
+            batch_size=2,
+            progress=lambda number, count: batches.append(count)
+        )
+
+        self.assertEqual(deleted, 5)
+        self.assertEqual(batches, [2, 2, 1])
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+        self.assertTrue(
+            OutstandingToken.objects.filter(jti=self.valid_token['jti']).exists()
+        )
+
+    def test_prune_tokens_command(self):
+        """This method tests that the command stops after the maximum number of batches."""
+        # pylint: disable=no-member
+
+        out = StringIO()
+        call_command('prune_tokens', batch_size=2, max_batches=1, stdout=out)
+
+        self.assertIn('Batch 1: deleted 2 tokens.', out.getvalue())
+        self.assertIn('Deleted 2 expired tokens.', out.getvalue())
+        self.assertEqual(OutstandingToken.objects.count(), 4)
+
+    def test_token_indexes(self):
+        """This method tests that the indexes are added to the outstanding tokens table."""
+        # pylint: disable=no-member
+
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor,
+                OutstandingToken._meta.db_table
+            )
+
+        self.assertEqual(
+            constraints['outstanding_user_expires_idx']['columns'],
+            ['user_id', 'expires_at']
+        )
+        self.assertIn('outstanding_expires_idx', constraints)
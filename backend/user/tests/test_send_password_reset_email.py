@@ -4,6 +4,7 @@ from django.test import TestCase
 from django.core import mail
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from email_outbox.utils import send_outbox_batch
 
 
 User = get_user_model()
@@ -51,6 +52,9 @@ class SendVerificationEmailTest(TestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Send the queued email.
+        send_outbox_batch()
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(mail.outbox[0].subject, 'FindAccommodation OTP')
 
@@ -77,6 +81,9 @@ class SendVerificationEmailTest(TestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Send the queued email.
+        send_outbox_batch()
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(mail.outbox[0].subject, 'FindAccommodation OTP')
 
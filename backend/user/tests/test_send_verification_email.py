@@ -1,9 +1,12 @@
 """This module defines class SendVerificationEmailTest"""
+import re
 from rest_framework import status
 from django.test import TestCase
 from django.core import mail
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from user.utils import hash_token
+from email_outbox.utils import send_outbox_batch
 
 
 User = get_user_model()
@@ -55,6 +58,9 @@ class SendVerificationEmailTest(TestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Send the queued email.
+        send_outbox_batch()
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(mail.outbox[0].subject, 'FindAccommodation OTP')
 
@@ -80,8 +86,8 @@ class SendVerificationEmailTest(TestCase):
 
     def test_verification_token_in_email(self):
         """
-        This method tests that a verification taken is created
-        and sent in the body of the email.
+        This method tests that a verification taken is created and sent
+        in the body of the email, and that only its hash is stored.
         """
         response = self.client.get(
             path=reverse('email_verification_token'),
@@ -89,10 +95,15 @@ class SendVerificationEmailTest(TestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Send the queued email.
+        send_outbox_batch()
         self.assertEqual(len(mail.outbox), 1)
 
+        otp = re.search(r'Your OTP: (\d{6})', mail.outbox[0].body).group(1)
         token = self.user.verification_token
-        self.assertIn(token.verification_token, mail.outbox[0].body)
+        self.assertNotIn(token.verification_token, mail.outbox[0].body)
+        self.assertEqual(token.verification_token, hash_token(token.request_id, otp))
 
     def test_verification_token_set_values(self):
         """
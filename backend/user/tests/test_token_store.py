@@ -0,0 +1,165 @@
+"""This module defines class CacheTokenStoreTest"""
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from user.token_store import CacheTokenStore
+
+
+User = get_user_model()
+
+@override_settings(REFRESH_TOKEN_STORE='user.token_store.CacheTokenStore')
+class CacheTokenStoreTest(TestCase):
+    """This class defines methods that tests the token views with CacheTokenStore."""
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        cache.clear()
+
+        # Data for a user to be registered
+        data = {
+            'username': 'test_user',
+            'email': 'test_user@gmail.com',
+            'password': 'password'
+        }
+
+        # Register the user
+        self.client.post(
+            path=reverse('register_user'),
+            data=data,
+            content_type='application/json'
+        )
+
+        self.user = User.objects.get(username='test_user')
+
+    def login(self):
+        """This method logs the user in and returns the refresh token set in the cookie."""
+        response = self.client.post(
+            path=reverse('login_user'),
+            data={
+                'username': 'test_user',
+                'password': 'password'
+            },
+            content_type='application/json'
+        )
+        return response.cookies['refresh'].value
+
+    def refresh(self, refresh_token):
+        """This method refreshes the tokens with the given refresh token."""
+        self.client.cookies['refresh'] = refresh_token
+        return self.client.post(
+            path=reverse('custom_token_refresh'),
+            content_type='application/json'
+        )
+
+    def test_rotation_without_database_writes(self):
+        """
+        This method tests that refresh tokens are rotated without adding rows
+        to the token_blacklist tables.
+        """
+        # pylint: disable=no-member
+
+        refresh_token = self.login()
+
+        for _ in range(0, 3):
+            response = self.refresh(refresh_token)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response.cookies['refresh'].value, refresh_token)
+            refresh_token = response.cookies['refresh'].value
+
+        self.assertEqual(OutstandingToken.objects.count(), 0)
+        self.assertEqual(BlacklistedToken.objects.count(), 0)
+
+    def test_reuse_revokes_all_tokens(self):
+        """
+        This method tests that using a refresh token twice revokes every
+        refresh token of the user.
+        """
+        first_token = self.login()
+        second_token = self.refresh(first_token).cookies['refresh'].value
+
+        response = self.refresh(first_token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json()['messages'][0]['message'], 'Token is blacklisted')
+
+        response = self.refresh(second_token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_login_revokes_previous_tokens(self):
+        """This method tests that logging in revokes the refresh tokens of earlier logins."""
+        first_token = self.login()
+        second_token = self.login()
+
+        self.assertEqual(self.refresh(first_token).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.refresh(second_token).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.refresh(self.login()).status_code, status.HTTP_200_OK)
+
+    def test_logout_revokes_token(self):
+        """This method tests that a refresh token cannot be used after logout."""
+        refresh_token = self.login()
+        access_token = self.refresh(refresh_token).json()['access']
+        refresh_token = self.client.cookies['refresh'].value
+
+        response = self.client.post(
+            path=reverse('logout_user'),
+            HTTP_AUTHORIZATION=f'Bearer {access_token}'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.refresh(refresh_token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_database_token_fallback(self):
+        """
+        This method tests that a refresh token issued by DatabaseTokenStore
+        can be exchanged once while the database fallback is enabled.
+        """
+        # pylint: disable=no-member
+
+        legacy_token = str(RefreshToken.for_user(self.user))
+
+        response = self.refresh(legacy_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+        response = self.refresh(legacy_token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(REFRESH_TOKEN_STORE_DB_FALLBACK=False)
+    def test_database_token_without_fallback(self):
+        """This method tests that tokens without a family are rejected without the fallback."""
+        legacy_token = str(RefreshToken.for_user(self.user))
+
+        response = self.refresh(legacy_token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoke_user(self):
+        """This method tests that revoke_user makes all refresh tokens of the user invalid."""
+        refresh_token = self.login()
+
+        CacheTokenStore().revoke_user(self.user)
+
+        self.assertEqual(self.refresh(refresh_token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_evicted_family(self):
+        """
+        This method tests that a refresh token whose family is no longer in the
+        cache is rejected without starting a family from the token.
+        """
+        refresh_token = self.refresh(self.login()).cookies['refresh'].value
+
+        cache.clear()
+
+        response = self.refresh(refresh_token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json()['messages'][0]['message'], 'Token family is unknown')
+        self.assertIsNone(cache.get(CacheTokenStore().get_family_key(self.user.id)))
+
+        # Logging in again starts a new family.
+        response = self.refresh(self.login())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
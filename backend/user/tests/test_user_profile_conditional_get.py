@@ -0,0 +1,57 @@
+"""This module defines class UserProfileConditionalGetTest"""
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework import status
+
+
+User = get_user_model()
+
+class UserProfileConditionalGetTest(TestCase):
+    """This class defines methods that tests conditional requests made to UserProfileView."""
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        self.user = User.objects.create_user(
+            username='test_user',
+            email='test_user@gmail.com',
+            password='password'
+        )
+        self.path = reverse('user_profile', args=[self.user.id])
+
+    def test_not_modified(self):
+        """
+        This method tests that 304 is returned while the profile has not changed,
+        and that the owner and other users get different ETags.
+        """
+        response = self.client.get(path=self.path)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response.headers['ETag']
+
+        response = self.client.get(path=self.path, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # The owner is shown more fields than anonymous users.
+        response = self.client.post(
+            path=reverse('login_user'),
+            data={
+                'username': 'test_user',
+                'password': 'password'
+            },
+            content_type='application/json'
+        )
+        headers = {'Authorization': f'Bearer {response.json().get("access")}'}
+
+        response = self.client.get(path=self.path, headers={'If-None-Match': etag, **headers})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('email', response.json())
+
+        # Updating the profile changes the ETag.
+        self.user.profile.first_name = 'Test'
+        self.user.profile.save()
+        response = self.client.get(path=self.path, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers['ETag'], etag)
@@ -0,0 +1,42 @@
+"""This module defines class UserProfileSparseFieldsTest"""
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework import status
+
+
+User = get_user_model()
+
+class UserProfileSparseFieldsTest(TestCase):
+    """This class defines methods that tests the fields parameter of UserProfileView."""
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        self.user = User.objects.create_user(
+            username='test_user',
+            email='test_user@gmail.com',
+            password='password'
+        )
+        self.path = reverse('user_profile', args=[self.user.id])
+
+    def test_only_requested_fields_are_returned(self):
+        """
+        This method tests that only the requested fields are returned, and that
+        the profile is not fetched if it is not requested.
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(path=self.path, data={'fields': 'username'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'username': 'test_user'})
+
+        response = self.client.get(
+            path=self.path, data={'fields': 'username,profile_information'}
+        )
+        self.assertEqual(list(response.json()), ['username', 'profile_information'])
+        self.assertIn('interests', response.json()['profile_information'])
+
+        response = self.client.get(path=self.path, data={'fields': 'password'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
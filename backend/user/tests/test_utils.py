@@ -1,14 +1,20 @@
 """This module defines class UtilsFuntionsTest"""
+import re
 import time
+from datetime import timedelta
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
 from django.test import TestCase
 from django.core import mail
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from user_verification_token.models import VerificationToken
+from email_outbox.utils import send_outbox_batch
 from user.utils import (
     token_generator,
     send_verification_token,
+    hash_token,
+    check_verification_token,
     is_token_expired,
     check_html_tags,
     blacklist_outstanding_tokens
@@ -35,25 +41,14 @@ class UtilsFunctionsTest(TestCase):
 
     def test_token_generator(self):
         """
-        This method tests that generated tokens are always unique in given sample.
+        This method tests that generated tokens are six digit numbers
+        and that generating them does not query the database.
         """
-        # pylint: disable=no-member
-
-        tokens = []
-        for i in range(1, 51):
-            token = token_generator()
-
-            user = User.objects.create_user(
-                username=f"test_user{i}",
-                email=f"testuser{i}@gmail.com",
-                password="test_user_password"
-            )
+        with self.assertNumQueries(0):
+            tokens = [token_generator() for _ in range(0, 50)]
 
-            VerificationToken.objects.create(user=user, verification_token=token)
-            tokens.append(token)
-
-        self.assertEqual(len(tokens), 50)
-        self.assertEqual(len(tokens), len(set(tokens)))
+        for token in tokens:
+            self.assertRegex(token, r'^[1-9]\d{5}$')
 
     def test_send_verification_token(self):
         """
@@ -69,8 +64,10 @@ class UtilsFunctionsTest(TestCase):
         self.assertFalse(tokens.exists())
         self.assertEqual(len(tokens), 0)
 
-        # send verification token to email
+        # Queue verification token to email and send it
         send_verification_token(user=user)
+        self.assertEqual(len(mail.outbox), 0)
+        send_outbox_batch()
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(mail.outbox[0].subject, 'FindAccommodation OTP')
 
@@ -84,8 +81,45 @@ class UtilsFunctionsTest(TestCase):
         self.assertFalse(token.is_for_password_reset)
         self.assertFalse(token.is_used)
         self.assertFalse(token.is_validated_for_password_reset)
-        self.assertEqual(len(token.verification_token), 7)
-        self.assertIn(token.verification_token, mail.outbox[0].body)
+        otp = re.search(r'Your OTP: (\d{6})', mail.outbox[0].body).group(1)
+        self.assertNotIn(token.verification_token, mail.outbox[0].body)
+        self.assertEqual(token.verification_token, hash_token(token.request_id, otp))
+
+    def test_check_verification_token(self):
+        """
+        This method tests that a token is checked against the hashed token
+        of the user, and that failed attempts are counted.
+        """
+        # pylint: disable=no-member
+
+        user = UtilsFunctionsTest.user
+        request_id = send_verification_token(user=user)
+        send_outbox_batch()
+        otp = re.search(r'Your OTP: (\d{6})', mail.outbox[0].body).group(1)
+        wrong_otp = '100000' if otp != '100000' else '100001'
+
+        token = VerificationToken.objects.get(request_id=request_id)
+        # A copy read before the attempts are made, as by a concurrent request.
+        stale_token = VerificationToken.objects.get(request_id=request_id)
+        self.assertTrue(check_verification_token(token, otp))
+
+        for _ in range(0, 5):
+            self.assertFalse(check_verification_token(token, wrong_otp))
+
+        # Once the attempts are used up, even the correct token is rejected.
+        with self.assertRaises(ValueError):
+            check_verification_token(token, otp)
+        with self.assertRaises(ValueError):
+            check_verification_token(stale_token, otp)
+        token.refresh_from_db()
+        self.assertEqual(token.failed_attempts, 5)
+
+        # A new token has a new request_id and no failed attempts.
+        new_request_id = send_verification_token(user=user)
+        token.refresh_from_db()
+        self.assertNotEqual(new_request_id, request_id)
+        self.assertEqual(token.request_id, new_request_id)
+        self.assertEqual(token.failed_attempts, 0)
 
     def test_is_token_expired(self):
         """
@@ -166,3 +200,36 @@ class UtilsFunctionsTest(TestCase):
 
         blacklist_outstanding_tokens(user=user)
         self.assertEqual(len(BlacklistedToken.objects.all()), 3)
+
+    def test_blacklist_outstanding_tokens_queries(self):
+        """
+        This method tests that the number of queries the function makes does
+        not grow with the number of tokens the user has had, and that expired
+        or already blacklisted tokens are skipped.
+        """
+        # pylint: disable=no-member
+
+        user = UtilsFunctionsTest.user
+
+        for _ in range(0, 3):
+            RefreshToken.for_user(user)
+
+        with self.assertNumQueries(2):
+            blacklist_outstanding_tokens(user=user)
+
+        for i in range(0, 30):
+            RefreshToken.for_user(user)
+            OutstandingToken.objects.create(
+                user=user,
+                jti=f'expired_{i}',
+                token=f'expired_{i}',
+                expires_at=timezone.now() - timedelta(days=1)
+            )
+
+        with self.assertNumQueries(2):
+            blacklist_outstanding_tokens(user=user)
+
+        self.assertEqual(len(BlacklistedToken.objects.all()), 33)
+
+        with self.assertNumQueries(1):
+            blacklist_outstanding_tokens(user=user)
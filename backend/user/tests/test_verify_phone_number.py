@@ -0,0 +1,135 @@
+"""This module defines class SMSGatewayTest and class PhoneVerificationTest"""
+import time
+from rest_framework import status
+from django.test import TestCase, SimpleTestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from user.verify_phone_number import (
+    CircuitBreaker,
+    SMSGatewayError,
+    TwilioSMSGateway,
+    get_sms_gateway,
+    send_phone_otp,
+    check_phone_otp
+)
+
+
+User = get_user_model()
+
+FAKE_GATEWAY = 'user.verify_phone_number.FakeSMSGateway'
+
+class SMSGatewayTest(SimpleTestCase):
+    """This class defines methods that tests the SMS gateways and the circuit breaker."""
+
+    def test_twilio_client_created_lazily(self):
+        """This method tests that the Twilio client is not created with the gateway."""
+        gateway = TwilioSMSGateway()
+        self.assertIsNone(gateway._verify) # pylint: disable=protected-access
+
+    @override_settings(SMS_GATEWAY=FAKE_GATEWAY, SMS_GATEWAY_ASYNC=True)
+    def test_send_in_background(self):
+        """This method tests that an OTP sent in the background can be checked."""
+        gateway = get_sms_gateway()
+        self.assertIs(gateway, get_sms_gateway())
+
+        future = send_phone_otp('+2348000000001')
+        future.result(timeout=5)
+
+        code = gateway.codes['+2348000000001']
+        self.assertTrue(check_phone_otp('+2348000000001', code))
+        self.assertFalse(check_phone_otp('+2348000000001', 'wrong'))
+
+    def test_circuit_breaker(self):
+        """
+        This method tests that the circuit opens after consecutive failures,
+        rejects calls while open, and closes after a successful call.
+        """
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.2)
+
+        def fail():
+            raise ConnectionError('Timed out.')
+
+        for _ in range(0, 2):
+            with self.assertRaises(ConnectionError):
+                breaker.call(fail)
+
+        self.assertTrue(breaker.is_open())
+        with self.assertRaises(SMSGatewayError):
+            breaker.call(lambda: True)
+
+        time.sleep(0.25)
+        self.assertFalse(breaker.is_open())
+        self.assertTrue(breaker.call(lambda: True))
+        self.assertEqual(breaker.failures, 0)
+
+
+@override_settings(SMS_GATEWAY=FAKE_GATEWAY, SMS_GATEWAY_ASYNC=False)
+class PhoneVerificationTest(TestCase):
+    """This class defines methods that tests phone verification with FakeSMSGateway."""
+
+    def setUp(self):
+        """
+        This method is called before the start of each method of the class
+        and destroyed at the end of each method.
+        """
+        # Data for a user to be registered
+        data = {
+            'username': 'test_user',
+            'email': 'test_user@gmail.com',
+            'password': 'password'
+        }
+
+        # Register the user
+        self.client.post(
+            path=reverse('register_user'),
+            data=data,
+            content_type='application/json'
+        )
+
+        # Login the user
+        response = self.client.post(
+            path=reverse('login_user'),
+            data={
+                'username': 'test_user',
+                'password': 'password'
+            },
+            content_type='application/json'
+        )
+
+        self.headers = {'Authorization': f'Bearer {response.json().get("access")}'}
+
+        user = User.objects.get(username='test_user')
+        user.profile.phone_number = '+2348000000002'
+        user.profile.save()
+
+        self.gateway = get_sms_gateway()
+        self.gateway.breaker = CircuitBreaker()
+
+    def test_verify_phone_number(self):
+        """This method tests that the OTP sent to the phone verifies the phone number."""
+        response = self.client.get(
+            path=reverse('send_phone_verification_token'),
+            headers=self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(
+            path=reverse('validate_phone_verification_token'),
+            data={'otp': self.gateway.codes['+2348000000002']},
+            headers=self.headers,
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        user = User.objects.get(username='test_user')
+        self.assertTrue(user.profile.phone_number_is_verified)
+
+    def test_open_circuit(self):
+        """This method tests that a 503 is returned at once while the circuit is open."""
+        self.gateway.breaker.opened_at = time.monotonic()
+
+        response = self.client.get(
+            path=reverse('send_phone_verification_token'),
+            headers=self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
@@ -0,0 +1,203 @@
+"""
+This module defines the stores that issue, rotate and revoke refresh tokens.
+The store used by the views is set with REFRESH_TOKEN_STORE in the settings.
+"""
+from uuid import uuid4
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token, AccessToken, RefreshToken
+from user.utils import blacklist_outstanding_tokens
+
+
+def get_token_store():
+    """
+    This function returns an instance of the refresh token store set with
+    REFRESH_TOKEN_STORE in the settings. It defaults to DatabaseTokenStore.
+    """
+    store_path = getattr(settings, 'REFRESH_TOKEN_STORE', 'user.token_store.DatabaseTokenStore')
+    return import_string(store_path)()
+
+def add_user_claims(token, user):
+    """This function adds the custom claims read by the application to a refresh token."""
+    token['username'] = user.username
+    token['is_staff'] = str(user.is_staff)
+    return token
+
+
+class DatabaseTokenStore:
+    """
+    This class defines a refresh token store that keeps track of tokens with
+    the OutstandingToken and BlacklistedToken tables of the token_blacklist app.
+    """
+
+    def issue(self, user):
+        """This method returns a new refresh token for the user."""
+        return add_user_claims(RefreshToken.for_user(user), user)
+
+    def rotate(self, raw_token):
+        """
+        This method verifies a refresh token and blacklists it so it can only
+        be exchanged once. If the token was blacklisted already, it was used
+        before, so every token of the user is blacklisted.
+        It returns the verified token or raises TokenError.
+        """
+        try:
+            token = RefreshToken(raw_token)
+            token.blacklist()
+        except TokenError as exc:
+            if str(exc) == 'Token is blacklisted':
+                user_id = RefreshToken(raw_token, verify=False).get(api_settings.USER_ID_CLAIM)
+                blacklist_outstanding_tokens(user_id)
+            raise
+
+        return token
+
+    def revoke(self, raw_token):
+        """This method verifies a refresh token and blacklists it, or raises TokenError."""
+        RefreshToken(raw_token).blacklist()
+
+    def revoke_user(self, user):
+        """This method blacklists every outstanding refresh token of the user."""
+        blacklist_outstanding_tokens(user)
+
+
+class CacheRefreshToken(Token):
+    """
+    This class defines a refresh token that is not added to the
+    OutstandingToken table when it is created and is not looked up in the
+    BlacklistedToken table when it is verified.
+    """
+    token_type = 'refresh'
+    lifetime = api_settings.REFRESH_TOKEN_LIFETIME
+    no_copy_claims = RefreshToken.no_copy_claims + ('family',)
+    access_token_class = AccessToken
+    access_token = RefreshToken.access_token
+
+
+class CacheTokenStore:
+    """
+    This class defines a refresh token store that keeps track of tokens in the
+    cache set with REFRESH_TOKEN_STORE_CACHE in the settings, so rotating a
+    token writes nothing to the database.
+
+    Every refresh token issued to a user carries the id of the user's current
+    token family. Revoking the user's tokens starts a new family, which makes
+    all earlier tokens invalid. A rotated token is marked as used until it
+    expires, and presenting it again revokes every token of the user, as
+    DatabaseTokenStore does. A token whose family is no longer in the cache,
+    because it was evicted or the cache was restarted, is rejected, since
+    the family may have been revoked, and the user has to log in again.
+
+    Tokens issued by DatabaseTokenStore have no family. While
+    REFRESH_TOKEN_STORE_DB_FALLBACK is True they are checked against and
+    blacklisted in the token_blacklist tables, so sessions started before the
+    switch keep working. Once REFRESH_TOKEN_LIFETIME has passed since the
+    switch, those tokens have expired and the fallback can be turned off.
+    """
+
+    def __init__(self):
+        """This method initializes the store with its cache."""
+        self.cache = caches[getattr(settings, 'REFRESH_TOKEN_STORE_CACHE', 'default')]
+        self.db_fallback = getattr(settings, 'REFRESH_TOKEN_STORE_DB_FALLBACK', True)
+        self.family_timeout = int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+
+    def get_family_key(self, user_id):
+        """This method returns the cache key of the current token family of a user."""
+        return f'refresh_token_family:{user_id}'
+
+    def get_used_key(self, jti):
+        """This method returns the cache key that marks a token as used."""
+        return f'refresh_token_used:{jti}'
+
+    def get_family(self, user_id):
+        """
+        This method returns the current token family of a user and starts
+        a new one if the user has none.
+        """
+        key = self.get_family_key(user_id)
+        self.cache.add(key, uuid4().hex, timeout=self.family_timeout)
+        self.cache.touch(key, timeout=self.family_timeout)
+        return self.cache.get(key)
+
+    def mark_used(self, token):
+        """This method marks a token as used and returns False if it was used already."""
+        timeout = max(int(token['exp'] - token.current_time.timestamp()), 0) + 1
+        return self.cache.add(self.get_used_key(token[api_settings.JTI_CLAIM]), 1, timeout=timeout)
+
+    def check_token(self, raw_token):
+        """
+        This method verifies a refresh token and marks it as used.
+        It returns the verified token or raises TokenError if the token is
+        invalid, expired, revoked or was used already.
+        """
+        token = CacheRefreshToken(raw_token)
+        user_id = token.get(api_settings.USER_ID_CLAIM)
+        family = token.get('family')
+
+        if family is None:
+            return self.check_legacy_token(raw_token)
+
+        current_family = self.cache.get(self.get_family_key(user_id))
+        if current_family is None:
+            raise TokenError('Token family is unknown')
+
+        if family != current_family:
+            raise TokenError('Token is blacklisted')
+
+        if not self.mark_used(token):
+            raise TokenError('Token is blacklisted')
+
+        return token
+
+    def check_legacy_token(self, raw_token):
+        """
+        This method verifies a refresh token issued by DatabaseTokenStore and
+        blacklists it in the token_blacklist tables.
+        """
+        if not self.db_fallback:
+            raise TokenError('Token is blacklisted')
+
+        token = RefreshToken(raw_token)
+        token.blacklist()
+        return token
+
+    def issue(self, user):
+        """This method returns a new refresh token of the user's current token family."""
+        token = CacheRefreshToken.for_user(user)
+        token['family'] = self.get_family(token[api_settings.USER_ID_CLAIM])
+        return add_user_claims(token, user)
+
+    def rotate(self, raw_token):
+        """
+        This method verifies a refresh token and marks it as used so it can only
+        be exchanged once. If the token was used or revoked before, every token
+        of the user is revoked.
+        It returns the verified token or raises TokenError.
+        """
+        try:
+            return self.check_token(raw_token)
+        except TokenError as exc:
+            if str(exc) == 'Token is blacklisted':
+                user_id = CacheRefreshToken(raw_token, verify=False).get(
+                    api_settings.USER_ID_CLAIM
+                )
+                self.revoke_user(user_id)
+            raise
+
+    def revoke(self, raw_token):
+        """This method verifies a refresh token and marks it as used, or raises TokenError."""
+        self.check_token(raw_token)
+
+    def revoke_user(self, user):
+        """
+        This method revokes every refresh token of the user by starting a new
+        token family. The user can be a user object or a user id.
+        """
+        user_id = getattr(user, api_settings.USER_ID_FIELD, user)
+        self.cache.set(self.get_family_key(user_id), uuid4().hex, timeout=self.family_timeout)
+
+        if self.db_fallback:
+            blacklist_outstanding_tokens(user)
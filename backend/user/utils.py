@@ -1,32 +1,89 @@
 """This module defines some helper functions and classes for the user_app app."""
 import os
+import secrets
 from io import BytesIO
-from random import randint
+from uuid import uuid4
 from PIL import Image, ImageOps
+from rest_framework.pagination import CursorPagination
 from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.template.loader import render_to_string
 from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import InMemoryUploadedFile
-from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
+from django.utils.crypto import salted_hmac, constant_time_compare
 from django.utils.html import strip_tags
 from user_verification_token.models import VerificationToken
+from user_suspension.models import UserSuspension
+from user.authentication import invalidate_cached_user, restore_user_access
+from email_outbox.utils import enqueue_email
 
 
+User = get_user_model()
+
+class UserCursorPagination(CursorPagination):
+    """
+    This class defines the cursor pagination of the user listing. Pages are
+    read with an index seek on created_at, so reading a page does not count
+    or skip over the users before it.
+    """
+    page_size = 50
+    page_size_query_param = 'size'
+    max_page_size = 500
+    ordering = '-created_at'
+
 def token_generator():
-    """This function returns a randomly generated number."""
+    """
+    This function returns a randomly generated six digit number.
+    Tokens are checked against the user or request they were issued for,
+    so they do not need to be unique across users.
+    """
+    return str(100000 + secrets.randbelow(900000))
+
+def hash_token(request_id, token):
+    """This function returns the HMAC of a token issued with the given request_id."""
+    return salted_hmac('user.verification_token', f'{request_id}:{token}').hexdigest()
+
+def check_verification_token(verification_token, token):
+    """
+    This function counts an attempt at the VerificationToken object and
+    returns True if the token matches its hashed token, else False.
+    The attempt is counted with a single conditional update, so concurrent
+    attempts cannot pass OTP_MAX_ATTEMPTS in the settings. It raises
+    ValueError if the attempts at the token reached OTP_MAX_ATTEMPTS.
+    """
     # pylint: disable=no-member
 
-    while True:
-        new_token = str(randint(100000, 999999))
+    max_attempts = getattr(settings, 'OTP_MAX_ATTEMPTS', 5)
+    counted = VerificationToken.objects.filter(
+        pk=verification_token.pk,
+        failed_attempts__lt=max_attempts
+    ).update(failed_attempts=F('failed_attempts') + 1)
+
+    if counted == 0:
+        raise ValueError('Too many incorrect attempts. Request a new token.')
 
-        if not VerificationToken.objects.filter(verification_token=new_token).exists():
-            return new_token
+    hashed_token = hash_token(verification_token.request_id, str(token))
+    if not constant_time_compare(hashed_token, verification_token.verification_token):
+        return False
+
+    # A correct token does not count as a failed attempt.
+    VerificationToken.objects.filter(pk=verification_token.pk).update(
+        failed_attempts=F('failed_attempts') - 1
+    )
+    return True
 
 def send_verification_token(user, for_password=False):
-    """This function sends link for email verification to the user."""
+    """
+    This function stores the hash of a new One Time Password and adds the
+    email that sends the password to the user to the outbox, in a single
+    transaction. The email is sent by the send_outbox_emails command.
+    It returns the request_id the password was issued with.
+    """
     # pylint: disable=no-member
-    # pylint: disable=broad-exception-caught
 
     email_subject = 'FindAccommodation OTP'
     token = token_generator()
@@ -42,24 +99,31 @@ def send_verification_token(user, for_password=False):
             'token': token
         })
 
-    email = EmailMultiAlternatives(
-        subject=email_subject,
-        body=strip_tags(email_body),
-        from_email='findaccommodation.online@gmail.com',
-        to=[user.email]
-    )
+    request_id = str(uuid4())
 
-    email.attach_alternative(email_body, "text/html")
+    with transaction.atomic():
+        # Store the hash of the token with a new request_id and reset the state of the token.
+        VerificationToken.objects.update_or_create(
+            user=user,
+            defaults={
+                'verification_token': hash_token(request_id, token),
+                'request_id': request_id,
+                'failed_attempts': 0,
+                'is_for_password_reset': for_password,
+                'is_used': False,
+                'is_validated_for_password_reset': False
+            }
+        )
 
-    try:
-        email.send()
-        verification_token_obj = VerificationToken.objects.get(user=user)
-        verification_token_obj.verification_token = token
-        verification_token_obj.save()
-    except VerificationToken.DoesNotExist:
-        VerificationToken.objects.create(user=user, verification_token=token)
-    except Exception as e:
-        raise e
+        enqueue_email(
+            subject=email_subject,
+            body=strip_tags(email_body),
+            html_body=email_body,
+            from_email='findaccommodation.online@gmail.com',
+            to=[user.email]
+        )
+
+    return request_id
 
 
 def is_token_expired(token, exp_time_length):
@@ -86,19 +150,131 @@ def check_html_tags(value):
     return value != stripped_string, stripped_string
 
 def blacklist_outstanding_tokens(user):
-    """This function blacklists all outstanding tokens belonging to a user."""
-    # pylint: disable=broad-exception-caught
+    """
+    This function blacklists all outstanding tokens belonging to a user.
+    Only tokens that have not expired and are not yet blacklisted are selected,
+    and they are blacklisted with a single insert, so the cost does not grow
+    with the number of tokens the user has had.
+    """
     # pylint: disable=no-member
 
-    outstanding_tokens = OutstandingToken.objects.filter(user=user)
-    if outstanding_tokens.exists():
-        for token in outstanding_tokens:
-            BlacklistedToken.objects.get_or_create(token=token)
+    token_ids = list(
+        OutstandingToken.objects.filter(
+            user=user,
+            expires_at__gt=timezone.now(),
+            blacklistedtoken__isnull=True
+        ).values_list('id', flat=True)
+    )
+
+    if token_ids:
+        BlacklistedToken.objects.bulk_create(
+            [BlacklistedToken(token_id=token_id) for token_id in token_ids],
+            ignore_conflicts=True
+        )
+
+def prune_expired_tokens(batch_size=1000, max_batches=None, progress=None):
+    """
+    This function deletes expired outstanding tokens together with their
+    blacklisted tokens in batches, so each delete only holds locks on a
+    bounded number of rows. It can be called by the prune_tokens command
+    or by any scheduler. If given, progress is called with the batch number
+    and the number of tokens deleted in the batch.
+    It returns the total number of outstanding tokens deleted.
+    """
+    # pylint: disable=no-member
+
+    now = timezone.now()
+    number_of_batches = 0
+    total_deleted = 0
+
+    while max_batches is None or number_of_batches < max_batches:
+        token_ids = list(
+            OutstandingToken.objects.filter(
+                expires_at__lt=now
+            ).order_by('expires_at').values_list('id', flat=True)[:batch_size]
+        )
+
+        if not token_ids:
+            break
+
+        with transaction.atomic():
+            BlacklistedToken.objects.filter(token_id__in=token_ids).delete()
+            OutstandingToken.objects.filter(id__in=token_ids).delete()
+
+        number_of_batches += 1
+        total_deleted += len(token_ids)
+
+        if progress is not None:
+            progress(number_of_batches, len(token_ids))
+
+    return total_deleted
+
+def end_expired_suspensions(batch_size=1000, max_batches=None, progress=None):
+    """
+    This function ends the suspensions whose end_time has passed and reactivates
+    their users in batches, so users do not have to log in for their suspension
+    to end. It can be called by the end_suspensions command or by any scheduler.
+    If given, progress is called with the batch number and the number of
+    suspensions ended in the batch.
+    It returns the total number of suspensions ended.
+    """
+    # pylint: disable=no-member
+
+    now = timezone.now()
+    number_of_batches = 0
+    total_ended = 0
+
+    while max_batches is None or number_of_batches < max_batches:
+        suspensions = list(
+            UserSuspension.objects.filter(
+                has_ended=False,
+                is_permanent=False,
+                end_time__lte=now
+            ).order_by('end_time').values_list('id', 'user_id')[:batch_size]
+        )
+
+        if not suspensions:
+            break
+
+        suspension_ids = [suspension_id for suspension_id, _ in suspensions]
+        user_ids = [user_id for _, user_id in suspensions]
+
+        with transaction.atomic():
+            UserSuspension.objects.filter(id__in=suspension_ids).update(has_ended=True)
+            User.objects.filter(id__in=user_ids).update(is_active=True, is_suspended=False)
+
+        # Bulk updates do not send signals, so update the user caches here.
+        for user_id in user_ids:
+            invalidate_cached_user(user_id)
+            restore_user_access(user_id)
+
+        number_of_batches += 1
+        total_ended += len(suspensions)
+
+        if progress is not None:
+            progress(number_of_batches, len(suspensions))
+
+    return total_ended
+
+def backfill_suspension_status():
+    """
+    This function sets is_suspended of every user from the user's suspension.
+    It is used once after the field is added.
+    It returns the number of users marked as suspended.
+    """
+    with transaction.atomic():
+        User.objects.filter(is_suspended=True).exclude(
+            suspension__has_ended=False
+        ).update(is_suspended=False)
+        return User.objects.filter(suspension__has_ended=False).update(is_suspended=True)
 
 def resize_image(image, new_width):
     """This method resizes all thumbnail images to a specified size."""
-    # Open the image using pillow
+    # Open the image using pillow. For JPEG images, draft lets the decoder
+    # scale the image down while reading it so the full-size bitmap is never
+    # held in memory.
     img = Image.open(image)
+    img.draft('RGB', (new_width, new_width))
     img = img.convert('RGB')
 
     aspect_ratio = img.width / img.height
@@ -140,3 +316,41 @@ def resize_image(image, new_width):
     )
 
     return resized_file
+
+def create_thumbnail(image, size):
+    """
+    This function returns a JPEG thumbnail of the image that fits within a
+    square of the specified size, keeping the aspect ratio of the image.
+    """
+    # Rewind the file in case it has already been read, e.g by resize_image.
+    image.seek(0)
+
+    # Open the image and let the decoder downscale it while reading.
+    img = Image.open(image)
+    img.draft('RGB', (size, size))
+    img = ImageOps.exif_transpose(img)
+    img = img.convert('RGB')
+
+    # Resize the image in place while maintaining the aspect ratio
+    img.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+    output_buffer = BytesIO()
+    img.save(output_buffer, format='JPEG', quality=80)
+    output_buffer.seek(0)
+
+    content_file = ContentFile(output_buffer.read())
+
+    # Name the thumbnail after the original image
+    image_name = os.path.splitext(os.path.basename(image.name))[0]
+
+    thumbnail = InMemoryUploadedFile(
+        file=content_file,
+        field_name=None,
+        name=f'{image_name}_thumbnail.jpg',
+        content_type='image/jpeg',
+        size=content_file.size,
+        charset=None,
+        content_type_extra=None
+    )
+
+    return thumbnail
@@ -1,25 +1,232 @@
-"""This module defines functions that validates a user's phone number."""
+"""
+This module defines functions that validates a user's phone number, and the
+SMS gateways they send One Time Passwords with. The gateway is set with
+SMS_GATEWAY in the settings.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 from django.conf import settings
-from twilio.rest import Client
-from twilio.base.exceptions import TwilioRestException
+from django.utils.module_loading import import_string
 
-client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
-verify = client.verify.services(settings.TWILIO_SERVICE_SID)
 
+logger = logging.getLogger(__name__)
+
+class SMSGatewayError(Exception):
+    """This class defines the error raised when the SMS gateway cannot be used."""
+
+
+class CircuitBreaker:
+    """
+    This class defines a circuit breaker that stops calls to a failing service.
+    After failure_threshold consecutive failures the circuit opens and calls
+    fail at once for reset_timeout seconds. The next call after that is let
+    through, and closes the circuit again if it succeeds.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        """This method initializes a closed circuit."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.lock = Lock()
+
+    def is_open(self):
+        """This method returns True if calls are currently not let through."""
+        with self.lock:
+            if self.opened_at is None:
+                return False
+            return time.monotonic() - self.opened_at < self.reset_timeout
+
+    def call(self, func, *args, **kwargs):
+        """
+        This method calls func and records whether it failed.
+        It raises SMSGatewayError without calling func if the circuit is open.
+        """
+        if self.is_open():
+            raise SMSGatewayError('SMS service is unavailable.')
+
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            with self.lock:
+                self.failures += 1
+                if self.failures >= self.failure_threshold:
+                    self.opened_at = time.monotonic()
+            raise
+
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+        return result
+
+
+class TwilioSMSGateway:
+    """
+    This class defines an SMS gateway that sends and checks One Time Passwords
+    with Twilio Verify. The Twilio client is created on first use and reused,
+    so its HTTP connections are pooled across requests.
+    """
+
+    def __init__(self):
+        """This method initializes the gateway without creating the Twilio client."""
+        self._verify = None
+        self._lock = Lock()
+        self.breaker = CircuitBreaker(
+            failure_threshold=getattr(settings, 'SMS_GATEWAY_FAILURE_THRESHOLD', 5),
+            reset_timeout=getattr(settings, 'SMS_GATEWAY_RESET_TIMEOUT', 30)
+        )
+
+    @property
+    def verify(self):
+        """This property returns the Twilio Verify service, creating the client if needed."""
+        # pylint: disable=import-outside-toplevel
+
+        if self._verify is None:
+            with self._lock:
+                if self._verify is None:
+                    from twilio.rest import Client
+                    from twilio.http.http_client import TwilioHttpClient
+
+                    http_client = TwilioHttpClient(
+                        pool_connections=True,
+                        timeout=getattr(settings, 'SMS_GATEWAY_TIMEOUT', 10)
+                    )
+                    client = Client(
+                        settings.TWILIO_ACCOUNT_SID,
+                        settings.TWILIO_AUTH_TOKEN,
+                        http_client=http_client
+                    )
+                    self._verify = client.verify.services(settings.TWILIO_SERVICE_SID)
+
+        return self._verify
+
+    def send_otp(self, phone):
+        """This method sends an OTP to the phone number provided."""
+        self.breaker.call(self.verify.verifications.create, to=phone, channel='sms')
+
+    def check_otp(self, phone, code):
+        """
+        This method returns True if the code matches the OTP sent to the phone
+        number. Rejected codes do not count as failures of the service.
+        """
+        # pylint: disable=import-outside-toplevel
+        from twilio.base.exceptions import TwilioRestException
+
+        def check():
+            try:
+                result = self.verify.verification_checks.create(to=phone, code=code)
+            except TwilioRestException as exc:
+                if exc.status is not None and exc.status >= 500:
+                    raise
+                return False
+            return result.status == 'approved'
+
+        return self.breaker.call(check)
+
+
+class FakeSMSGateway:
+    """
+    This class defines an SMS gateway that keeps the One Time Passwords it
+    sends in memory instead of sending them. It is used in tests and
+    benchmarks, optionally with a simulated latency in seconds.
+    """
+
+    def __init__(self, latency=0):
+        """This method initializes the gateway with no sent messages."""
+        self.latency = latency
+        self.sent = []
+        self.codes = {}
+        self.lock = Lock()
+        self.breaker = CircuitBreaker()
+
+    def send_otp(self, phone):
+        """This method stores a new OTP for the phone number."""
+        # pylint: disable=import-outside-toplevel
+        from user.utils import token_generator
+
+        time.sleep(self.latency)
+        with self.lock:
+            self.codes[phone] = token_generator()
+            self.sent.append(phone)
+
+    def check_otp(self, phone, code):
+        """This method returns True if the code matches the OTP stored for the phone number."""
+        time.sleep(self.latency)
+        with self.lock:
+            return self.codes.get(phone) == str(code)
+
+
+# SMS gateways created by this process, keyed by their import path.
+GATEWAYS = {}
+GATEWAYS_LOCK = Lock()
+_executor = None # pylint: disable=invalid-name
+
+def get_sms_gateway():
+    """
+    This function returns the SMS gateway set with SMS_GATEWAY in the settings.
+    One gateway is created per process and reused.
+    """
+    path = getattr(settings, 'SMS_GATEWAY', 'user.verify_phone_number.TwilioSMSGateway')
+
+    with GATEWAYS_LOCK:
+        if path not in GATEWAYS:
+            GATEWAYS[path] = import_string(path)()
+        return GATEWAYS[path]
+
+def get_executor():
+    """This function returns the thread pool that sends SMS in the background."""
+    global _executor # pylint: disable=global-statement
+
+    with GATEWAYS_LOCK:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'SMS_GATEWAY_WORKERS', 4),
+                thread_name_prefix='sms_gateway'
+            )
+        return _executor
+
+def send_in_background(gateway, phone):
+    """This function sends an OTP from a background thread and logs any failure."""
+    # pylint: disable=broad-exception-caught
+
+    try:
+        gateway.send_otp(phone)
+    except Exception:
+        logger.exception('Failed to send OTP to %s.', phone)
 
 def send_phone_otp(phone):
-    """This function sends OTP to the phone number provided."""
-    verify.verifications.create(to=phone, channel='sms')
+    """
+    This function sends OTP to the phone number provided. When SMS_GATEWAY_ASYNC
+    is True in the settings, the OTP is sent from a background thread and the
+    function returns a Future. It raises SMSGatewayError if the gateway has been
+    failing, so the caller can answer at once.
+    """
+    gateway = get_sms_gateway()
+
+    if gateway.breaker.is_open():
+        raise SMSGatewayError('SMS service is unavailable.')
 
+    if getattr(settings, 'SMS_GATEWAY_ASYNC', True):
+        return get_executor().submit(send_in_background, gateway, phone)
+
+    gateway.send_otp(phone)
+    return None
 
 def check_phone_otp(phone, code):
     """
     This function confirms that the OTP submitted by the user
     matches the one sent to the user's phone number.
+    It raises SMSGatewayError if the gateway cannot be reached.
     """
-    try:
-        result = verify.verification_checks.create(to=phone, code=code)
-    except TwilioRestException:
-        return False
+    # pylint: disable=broad-exception-caught
 
-    return result.status == 'approved'
+    try:
+        return get_sms_gateway().check_otp(phone, code)
+    except SMSGatewayError:
+        raise
+    except Exception as exc:
+        raise SMSGatewayError('SMS service is unavailable.') from exc
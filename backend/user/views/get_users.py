@@ -4,8 +4,11 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAdminUser
 from django.contrib.auth import get_user_model
-from drf_spectacular.utils import extend_schema
-from user.serializers import UserSerializer
+from django.db.models import Prefetch
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from user.models import UserProfileInterest
+from user.serializers import UserSerializer, UserFilterSerializer
+from user.utils import UserCursorPagination
 
 
 User = get_user_model()
@@ -18,15 +21,102 @@ class UserView(APIView):
 
     @extend_schema(
         request=None,
+        parameters=[
+            OpenApiParameter(
+                name='cursor',
+                location=OpenApiParameter.QUERY,
+                description='Cursor of the page, taken from previous_page or next_page',
+                required=False,
+                type=str
+            ),
+            OpenApiParameter(
+                name='size',
+                location=OpenApiParameter.QUERY,
+                description='Number of users per page',
+                required=False,
+                type=int
+            ),
+            OpenApiParameter(
+                name='verified',
+                location=OpenApiParameter.QUERY,
+                description='Only return users whose email is or is not verified',
+                required=False,
+                type=bool
+            ),
+            OpenApiParameter(
+                name='staff',
+                location=OpenApiParameter.QUERY,
+                description='Only return users that are or are not staff',
+                required=False,
+                type=bool
+            ),
+            OpenApiParameter(
+                name='suspended',
+                location=OpenApiParameter.QUERY,
+                description='Only return users that are or are not suspended',
+                required=False,
+                type=bool
+            ),
+            OpenApiParameter(
+                name='created_after',
+                location=OpenApiParameter.QUERY,
+                description='Only return users that registered at or after this time',
+                required=False,
+                type=str
+            ),
+            OpenApiParameter(
+                name='created_before',
+                location=OpenApiParameter.QUERY,
+                description='Only return users that registered before this time',
+                required=False,
+                type=str
+            )
+        ],
         responses={200: UserSerializer}
     )
     def get(self, request):
         """
-        This method returns all users that registered on the application.\n
+        This method returns a page of the users that registered on the application,
+        newest first, optionally filtered with the query parameters.\n
         Returns:\n
-            On success: Http status code of 200 and the data of each user.\n
+            On success: Http status code of 200 and the data of each user in the page.\n
             On failure: Appropriate http status code and error message.
         """
-        users = User.objects.all()
-        serializer = UserSerializer(users, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # pylint: disable=no-member
+
+        # Validate the filters in the query string of the request.
+        filter_serializer = UserFilterSerializer(data=request.query_params.dict())
+        filter_serializer.is_valid(raise_exception=True)
+        filters = filter_serializer.validated_data
+
+        users = User.objects.select_related('profile').prefetch_related(
+            Prefetch(
+                'profile__userprofileinterest_set',
+                queryset=UserProfileInterest.objects.select_related('user_interest')
+            )
+        )
+
+        if 'verified' in filters:
+            users = users.filter(is_verified=filters['verified'])
+        if 'staff' in filters:
+            users = users.filter(is_staff=filters['staff'])
+        if 'suspended' in filters:
+            users = users.filter(is_suspended=filters['suspended'])
+        if 'created_after' in filters:
+            users = users.filter(created_at__gte=filters['created_after'])
+        if 'created_before' in filters:
+            users = users.filter(created_at__lt=filters['created_before'])
+
+        # Get the page of users after the cursor in the request.
+        paginator = UserCursorPagination()
+        page = paginator.paginate_queryset(users, request, view=self)
+
+        serializer = UserSerializer(page, many=True, context={'request': request})
+
+        data = {
+            'previous_page': paginator.get_previous_link(),
+            'next_page': paginator.get_next_link(),
+            'users': serializer.data
+        }
+
+        return Response(data, status=status.HTTP_200_OK)
@@ -3,14 +3,12 @@ import humanize
 from django.conf import settings
 from django.utils import timezone
 from django.contrib.auth import authenticate
-from django.core.exceptions import ObjectDoesNotExist
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from drf_spectacular.utils import extend_schema
 from user.serializers import LoginSerializer
-from user.utils import blacklist_outstanding_tokens
+from user.token_store import get_token_store
 
 
 class LoginView(APIView):
@@ -73,48 +71,50 @@ class LoginView(APIView):
         if user is None:
             return Response({'error': "User not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        # Check if user is not active
-        if user.is_active is False:
-            # Check if the reason for being inactive is due to suspension
-            try:
-                current_time = timezone.now()
-                end_time = user.suspension.end_time
-                if end_time is not None:
-                    # Prevent user from logging in if suspension endtime
-                    # has not been equaled or exceeded.
-                    if current_time < end_time:
-                        time_difference = end_time - current_time
-                        readable_time_difference = humanize.naturaldelta(time_difference)
-                        return Response(
-                            {
-                                'error': f'Account was suspended, '
-                                         f'time remaining is {readable_time_difference}.'
-                            },
-                            status=status.HTTP_403_FORBIDDEN
-                        )
-                    # End user suspension and set user to active
-                    user.suspension.has_ended = True
-                    user.suspension.save()
-                    user.is_active = True
-
-                # Prevent user from logging in if account is permanently suspended.
-                if user.suspension.is_permanent is True and user.suspension.has_ended is False:
+        # Check if user is not active due to a suspension. The suspension
+        # is loaded with the user by the authentication backend. It is also
+        # checked when is_suspended is not set, for users suspended before
+        # end_suspensions --backfill was run.
+        suspension = getattr(user, 'suspension', None)
+        if user.is_active is False and (user.is_suspended is True or (
+            suspension is not None and suspension.has_ended is False
+        )):
+            current_time = timezone.now()
+            end_time = user.suspension.end_time
+            if end_time is not None:
+                # Prevent user from logging in if suspension endtime
+                # has not been equaled or exceeded.
+                if current_time < end_time:
+                    time_difference = end_time - current_time
+                    readable_time_difference = humanize.naturaldelta(time_difference)
                     return Response(
                         {
-                            'error': 'Account has been permanently suspended.'
+                            'error': f'Account was suspended, '
+                                     f'time remaining is {readable_time_difference}.'
                         },
                         status=status.HTTP_403_FORBIDDEN
                     )
-            except ObjectDoesNotExist:
-                pass
-
-        # Blacklist all outstanding refresh token for the user
-        blacklist_outstanding_tokens(user)
-
-        # Generate access and refresh tokens for user and add custom claims
-        refresh = RefreshToken.for_user(user)
-        refresh['username'] = user.username
-        refresh['is_staff'] = str(user.is_staff)
+                # End user suspension and set user to active
+                user.suspension.has_ended = True
+                user.suspension.save()
+                user.is_active = True
+
+            # Prevent user from logging in if account is permanently suspended.
+            if user.suspension.is_permanent is True and user.suspension.has_ended is False:
+                return Response(
+                    {
+                        'error': 'Account has been permanently suspended.'
+                    },
+                    status=status.HTTP_403_FORBIDDEN
+                )
+
+        token_store = get_token_store()
+
+        # Revoke all outstanding refresh tokens for the user
+        token_store.revoke_user(user)
+
+        # Generate access and refresh tokens for user with custom claims
+        refresh = token_store.issue(user)
 
         refresh_token = str(refresh)
         access_token = str(refresh.access_token)
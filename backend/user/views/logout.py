@@ -1,11 +1,11 @@
 """This module defines class LogoutView."""
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
+from user.token_store import get_token_store
 
 
 class LogoutView(APIView):
@@ -41,10 +41,9 @@ class LogoutView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        # Verify signature of refresh token and blacklist it if no error
+        # Verify signature of refresh token and revoke it if no error
         try:
-            decoded_token = RefreshToken(refresh_token)
-            decoded_token.blacklist()
+            get_token_store().revoke(refresh_token)
             response = Response({'message': 'User logout was successful.'}, status=status.HTTP_200_OK)
             response.delete_cookie('refresh')
             return response
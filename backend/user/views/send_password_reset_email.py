@@ -1,5 +1,4 @@
 """This module defines the module ForgotPasswordView"""
-from smtplib import SMTPConnectError, SMTPException
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -50,7 +49,8 @@ class SendPasswordResetToken(APIView):
         responses={
             200: {
                 'example': {
-                    'message': 'A One Time Password (OTP) has been sent to user@example.com'
+                    'message': 'A One Time Password (OTP) has been sent to user@example.com',
+                    'request_id': 'd1f6c2a4-0b8e-4f3a-9a57-3e2c5b7d9f10'
                 }
             }
         }
@@ -75,24 +75,13 @@ class SendPasswordResetToken(APIView):
             return Response({'error': 'User not found.'}, status=status.HTTP_404_NOT_FOUND)
 
         try:
-            # Send otp for password reset to the user's email
-            send_verification_token(user, for_password=True)
+            # Queue otp for password reset to the user's email
+            request_id = send_verification_token(user, for_password=True)
 
-            # Update the fields of the VerificationToken model and save
-            verification_token = user.verification_token
-            verification_token.is_for_password_reset = True
-            verification_token.is_used = False
-            verification_token.is_validated_for_password_reset = False
-            verification_token.otp_submission_time = None
-            verification_token.save()
-
-            # Return response to the client if email was sent successfully.
+            # Return response to the client if email was queued successfully.
+            # The request_id must be submitted with the OTP to validate it.
             message = f'A One Time Password (OTP) has been sent to {user.email}.'
-            return Response({'message': message}, status=status.HTTP_200_OK)
-        except SMTPConnectError:
-            return Response({'error': 'Failed to send email due to connection issues.'},
-                            status=status.HTTP_503_SERVICE_UNAVAILABLE)
-        except SMTPException as e:
-            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return Response({'message': message, 'request_id': request_id},
+                            status=status.HTTP_200_OK)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
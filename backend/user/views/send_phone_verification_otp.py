@@ -5,7 +5,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
 from drf_spectacular.utils import extend_schema
-from user.verify_phone_number import send_phone_otp
+from user.verify_phone_number import send_phone_otp, SMSGatewayError
 
 
 User = get_user_model()
@@ -64,6 +64,7 @@ class SendPhoneVerificationOTP(APIView):
                     status=status.HTTP_403_FORBIDDEN
                 )
 
+            # The otp is sent in the background when SMS_GATEWAY_ASYNC is True.
             send_phone_otp(phone_number)
 
             # Hide phone number
@@ -84,5 +85,7 @@ class SendPhoneVerificationOTP(APIView):
             )
         except User.DoesNotExist:
             return Response({'error': 'User not found.'}, status=status.HTTP_404_NOT_FOUND)
+        except SMSGatewayError as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1,5 +1,4 @@
 """This module defines class SendEmailVerificationLink."""
-from smtplib import SMTPConnectError, SMTPException
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 from rest_framework.views import APIView
@@ -45,27 +44,14 @@ class SendEmailVerificationToken(APIView):
                 return Response({'error': 'User must be logged in.'},
                                 status=status.HTTP_401_UNAUTHORIZED)
 
-            # Send otp to the email address provided by the user.
+            # Queue otp to the email address provided by the user.
             send_verification_token(user)
 
-            # Update the fields of the VerificationToken model and save.
-            verification_token = user.verification_token
-            verification_token.is_for_password_reset = False
-            verification_token.is_used = False
-            verification_token.is_validated_for_password_reset = False
-            verification_token.otp_submission_time = None
-            verification_token.save()
-
             # Return a response to the client.
             return Response({'message':
                              f'A One Time Password (OTP) has been sent to {user.email}.'},
                              status=status.HTTP_200_OK)
         except User.DoesNotExist:
             return Response({'error': 'User not found.'}, status=status.HTTP_404_NOT_FOUND)
-        except SMTPConnectError:
-            return Response({'error': 'Failed to send email due to connection issues.'},
-                            status=status.HTTP_503_SERVICE_UNAVAILABLE)
-        except SMTPException as e:
-            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
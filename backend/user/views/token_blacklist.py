@@ -9,7 +9,7 @@ from rest_framework.views import APIView
 from rest_framework.permissions import IsAdminUser
 from drf_spectacular.utils import extend_schema
 from user.serializers import TokenBlacklistSerializer
-from user.utils import blacklist_outstanding_tokens
+from user.token_store import get_token_store
 from user_suspension.models import UserSuspension
 
 
@@ -92,8 +92,8 @@ class CustomTokenBlacklistView(APIView):
                 number_of_suspensions=1
             )
 
-        # Blcklist all tokens belonging to the user
-        blacklist_outstanding_tokens(user)
+        # Revoke all tokens belonging to the user
+        get_token_store().revoke_user(user)
 
         # Set user to inactive
         user.is_active = False
@@ -145,8 +145,8 @@ class CustomTokenBlacklistView(APIView):
                 user.suspension.number_of_suspensions = user.suspension.number_of_suspensions + 1
                 user.suspension.has_ended = False
 
-                # Blcklist all tokens belonging to the user
-                blacklist_outstanding_tokens(user)
+                # Revoke all tokens belonging to the user
+                get_token_store().revoke_user(user)
 
                 # Set user to inactive
                 user.is_active = False
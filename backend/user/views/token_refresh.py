@@ -1,5 +1,4 @@
 """This module defines class CustomTokenRefreshView"""
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework import status
 from rest_framework.views import APIView
@@ -7,7 +6,7 @@ from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from user.utils import blacklist_outstanding_tokens
+from user.token_store import get_token_store
 
 
 User = get_user_model()
@@ -49,18 +48,14 @@ class CustomTokenRefreshView(APIView):
                 }, status=status.HTTP_401_UNAUTHORIZED
             )
 
-        # Verify signature of token.
+        token_store = get_token_store()
+
+        # Verify signature of token and mark it as used. The token store
+        # revokes all tokens belonging to the user if the token was used before.
         try:
-            decoded_token = RefreshToken(refresh_token)
+            decoded_token = token_store.rotate(refresh_token)
             user_id = decoded_token.get('user_id')
-            # Blacklist token
-            decoded_token.blacklist()
         except TokenError as e:
-            if str(e) == 'Token is blacklisted':
-                response = RefreshToken(refresh_token, verify=False)
-                user_id = response.get('user_id')
-                # Blcklist all tokens belonging to the user
-                blacklist_outstanding_tokens(user_id)
             return Response(
                 {
                     'code': 'token_not_valid',
@@ -82,9 +77,7 @@ class CustomTokenRefreshView(APIView):
             return Response({'error': 'User not found.'}, status=status.HTTP_404_NOT_FOUND)
 
         # Reset user's access and refresh tokens
-        refresh = RefreshToken.for_user(user)
-        refresh['username'] = user.username
-        refresh['is_staff'] = str(user.is_staff)
+        refresh = token_store.issue(user)
 
         refresh_token = str(refresh)
         access_token = str(refresh.access_token)
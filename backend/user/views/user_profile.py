@@ -1,27 +1,39 @@
 """This module defines class UserProfileView"""
 from django.contrib.auth import get_user_model
 from django.core.files.storage import default_storage
-from django.core.exceptions import ObjectDoesNotExist
+from django.utils import timezone
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework import status
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from apartment_search_app.parsers import FastJSONParser
 from user.serializers import UserProfileSerializer, UserSerializer
 from user.models import UserProfileInterest
+from apartment.utils import (
+    get_version_annotations,
+    get_etag,
+    get_validator_headers,
+    get_not_modified_response,
+    get_sparse_fields,
+    is_included
+)
 
 
 User = get_user_model()
 
+# Fields of the profile that can be requested with the fields parameter.
+USER_FIELDS = [field for field in UserSerializer.Meta.fields if field != 'password']
+
 class UserProfileView(APIView):
     """This class defines methods that gets or updates user profile data"""
 
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
-    parser_classes = [JSONParser, MultiPartParser, FormParser]
+    parser_classes = [FastJSONParser, MultiPartParser, FormParser]
 
     def save_user_interests(self, validated_data, user):
         """This method saves a list of submitted user interests to the database."""
@@ -89,37 +101,87 @@ class UserProfileView(APIView):
         return thumbnail
 
     @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name='fields',
+                location=OpenApiParameter.QUERY,
+                description='Comma separated fields to return',
+                required=False,
+                type=str
+            )
+        ],
         responses={200: UserSerializer}
     )
     def get(self, request, user_id):
         """
         This method returns a user profile for the provided user_id.\n
+        Only the fields listed in the fields parameter of the query string are
+        returned if it is given.\n
+        Requests with If-None-Match are answered with a http status code of 304
+        and no body if the profile has not changed. Last-Modified is not sent, since
+        the fields shown depend on the user that made the request.\n
         Args:\n
             user_id: The id of the user that the profile will be viewed.\n
         Returns:\n
             On success: Http status code of 200 and the user's data\n
             On failure: Appropriate http status code and error message.
         """
+        # pylint: disable=no-member
+
+        try:
+            fields, _ = get_sparse_fields(request, USER_FIELDS)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # The profile and its interests are fetched only if they are returned.
+        with_profile = is_included('profile_information', fields)
+        users = User.objects.all()
+        if with_profile:
+            users = users.select_related('profile').annotate(
+                **get_version_annotations(
+                    'interests', UserProfileInterest.objects.all(), 'user_profile'
+                )
+            )
 
         try:
-            user = User.objects.get(pk=user_id)
-            if user != request.user and user.is_staff is False:
-                try:
-                    has_ended = user.suspension.has_ended
-                    if has_ended is False:
-                        return Response(
-                            {
-                                'error': 'This account is suspended.'
-                            },
-                            status=status.HTTP_403_FORBIDDEN
-                        )
-                except ObjectDoesNotExist:
-                    pass
-            serializer = UserSerializer(user, context={'request': request})
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            user = users.get(pk=user_id)
         except User.DoesNotExist:
             return Response({'error': 'User not found.'}, status=status.HTTP_404_NOT_FOUND)
 
+        if user != request.user and user.is_staff is False and user.is_suspended is True:
+            return Response(
+                {
+                    'error': 'This account is suspended.'
+                },
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        # Return 304 if the copy of the client is current. The fields shown
+        # depend on whether the profile is viewed by its owner or a staff.
+        is_owner = user == request.user
+        versions = [user.updated_at]
+        if with_profile:
+            versions += [user.profile.updated_at, user.interests_updated_at]
+        etag = get_etag(
+            user.pk,
+            *versions,
+            getattr(user, 'interests_count', None),
+            is_owner,
+            request.user.is_staff,
+            request.get_host(),
+            fields
+        )
+        response = get_not_modified_response(request, etag)
+        if response is not None:
+            return response
+
+        serializer = UserSerializer(user, context={'request': request}, fields=fields)
+        return Response(
+            serializer.data,
+            status=status.HTTP_200_OK,
+            headers=get_validator_headers(etag)
+        )
+
     @extend_schema(
         responses={200: UserSerializer}
     )
@@ -158,7 +220,7 @@ class UserProfileView(APIView):
         # return a 403 http response if the user does.
         apartments = user.apartments.filter(
             is_taken=False,
-            advert_days_left__gt=0,
+            advert_exp_time__gt=timezone.now(),
             approval_status__in=['accepted', 'pending']
         )
         if apartments.exists():
@@ -224,7 +286,7 @@ class UserProfileView(APIView):
         has_active_ad = False
         apartments = user.apartments.filter(
             is_taken=False,
-            advert_days_left__gt=0,
+            advert_exp_time__gt=timezone.now(),
             approval_status__in=['accepted', 'pending']
         )
         if apartments.exists():
@@ -6,9 +6,13 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.conf import settings
 from drf_spectacular.utils import extend_schema
-from user.serializers import VerificationTokenSerializer, ValidatePhoneOTPSerializer
-from user.utils import is_token_expired
-from user.verify_phone_number import check_phone_otp
+from user.serializers import (
+    VerificationTokenSerializer,
+    PasswordResetTokenSerializer,
+    ValidatePhoneOTPSerializer
+)
+from user.utils import is_token_expired, check_verification_token
+from user.verify_phone_number import check_phone_otp, SMSGatewayError
 from user_verification_token.models import VerificationToken
 
 
@@ -48,10 +52,23 @@ class ValidateEmailVerificationTokenView(APIView):
         verification_token = serializer.validated_data.get('verification_token')
 
         try:
-            # Get verification token (object) from database.
-            token = VerificationToken.objects.get(verification_token=verification_token)
+            # Get the verification token (object) of the user from database.
+            token = VerificationToken.objects.select_related('user').get(
+                user_id=request.user.id
+            )
             user = token.user # Get user object from token
 
+            # Check the submitted token against the hashed token, unless the
+            # user has made too many incorrect attempts.
+            try:
+                is_correct = check_verification_token(token, verification_token)
+            except ValueError as exc:
+                return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+            if not is_correct:
+                return Response({'error': 'Token is incorrect.'},
+                                status=status.HTTP_400_BAD_REQUEST)
+
             # Check if token has been used.
             if token.is_used is True:
                 return Response({'error': 'Token has been used.'},
@@ -92,7 +109,7 @@ class ValidatePasswordResetTokenView(APIView):
     Password (OTP) for password reset.
     """
 
-    serializer_class = VerificationTokenSerializer
+    serializer_class = PasswordResetTokenSerializer
 
     # Response schema for drf_spectacular
     @extend_schema(
@@ -114,19 +131,31 @@ class ValidatePasswordResetTokenView(APIView):
         # pylint: disable=no-member
 
         # Validate data in request body and return error messages if exception is raised.
-        serializer = VerificationTokenSerializer(data=request.data)
+        serializer = PasswordResetTokenSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        # Get verification token (string) from validated data.
+        # Get verification token (string) and request_id from validated data.
         verification_token = serializer.validated_data.get('verification_token')
+        request_id = serializer.validated_data.get('request_id')
 
         try:
-            # Get verification token (object) from database.
-            token = VerificationToken.objects.get(verification_token=verification_token)
+            # Get verification token (object) the request_id was issued with from database.
+            token = VerificationToken.objects.select_related('user').get(request_id=request_id)
         except VerificationToken.DoesNotExist:
             return Response({'error': 'Token is incorrect.'},
                             status=status.HTTP_400_BAD_REQUEST)
 
+        # Check the submitted token against the hashed token, unless the
+        # user has made too many incorrect attempts.
+        try:
+            is_correct = check_verification_token(token, verification_token)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not is_correct:
+            return Response({'error': 'Token is incorrect.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
         # Check if token is used.
         if token.is_used is True:
             return Response({'error': 'Token has been used.'},
@@ -222,7 +251,12 @@ class ValidatePhoneVerificationOTP(APIView):
         otp = serializer.validated_data.get('otp')
 
         # Check if otp is valid
-        if check_phone_otp(phone_number, otp):
+        try:
+            is_valid = check_phone_otp(phone_number, otp)
+        except SMSGatewayError as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        if is_valid:
             user.profile.phone_number_is_verified = True
             user.profile.save()
         else:
@@ -22,6 +22,17 @@ class UserSuspension(models.Model):
         """ db_table: Name of the table this class creates in the database."""
         db_table = 'user_suspensions'
 
+    def save(self, *args, **kwargs):
+        """This method saves the suspension and sets is_suspended of its user."""
+        # pylint: disable=no-member
+
+        super().save(*args, **kwargs)
+
+        is_suspended = not self.has_ended
+        if self.user.is_suspended != is_suspended:
+            self.user.is_suspended = is_suspended
+            User.objects.filter(pk=self.user_id).update(is_suspended=is_suspended)
+
     def __str__(self):
         """This method returns a string representation of the instance of this class."""
         # pylint: disable=no-member
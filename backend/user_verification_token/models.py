@@ -10,7 +10,11 @@ class VerificationToken(models.Model):
     """This class defines the fields of this class in the database."""
     id = models.CharField(default=uuid4, max_length=36,
                           unique=True, primary_key=True, editable=False)
-    verification_token = models.CharField(max_length=6)
+    # HMAC of the One Time Password, the password itself is never stored.
+    verification_token = models.CharField(max_length=64)
+    # Opaque id sent to the client with each new One Time Password.
+    request_id = models.CharField(default=uuid4, max_length=36, unique=True)
+    failed_attempts = models.IntegerField(default=0)
     user = models.OneToOneField(User, on_delete=models.CASCADE,
                                 related_name='verification_token')
     is_for_password_reset = models.BooleanField(default=False)
@@ -29,4 +33,4 @@ class VerificationToken(models.Model):
     def __str__(self):
         """This method returns a string representation of the instance of this class."""
         # pylint: disable=no-member
-        return f'user: {self.user.username} otp: {self.verification_token}'
+        return f'user: {self.user.username} request_id: {self.request_id}'